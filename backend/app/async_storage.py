@@ -0,0 +1,115 @@
+from __future__ import annotations
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+from .metrics import Gauge, Histogram
+
+STORAGE_SECONDS = Histogram("quizzer_storage_seconds", "Storage call latency as awaited by the caller (queueing included)", ["op"])
+STORAGE_IO_SECONDS = Histogram("quizzer_storage_io_seconds", "Time a storage call ran in the I/O thread pool", ["op"])
+STORAGE_LOOP_SECONDS = Histogram("quizzer_storage_loop_seconds", "Time storage work held the event loop thread", ["op"])
+
+
+class AsyncStorage:
+    """Async facade over the blocking `storage` functions.
+
+    `run(op, fn, *args, key=...)` executes `fn` (file I/O plus encoding) in a bounded
+    thread pool and awaits it; calls sharing a `key` (e.g. a session code) run one at
+    a time in call order, so writes to the same files can't overtake each other.
+    Storage work that still has to happen on the loop (a synchronous lazy load)
+    goes through `blocking(op)` so the time it holds the loop is recorded too.
+    Per-op totals are in `stats()`; latency histograms are exported as metrics.
+    """
+
+    def __init__(self, threads: int = 4) -> None:
+        self.threads = max(1, threads)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._waiting: Dict[str, int] = {}
+        self._inflight = 0
+        self._max_inflight = 0
+        self._ops: Dict[str, Dict[str, float]] = {}
+        Gauge("quizzer_storage_inflight", "Storage calls queued or running in the I/O pool", fn=lambda: self._inflight)
+
+    async def run(self, op: str, fn: Callable[..., Any], *args, key: Optional[str] = None, **kwargs) -> Any:
+        started = time.perf_counter()
+        if key is None:
+            return await self._submit(op, fn, args, kwargs, started)
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._waiting[key] = self._waiting.get(key, 0) + 1
+        try:
+            async with lock:
+                return await self._submit(op, fn, args, kwargs, started)
+        finally:
+            self._waiting[key] -= 1
+            if not self._waiting[key]:
+                del self._waiting[key]
+                self._locks.pop(key, None)
+
+    async def _submit(self, op: str, fn: Callable[..., Any], args: tuple, kwargs: Dict, started: float) -> Any:
+        t0 = time.perf_counter()
+        io = [0.0]
+
+        def work():
+            t = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                io[0] = time.perf_counter() - t
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="storage")
+        future = asyncio.get_running_loop().run_in_executor(self._pool, work)
+        loop_held = time.perf_counter() - t0
+        self._inflight += 1
+        self._max_inflight = max(self._max_inflight, self._inflight)
+        try:
+            return await future
+        finally:
+            self._inflight -= 1
+            self._record(op, time.perf_counter() - started, io[0], loop_held)
+
+    @contextmanager
+    def blocking(self, op: str):
+        """Time storage work done inline on the event loop."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            self._record(op, elapsed, elapsed, elapsed)
+
+    def _record(self, op: str, total: float, io: float, loop_held: float) -> None:
+        STORAGE_SECONDS.labels(op).observe(total)
+        STORAGE_IO_SECONDS.labels(op).observe(io)
+        STORAGE_LOOP_SECONDS.labels(op).observe(loop_held)
+        s = self._ops.get(op)
+        if s is None:
+            s = self._ops[op] = {"calls": 0, "totalMs": 0.0, "ioMs": 0.0, "loopMs": 0.0, "maxLoopMs": 0.0}
+        s["calls"] += 1
+        s["totalMs"] += total * 1000.0
+        s["ioMs"] += io * 1000.0
+        s["loopMs"] += loop_held * 1000.0
+        s["maxLoopMs"] = max(s["maxLoopMs"], loop_held * 1000.0)
+
+    def stats(self) -> Dict:
+        return {
+            "threads": self.threads,
+            "inflight": self._inflight,
+            "maxInflight": self._max_inflight,
+            "ops": {op: {k: (round(v, 3) if isinstance(v, float) else v) for k, v in s.items()} for op, s in sorted(self._ops.items())},
+        }
+
+    def close(self) -> None:
+        """Wait for queued calls and stop the pool (a later `run` starts a new one)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+# Shared by the persister, the journal and the routes: one bounded pool per process
+STORAGE = AsyncStorage(int(os.getenv("STORAGE_THREADS", "4")))
@@ -0,0 +1,142 @@
+"""Local message broker for multi-worker deployments.
+
+Run one broker per host, then point every worker at it with QUIZ_BROKER:
+
+    python -m backend.app.broker /tmp/quizzer.sock
+
+Workers connect over a Unix socket and exchange length-prefixed pickle frames
+(the same encoding python-socketio's own pub/sub managers use, so only run it on
+a socket that untrusted users cannot open). The broker provides:
+
+- pub/sub: a published Socket.IO manager message is delivered to every worker,
+  or to a single worker when addressed to it;
+- ownership: the first worker to claim becomes the owner of quiz state; when it
+  disconnects the next claimant is promoted and everyone is told;
+- calls: request/response frames routed to the current owner and back.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import pickle
+import struct
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+_HEADER = struct.Struct("!I")
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Any:
+    header = await reader.readexactly(_HEADER.size)
+    (size,) = _HEADER.unpack(header)
+    return pickle.loads(await reader.readexactly(size))
+
+
+def encode_frame(obj: Any) -> bytes:
+    body = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(len(body)) + body
+
+
+class Broker:
+    """Pub/sub, owner election and owner-call routing for local workers.
+
+    Frames are tuples; a worker first sends ("hello", worker_id), then any of
+    ("pub", msg), ("to", worker_id, msg), ("claim",), ("call", call_id, payload)
+    and ("reply", call_id, worker_id, ok, result). It receives ("msg", msg),
+    ("owner", worker_id | None), ("call", call_id, from_id, payload) and
+    ("reply", call_id, ok, result).
+    """
+
+    def __init__(self) -> None:
+        self._workers: Dict[str, asyncio.StreamWriter] = {}
+        self._claimants: "OrderedDict[str, None]" = OrderedDict()  # claim order for promotion
+        self._owner: Optional[str] = None
+        self._pending: Dict[Tuple[str, int], str] = {}  # (caller, call_id) -> owner it was routed to
+
+    def _send(self, worker_id: str, frame: Any) -> None:
+        writer = self._workers.get(worker_id)
+        if writer is not None and not writer.is_closing():
+            writer.write(encode_frame(frame))
+
+    def _broadcast(self, frame: Any) -> None:
+        data = encode_frame(frame)
+        for writer in self._workers.values():
+            if not writer.is_closing():
+                writer.write(data)
+
+    def _elect(self) -> None:
+        owner = next(iter(self._claimants), None)
+        if owner != self._owner:
+            self._owner = owner
+            self._broadcast(("owner", owner))
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        worker_id: Optional[str] = None
+        try:
+            hello = await read_frame(reader)
+            if not (isinstance(hello, tuple) and hello[0] == "hello"):
+                return
+            worker_id = str(hello[1])
+            self._workers[worker_id] = writer
+            writer.write(encode_frame(("owner", self._owner)))
+            while True:
+                frame = await read_frame(reader)
+                kind = frame[0]
+                if kind == "pub":
+                    self._broadcast(("msg", frame[1]))
+                elif kind == "to":
+                    self._send(frame[1], ("msg", frame[2]))
+                elif kind == "claim":
+                    self._claimants[worker_id] = None
+                    self._elect()
+                elif kind == "call":
+                    call_id = frame[1]
+                    if self._owner is None:
+                        self._send(worker_id, ("reply", call_id, False, "no owner elected"))
+                    else:
+                        self._pending[(worker_id, call_id)] = self._owner
+                        self._send(self._owner, ("call", call_id, worker_id, frame[2]))
+                elif kind == "reply":
+                    _, call_id, caller, ok, result = frame
+                    self._pending.pop((caller, call_id), None)
+                    self._send(caller, ("reply", call_id, ok, result))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if worker_id is not None:
+                self._workers.pop(worker_id, None)
+                self._claimants.pop(worker_id, None)
+                # calls routed to a worker that went away will never be answered
+                for key, owner in list(self._pending.items()):
+                    if owner == worker_id or key[0] == worker_id:
+                        self._pending.pop(key, None)
+                        if owner == worker_id:
+                            self._send(key[0], ("reply", key[1], False, "owner disconnected"))
+                self._elect()
+            writer.close()
+
+
+async def serve(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)  # stale socket from a previous run
+    broker = Broker()
+    server = await asyncio.start_unix_server(broker.handle, path=path)
+    os.chmod(path, 0o600)
+    print(f"Quizzer broker listening on {path}")
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", default=os.getenv("QUIZ_BROKER") or "/tmp/quizzer.sock")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.path))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+from __future__ import annotations
+import asyncio
+import itertools
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+from socketio.async_pubsub_manager import AsyncPubSubManager
+from .broker import encode_frame, read_frame
+
+
+class ClusterError(RuntimeError):
+    pass
+
+
+class ClusterManager(AsyncPubSubManager):
+    """Socket.IO client manager that fans out through the local broker.
+
+    Room broadcasts go to every worker. Messages addressed to a single socket go
+    only to the worker holding it when that is known (`sid_hosts`, filled in by
+    the owner from forwarded events), so per-player emits don't cost every worker.
+    """
+
+    name = "quizbroker"
+
+    def __init__(self, cluster: "Cluster", channel: str = "socketio") -> None:
+        super().__init__(channel=channel)
+        self.cluster = cluster
+        self.host_id = cluster.worker_id
+        self.sid_hosts: Dict[str, str] = {}  # sid -> worker holding that socket
+
+    async def emit(self, event, data, namespace=None, room=None, skip_sid=None, callback=None, **kwargs):
+        if room is not None and callback is None and not kwargs.get("ignore_queue"):
+            if self.is_connected(room, namespace or "/"):
+                # our own socket: no need to involve the other workers
+                return await super().emit(event, data, namespace=namespace, room=room, skip_sid=skip_sid, ignore_queue=True)
+            host = self.sid_hosts.get(room)
+            if host is not None:
+                await self.cluster.send(("to", host, {
+                    "method": "emit", "event": event, "data": data, "namespace": namespace or "/",
+                    "room": room, "skip_sid": skip_sid, "callback": None, "host_id": self.host_id,
+                }))
+                return
+        return await super().emit(event, data, namespace=namespace, room=room, skip_sid=skip_sid, callback=callback, **kwargs)
+
+    async def _publish(self, data):
+        await self.cluster.send(("pub", data))
+
+    async def _listen(self):
+        queue = self.cluster.listen()
+        while True:
+            yield await queue.get()
+
+
+class Cluster:
+    """A worker's connection to the broker (see broker.py).
+
+    Every worker claims ownership of quiz state at startup; the broker grants it to
+    one of them. Non-owners forward stateful work with `call_owner`, and the owner
+    runs it through the handlers registered with `serve`. `on_owner` runs when this
+    worker is promoted (at startup or after the previous owner went away).
+    """
+
+    def __init__(self, path: str, call_timeout: float = 15.0) -> None:
+        self.path = path
+        self.worker_id = uuid.uuid4().hex
+        self.call_timeout = call_timeout
+        self.manager = ClusterManager(self)
+        self.owner_id: Optional[str] = None
+        self._handlers: Dict[str, Callable[..., Awaitable[Any]]] = {}
+        self._on_owner: Optional[Callable[[], Awaitable[None]]] = None
+        self._ready = asyncio.Event()  # set once this worker holds loaded state as owner
+        self._owner_known = asyncio.Event()
+        self._calls: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._queue: Optional[asyncio.Queue] = None  # pub/sub messages, once the manager listens
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+        self._send_lock = asyncio.Lock()
+        self._inflight: set = set()  # served calls / promotion (keeps task references alive)
+        self._forwarded = 0
+        self._served = 0
+        self._failed = 0
+
+    @property
+    def is_owner(self) -> bool:
+        return self.owner_id == self.worker_id
+
+    async def wait_ready(self) -> None:
+        await self._ready.wait()
+
+    def stats(self) -> Dict:
+        return {
+            "workerId": self.worker_id,
+            "ownerId": self.owner_id,
+            "isOwner": self.is_owner,
+            "forwardedCalls": self._forwarded,
+            "servedCalls": self._served,
+            "failedCalls": self._failed,
+            "knownSockets": len(self.manager.sid_hosts),
+        }
+
+    def serve(self, kind: str, handler: Callable[..., Awaitable[Any]]) -> None:
+        self._handlers[kind] = handler
+
+    def listen(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return self._queue
+
+    async def start(self, on_owner: Callable[[], Awaitable[None]]) -> None:
+        self._on_owner = on_owner
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+        await self.send(("hello", self.worker_id))
+        await self.send(("claim",))
+        self._task = asyncio.create_task(self._run())
+        await self._owner_known.wait()
+        if self.is_owner:
+            await self._ready.wait()
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def send(self, frame: Any) -> None:
+        if self._writer is None:
+            raise ClusterError("not connected to broker")
+        async with self._send_lock:
+            self._writer.write(encode_frame(frame))
+            await self._writer.drain()
+
+    async def call_owner(self, kind: str, *args: Any) -> Any:
+        call_id = next(self._ids)
+        fut = asyncio.get_running_loop().create_future()
+        self._calls[call_id] = fut
+        self._forwarded += 1
+        try:
+            await self.send(("call", call_id, (kind, args)))
+            return await asyncio.wait_for(fut, self.call_timeout)
+        finally:
+            self._calls.pop(call_id, None)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _promote(self) -> None:
+        try:
+            if self._on_owner is not None:
+                await self._on_owner()
+        finally:
+            self._ready.set()
+
+    async def _serve_call(self, call_id: int, caller: str, payload) -> None:
+        kind, args = payload
+        try:
+            await self._ready.wait()
+            handler = self._handlers.get(kind)
+            if handler is None:
+                raise ClusterError(f"no handler for {kind!r}")
+            ok, result = True, await handler(caller, *args)
+            self._served += 1
+        except Exception as e:
+            self._failed += 1
+            ok, result = False, f"{type(e).__name__}: {e}"
+        await self.send(("reply", call_id, caller, ok, result))
+
+    async def _run(self) -> None:
+        assert self._reader is not None
+        try:
+            while True:
+                frame = await read_frame(self._reader)
+                kind = frame[0]
+                if kind == "msg":
+                    if self._queue is not None:
+                        self._queue.put_nowait(frame[1])
+                elif kind == "reply":
+                    _, call_id, ok, result = frame
+                    fut = self._calls.get(call_id)
+                    if fut is not None and not fut.done():
+                        if ok:
+                            fut.set_result(result)
+                        else:
+                            fut.set_exception(ClusterError(result))
+                elif kind == "call":
+                    self._spawn(self._serve_call(frame[1], frame[2], frame[3]))
+                elif kind == "owner":
+                    was_owner = self.is_owner
+                    self.owner_id = frame[1]
+                    if frame[1] is not None:
+                        self._owner_known.set()
+                    if self.is_owner and not was_owner:
+                        self._spawn(self._promote())
+        except (asyncio.IncompleteReadError, ConnectionError):
+            for fut in self._calls.values():
+                if not fut.done():
+                    fut.set_exception(ClusterError("broker connection lost"))
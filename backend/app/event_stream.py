@@ -0,0 +1,38 @@
+from __future__ import annotations
+import secrets
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+class EventStream:
+    """Sequence-numbered log of a quiz room's broadcasts, keeping the last `size` events.
+
+    `record(event, data)` stamps the payload with the next `seq` and remembers it;
+    `since(seq)` returns what a client that last saw `seq` has missed, or None when
+    some of it has already fallen out of the buffer. `epoch` is fresh for every
+    stream, so sequence numbers from before a restart or reload never match.
+    """
+
+    def __init__(self, size: int = 256) -> None:
+        self.epoch = secrets.token_hex(4)
+        self.seq = 0
+        self._events: Deque[Tuple[int, str, Dict]] = deque(maxlen=max(1, size))
+
+    def record(self, event: str, data: Dict) -> Dict:
+        """The payload to broadcast: `data` plus its sequence number (the original is not modified)."""
+        self.seq += 1
+        stamped = {**data, "seq": self.seq}
+        self._events.append((self.seq, event, stamped))
+        return stamped
+
+    def since(self, seq: int) -> Optional[List[Tuple[str, Dict]]]:
+        if seq > self.seq:
+            return None
+        oldest = self._events[0][0] if self._events else self.seq + 1
+        if seq + 1 < oldest:
+            return None
+        return [(event, data) for s, event, data in self._events if s > seq]
+
+    def position(self) -> Dict:
+        """Where the stream is now, for a client to resume from later."""
+        return {"epoch": self.epoch, "seq": self.seq}
@@ -0,0 +1,176 @@
+from __future__ import annotations
+import asyncio
+import json
+import os
+from typing import Dict, IO, List, Optional, Tuple
+from . import storage
+from .async_storage import STORAGE
+
+
+class EventJournal:
+    """Append-only per-session event journal (JSON lines) with group fsync.
+
+    `append` is a buffered write on the event loop; a background task flushes and
+    fsyncs all touched journals every `sync_ms` through the storage pool. Sequence
+    numbers are owned by the caller (QuizSession.journal_seq), so a snapshot
+    records how far it already covers and `compact` drops everything up to it.
+    """
+
+    def __init__(self, sync_ms: int = 50) -> None:
+        self.interval = max(1, sync_ms) / 1000.0
+        self._files: Dict[str, IO[str]] = {}
+        self._tail: Dict[str, List[Tuple[int, str]]] = {}  # code -> (seq, line) not yet compacted
+        self._unsynced: set = set()
+        # code -> lines appended while that journal is being rewritten by `compact`
+        self._held: Dict[str, List[Tuple[int, str]]] = {}
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def _file(self, code: str) -> IO[str]:
+        f = self._files.get(code)
+        if f is None:
+            f = open(storage.journal_path(code), "a", encoding="utf-8", buffering=64 * 1024)
+            self._files[code] = f
+        return f
+
+    def append(self, code: str, seq: int, event: Dict) -> None:
+        line = json.dumps({"seq": seq, **event}, separators=(",", ":"), ensure_ascii=False) + "\n"
+        held = self._held.get(code)
+        if held is not None:
+            # the file is being replaced; written to the new one once the rewrite is done
+            held.append((seq, line))
+        else:
+            self._file(code).write(line)
+            self._unsynced.add(code)
+        self._tail.setdefault(code, []).append((seq, line))
+
+    async def sync(self) -> None:
+        async with self._lock:
+            if not self._unsynced:
+                return
+            codes, self._unsynced = self._unsynced, set()
+            fds = []
+            for code in codes:
+                f = self._files.get(code)
+                if f is not None:
+                    f.flush()
+                    fds.append(f.fileno())
+            await STORAGE.run("journal_sync", _fsync_all, fds)
+
+    async def compact(self, code: str, upto_seq: int) -> None:
+        """Drop events already covered by a durable snapshot taken at `upto_seq`."""
+        async with self._lock:
+            tail = self._tail.get(code) or []
+            keep = [(seq, line) for seq, line in tail if seq > upto_seq]
+            path = storage.journal_path(code)
+            if len(keep) == len(tail):
+                # nothing covered yet (or already empty on disk)
+                if tail or not os.path.exists(path) or os.path.getsize(path) == 0:
+                    return
+            f = self._files.pop(code, None)
+            if f is not None:
+                f.close()
+            self._unsynced.discard(code)
+            self._held[code] = []
+            try:
+                await STORAGE.run("journal_compact", _rewrite, path, [line for _, line in keep])
+                self._tail[code] = keep + self._held[code]
+            finally:
+                # appends made during the rewrite go after it (or after the old content if it failed)
+                held = self._held.pop(code)
+                if held:
+                    self._file(code).writelines(line for _, line in held)
+                    self._unsynced.add(code)
+
+    async def delete(self, code: str) -> None:
+        async with self._lock:
+            f = self._files.pop(code, None)
+            if f is not None:
+                f.close()
+            self._tail.pop(code, None)
+            self._unsynced.discard(code)
+            path = storage.journal_path(code)
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def close(self, code: str) -> None:
+        """Sync and close one session's journal file; the next append reopens it."""
+        async with self._lock:
+            f = self._files.pop(code, None)
+            self._unsynced.discard(code)
+            if f is not None:
+                f.flush()
+                await STORAGE.run("journal_sync", _fsync_all, [f.fileno()])
+                f.close()
+
+    def forget(self, code: str) -> None:
+        """Drop the in-memory tail of a session that was unloaded (replay restores it)."""
+        self._tail.pop(code, None)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        await self.sync()
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sync()
+            except Exception:
+                pass
+
+    @staticmethod
+    def replay(code: str) -> List[Dict]:
+        """Read a session journal back in order, tolerating a torn final line."""
+        path = storage.journal_path(code)
+        events: List[Dict] = []
+        if not os.path.exists(path):
+            return events
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except Exception:
+                    # partial write from a crash; nothing after it can be trusted
+                    break
+        return events
+
+    def restore_tail(self, code: str, events: List[Dict], upto_seq: int) -> None:
+        # Re-adopt replayed-but-not-yet-snapshotted events so compaction keeps them until covered
+        self._tail[code] = [
+            (e["seq"], json.dumps(e, separators=(",", ":"), ensure_ascii=False) + "\n")
+            for e in events if int(e.get("seq", 0)) > upto_seq
+        ]
+
+
+def _fsync_all(fds: List[int]) -> None:
+    for fd in fds:
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+
+
+def _rewrite(path: str, lines: List[str]) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from sortedcontainers import SortedList
+
+
+RankKey = Tuple[int, int, float, str, str]
+
+
+def rank_key(player) -> RankKey:
+    # Order by: score desc, correct_firsts desc, cumulative_answer_time asc, name asc
+    # (player id last so every key is unique and removable)
+    return (
+        -(player.score or 0),
+        -(player.correct_firsts or 0),
+        float(player.cumulative_answer_time or 0.0),
+        player.name or "",
+        player.id,
+    )
+
+
+class RankedLeaderboard:
+    """Incrementally maintained leaderboard order.
+
+    Keeps one sort key per player in an order-statistics list, so a score change
+    costs O(log N) and reads (top-K, rank-of-player, full walk) never re-sort.
+    Callers must call `update` for every player whose score/firsts/time changed.
+    """
+
+    def __init__(self, players=()) -> None:
+        self._keys: Dict[str, RankKey] = {}
+        self._order: SortedList = SortedList()
+        for p in players:
+            self.update(p)
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[RankKey]) -> "RankedLeaderboard":
+        """Build from precomputed sort keys (e.g. a roster's batched `rank_keys()`)."""
+        board = cls()
+        keys = list(keys)
+        board._keys = {key[-1]: key for key in keys}
+        board._order = SortedList(keys)
+        return board
+
+    def update_keys(self, keys: Iterable[RankKey]) -> None:
+        """`update` for precomputed keys."""
+        for new_key in keys:
+            pid = new_key[-1]
+            old_key = self._keys.get(pid)
+            if old_key == new_key:
+                continue
+            if old_key is not None:
+                self._order.remove(old_key)
+            self._order.add(new_key)
+            self._keys[pid] = new_key
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._keys
+
+    def update(self, player) -> None:
+        new_key = rank_key(player)
+        old_key = self._keys.get(player.id)
+        if old_key == new_key:
+            return
+        if old_key is not None:
+            self._order.remove(old_key)
+        self._order.add(new_key)
+        self._keys[player.id] = new_key
+
+    def remove(self, player_id: str) -> None:
+        old_key = self._keys.pop(player_id, None)
+        if old_key is not None:
+            self._order.remove(old_key)
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._order.clear()
+
+    def rank(self, player_id: str) -> Optional[int]:
+        """1-based position of a player, or None if unknown."""
+        key = self._keys.get(player_id)
+        if key is None:
+            return None
+        return self._order.index(key) + 1
+
+    def at(self, index: int) -> str:
+        """Player id at a 0-based position."""
+        return self._order[index][-1]
+
+    def top(self, k: Optional[int] = None) -> List[str]:
+        """Player ids of the first k entries (all when k is None)."""
+        stop = len(self._order) if k is None else max(0, int(k))
+        return [key[-1] for key in self._order.islice(0, stop)]
+
+    def ids(self) -> Iterator[str]:
+        for key in self._order:
+            yield key[-1]
@@ -1,21 +1,56 @@
 from __future__ import annotations
 from fastapi import FastAPI, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import socketio
+from engineio import packet as eio_packet
+import asyncio
+import functools
+import hmac
+import itertools
+import math
 import os
 import secrets
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_serializer, field_validator
 import random
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from . import storage
+from . import wire
+from .leaderboard import RankedLeaderboard
+from .event_stream import EventStream
+from .roster import PlayerRow, Roster, reveal_scores
+from .persistence import WriteBehindPersister
+from .journal import EventJournal
+from .cluster import Cluster, ClusterError
+from . import metrics
+from .profiling import Profiler, ProfilingMiddleware
+from .session_cache import SessionCache
+from .async_storage import STORAGE
 
 
 # --- FastAPI app ---
-GLOBAL_CODE = "GLOBAL"  # single quiz identifier (internal)
-QUIZ_ROOM = "quiz"
-ADMIN_ROOM = "admin"
-app = FastAPI(title="Quizzer API")
+GLOBAL_CODE = "GLOBAL"  # default quiz (used when a request/socket omits its code)
+_CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"  # minted quiz codes avoid 0/O and 1/I look-alikes
+_CODE_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789")  # characters accepted in a quiz code (validation)
+
+
+def quiz_room(code: str) -> str:
+    """Socket.IO room of a quiz's players."""
+    return f"quiz:{code}"
+
+
+def display_room(code: str) -> str:
+    """Socket.IO room of a quiz's projector/display clients (they get `frame`s, see _display_frame)."""
+    return f"display:{code}"
+
+
+def admin_room(code: str) -> str:
+    """Socket.IO room of a quiz's admin consoles."""
+    return f"admin:{code}"
+
+
+app = FastAPI(title="Quizzer API", default_response_class=wire.response_class())
 # CORS: allow ALL origins explicitly (no cookies used, so this is safe)
 app.add_middleware(
     CORSMiddleware,
@@ -27,6 +62,32 @@ app.add_middleware(
 
 # Per-question max points awarded proportional to remaining time (granular scoring)
 MAX_POINTS_PER_QUESTION = int(os.getenv("MAX_POINTS_PER_QUESTION", "1000"))
+# Admin answers-progress deltas are coalesced and flushed at most once per tick
+ANSWERS_PROGRESS_TICK_MS = int(os.getenv("ANSWERS_PROGRESS_TICK_MS", "250"))
+# Write-behind session persistence: dirty sessions are flushed at most once per interval
+SESSION_FLUSH_INTERVAL_MS = int(os.getenv("SESSION_FLUSH_INTERVAL_MS", "1000"))
+# Event journal group-commit interval (registrations, answer locks, lifelines, reveal, question changes)
+JOURNAL_SYNC_MS = int(os.getenv("JOURNAL_SYNC_MS", "50"))
+# Max in-flight per-player answer_result emits during a reveal
+REVEAL_FANOUT_CONCURRENCY = int(os.getenv("REVEAL_FANOUT_CONCURRENCY", "64"))
+# Entries in the player-facing leaderboard; the full table only goes to the admin room
+LEADERBOARD_TOP_K = int(os.getenv("LEADERBOARD_TOP_K", "10"))
+# Sessions kept in memory; idle ones (not running, no sockets, unused this long) beyond that are flushed and unloaded
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "32"))
+SESSION_IDLE_SECONDS = float(os.getenv("SESSION_IDLE_SECONDS", "300"))
+# Quiz-room broadcasts kept per session so reconnecting players can resume from their last seq
+EVENT_BUFFER_SIZE = int(os.getenv("EVENT_BUFFER_SIZE", "256"))
+# Display frames are sent at most this many times per second, and only when something changed
+DISPLAY_FRAME_HZ = min(10.0, max(1.0, float(os.getenv("DISPLAY_FRAME_HZ", "5"))))
+# Multi-worker mode: Unix socket of the local broker (python -m backend.app.broker); empty = single process
+QUIZ_BROKER = os.getenv("QUIZ_BROKER", "")
+CLUSTER: Optional[Cluster] = Cluster(QUIZ_BROKER) if QUIZ_BROKER else None
+# Profiling: calls slower than this (and loop stalls this long) are kept with stacks; ring buffer size
+SLOW_CALL_MS = float(os.getenv("SLOW_CALL_MS", "100"))
+SLOW_CALL_KEEP = int(os.getenv("SLOW_CALL_KEEP", "100"))
+PROFILE_MAX_SECONDS = 30.0
+PROFILER = Profiler(SLOW_CALL_MS, SLOW_CALL_KEEP)
+app.add_middleware(ProfilingMiddleware, profiler=PROFILER)
 
 
 @app.get("/health")
@@ -50,6 +111,7 @@ class Question(BaseModel):
 
 
 class Player(BaseModel):
+    """A player as registered / persisted; sessions keep players in a columnar Roster."""
     id: str
     name: str
     email: Optional[str] = None
@@ -62,8 +124,10 @@ class Player(BaseModel):
 
 
 class QuizSession(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     code: str
-    players: Dict[str, Player] = Field(default_factory=dict)
+    players: Roster = Field(default_factory=Roster)  # persisted as {id: Player fields}
     questions: List[Question] = Field(default_factory=list)
     current_index: int = -1
     is_active: bool = False
@@ -79,19 +143,163 @@ class QuizSession(BaseModel):
     # Sudden-death control: restrict answering to a subset of players
     sudden_death_active: bool = False
     sudden_death_allowed: Optional[List[str]] = None
-
-
-def _sort_players_for_leaderboard(players: List[Player]) -> List[Player]:
-    # Sort by: score desc, correct_firsts desc, cumulative_answer_time asc, name asc
-    return sorted(
-        players,
-        key=lambda p: (
-            -(p.score or 0),
-            -(p.correct_firsts or 0),
-            (p.cumulative_answer_time or 0.0),
-            (p.name or ""),
-        ),
-    )
+    # Last event-journal sequence number reflected in this state (snapshot covers journal up to here)
+    journal_seq: int = 0
+    # Server-driven timers: seconds after the deadline lock to reveal, and after a reveal to advance (None = manual)
+    auto_reveal_delay: Optional[float] = None
+    auto_advance_delay: Optional[float] = None
+    # Runtime-only lookup indexes (not persisted); rebuilt whenever a session is constructed
+    _email_index: Dict[str, str] = PrivateAttr(default_factory=dict)  # normalized email -> playerId
+    _allowed_set: Set[str] = PrivateAttr(default_factory=set)  # normalized allow-list
+    _ranking: RankedLeaderboard = PrivateAttr(default_factory=RankedLeaderboard)
+    # Pending admin answers-progress delta (flushed by _flush_answers_progress)
+    _progress_locked: List[str] = PrivateAttr(default_factory=list)
+    _progress_joined: Dict[str, str] = PrivateAttr(default_factory=dict)  # playerId -> name
+    _progress_task: Optional[asyncio.Task] = PrivateAttr(default=None)
+    # Deadline lock / auto-reveal / auto-advance for the current question (see _arm_question_timer)
+    _timer_task: Optional[asyncio.Task] = PrivateAttr(default=None)
+    # Running time (paused time excluded) at which question_locked went out; None until it has
+    _locked_elapsed: Optional[float] = PrivateAttr(default=None)
+    # Journal seq each persisted part (storage.SESSION_PARTS) covers; the journal is compacted to the lowest
+    _part_seqs: Dict[str, int] = PrivateAttr(default_factory=dict)
+    # Result table of the revealed current question (playerId -> correct/rank/awarded); None until revealed
+    _reveal_table: Optional[Dict[str, Dict]] = PrivateAttr(default=None)
+    # Player-safe static part of each question's `question` broadcast, by index; rebuilt when questions change
+    _question_payloads: Optional[List[Dict]] = PrivateAttr(default=None)
+    # Sequence-numbered recent quiz-room broadcasts (see _emit_to_quiz); starts a new epoch on every load
+    _stream: EventStream = PrivateAttr(default_factory=lambda: EventStream(EVENT_BUFFER_SIZE))
+    # Display feed: pending-frame flag and sender task, and whether the leaderboard overlay is up
+    _display_dirty: bool = PrivateAttr(default=False)
+    _display_task: Optional[asyncio.Task] = PrivateAttr(default=None)
+    _display_leaderboard: bool = PrivateAttr(default=False)
+    # Locked answers per choice for the current_answers dict they were counted from (see answer_histogram)
+    _answer_counts: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _answer_counts_of: Optional[Dict[str, str]] = PrivateAttr(default=None)
+    _answer_counts_seen: int = PrivateAttr(default=0)
+
+    @field_validator("players", mode="before")
+    @classmethod
+    def _load_players(cls, value):
+        return value if isinstance(value, Roster) else Roster.load(value)
+
+    @field_serializer("players")
+    def _dump_players(self, players: Roster) -> Dict[str, Dict]:
+        return players.dump()
+
+    def model_post_init(self, __context) -> None:
+        self.reindex()
+
+    def reindex(self) -> None:
+        self._email_index = {}
+        for pid, p in self.players.items():
+            if p.email:
+                # keep the first registration for an email, like the old linear scan did
+                self._email_index.setdefault(_normalize_email(p.email), pid)
+        self._allowed_set = {_normalize_email(e) for e in self.allowed_emails}
+        self._ranking = RankedLeaderboard.from_keys(self.players.rank_keys())
+
+    def set_questions(self, questions: List[Question]) -> None:
+        self.questions = questions
+        self._question_payloads = [_question_payload(q, i) for i, q in enumerate(questions)]
+
+    def question_payload(self, index: int) -> Dict:
+        """Cached `question` broadcast fields for questions[index] (answer hidden); treat as read-only."""
+        if self._question_payloads is None or len(self._question_payloads) != len(self.questions):
+            self._question_payloads = [_question_payload(q, i) for i, q in enumerate(self.questions)]
+        return self._question_payloads[index]
+
+    def add_player(self, player: Player) -> None:
+        row = self.players.add(player)
+        self.index_player_email(row)
+        self._ranking.update(row)
+
+    def rerank(self, slots: Optional[List[int]] = None) -> None:
+        """Refresh leaderboard order for roster slots whose score/tie-break fields changed (all if None)."""
+        # re-sorting everyone in one batch beats per-player updates once a large share moved
+        if slots is None or len(slots) * 4 > len(self.players):
+            self._ranking = RankedLeaderboard.from_keys(self.players.rank_keys())
+            return
+        self._ranking.update_keys(self.players.rank_keys(slots))
+
+    def ranked_players(self, limit: Optional[int] = None) -> List[PlayerRow]:
+        return [self.players[pid] for pid in self._ranking.top(limit)]
+
+    def rank_of(self, player_id: str) -> Optional[int]:
+        return self._ranking.rank(player_id)
+
+    def standing(self, player_id: str) -> Optional[Dict]:
+        """One player's your_rank message (rank, score, points behind the player above)."""
+        rank = self._ranking.rank(player_id)
+        if rank is None:
+            return None
+        above = self.players[self._ranking.at(rank - 2)].score if rank > 1 else None
+        return _rank_message(rank, self.players[player_id].score, len(self._ranking), above)
+
+    def answer_histogram(self) -> Dict[str, int]:
+        """Locked answers per choice for the current question (treat as read-only).
+
+        Locked answers are never changed and a new question gets a new dict, so only
+        answers added since the last call are counted.
+        """
+        answers = self.current_answers
+        if self._answer_counts_of is not answers or self._answer_counts_seen > len(answers):
+            self._answer_counts, self._answer_counts_of, self._answer_counts_seen = {}, answers, 0
+        counts = self._answer_counts
+        for ans in itertools.islice(answers.values(), self._answer_counts_seen, None):
+            counts[ans] = counts.get(ans, 0) + 1
+        self._answer_counts_seen = len(answers)
+        return counts
+
+    def index_player_email(self, player: PlayerRow) -> None:
+        if player.email:
+            self._email_index.setdefault(_normalize_email(player.email), player.id)
+
+    def player_by_email(self, email: str) -> Optional[PlayerRow]:
+        pid = self._email_index.get(_normalize_email(email))
+        return self.players.get(pid) if pid else None
+
+    def is_email_allowed(self, email: str) -> bool:
+        # empty allow-list => open registration
+        return not self._allowed_set or _normalize_email(email) in self._allowed_set
+
+    def set_allowed_emails(self, emails: List[str], mode: Optional[str] = "replace") -> None:
+        normalized = [_normalize_email(e) for e in emails if e.strip()]
+        if mode == "append":
+            for e in normalized:
+                if e not in self._allowed_set:
+                    self.allowed_emails.append(e)
+                    self._allowed_set.add(e)
+        elif mode == "remove":
+            remove_set = set(normalized)
+            self.allowed_emails = [e for e in self.allowed_emails if e not in remove_set]
+            self._allowed_set -= remove_set
+        else:  # replace
+            self.allowed_emails = normalized
+            self._allowed_set = set(normalized)
+
+
+def _normalize_email(email: str) -> str:
+    return (email or "").strip().lower()
+
+
+def _question_payload(q: Question, index: int) -> Dict:
+    q_player = q.model_dump()
+    q_player["answer"] = None
+    return {"question": q_player, "index": index, "duration": q.duration}
+
+
+def _current_question_payloads(session: QuizSession) -> tuple:
+    """(`question`, `status`) payloads for the current question; only the timing fields are computed per call."""
+    index = session.current_index
+    q = session.questions[index]
+    now = time.time()
+    total_paused = session.paused_accumulated + ((now - session.paused_at) if session.paused_at else 0.0)
+    elapsed = (now - session.question_started_at) - total_paused if session.question_started_at else 0.0
+    remaining = max(0.0, float(q.duration) - max(0.0, elapsed))
+    timing = {"startedAt": session.question_started_at, "serverTime": now, "remaining": remaining}
+    question = {**session.question_payload(index), **timing}
+    status = {"index": index, "total": len(session.questions), "paused": session.paused, "revealed": session.revealed, "duration": q.duration, **timing}
+    return question, status
 
 
 # --- Request / Response Models (declared early to avoid forward-ref issues) ---
@@ -105,11 +313,228 @@ def _sort_players_for_leaderboard(players: List[Player]) -> List[Player]:
 ## (Removed duplicate LifelinesPayload definition moved earlier)
 
 
-SESSIONS: Dict[str, QuizSession] = {}
 ACTIVE_PLAYER_SOCKETS: Dict[str, str] = {}  # playerId -> sid
 SID_TO_PLAYER: Dict[str, str] = {}  # sid -> playerId
 
 
+# Which QuizSession fields each persisted part holds (see storage.SESSION_PARTS)
+SESSION_PART_FIELDS: Dict[str, Set[str]] = {
+    "config": {"code", "questions", "lifelines_enabled", "auto_reveal_delay", "auto_advance_delay"},
+    "allow": {"allowed_emails"},
+    "roster": {"players"},
+    "round": {"current_index", "is_active", "paused", "revealed", "question_started_at", "current_answers",
+              "current_answer_times", "paused_at", "paused_accumulated", "sudden_death_active", "sudden_death_allowed"},
+}
+# Parts that journal events change (see _replay_journal); config and allow-list edits are saved directly
+JOURNALED_PARTS = ("roster", "round")
+
+
+def _session_snapshot(code: str, parts: Set[str]) -> Optional[Dict]:
+    session = SESSIONS.peek(code)
+    if not session:
+        return None
+    return {
+        "journal_seq": session.journal_seq,
+        "parts": {name: session.model_dump(include=SESSION_PART_FIELDS[name]) for name in parts},
+    }
+
+
+async def _compact_journal(code: str, data: Dict) -> None:
+    # The journal is only covered up to the oldest part on disk that its events change
+    session = SESSIONS.peek(code)
+    if session is None:
+        return
+    for name in data["parts"]:
+        session._part_seqs[name] = data["journal_seq"]
+    await JOURNAL.compact(code, min(session._part_seqs.get(name, 0) for name in JOURNALED_PARTS))
+
+
+def _assemble_session(code: str, parts: Dict[str, Dict]) -> QuizSession:
+    """Rebuild a session from its stored parts (falling back to a pre-partition single-file snapshot)."""
+    legacy = parts.get("legacy")
+    merged: Dict = dict(legacy["data"]) if legacy else {}
+    seqs: Dict[str, int] = {}
+    for name in storage.SESSION_PARTS:
+        part = parts.get(name) or legacy
+        if part is not None and part is not legacy:
+            merged.update(part["data"])
+        seqs[name] = part["journal_seq"] if part is not None else 0
+    merged["code"] = code
+    # replay starts after the oldest journaled part; _load_session then moves past every part
+    merged["journal_seq"] = min(seqs[name] for name in JOURNALED_PARTS)
+    session = QuizSession(**merged)
+    session._part_seqs = seqs
+    return session
+
+
+JOURNAL = EventJournal(JOURNAL_SYNC_MS)
+PERSISTER = WriteBehindPersister(_session_snapshot, SESSION_FLUSH_INTERVAL_MS, after_write=_compact_journal)
+
+# --- Metrics (served at /metrics; per worker in multi-worker mode) ---
+HANDLER_SECONDS = metrics.Histogram("quizzer_socket_handler_seconds", "Socket.IO event handler latency", ["event"])
+HANDLER_ERRORS = metrics.Counter("quizzer_socket_handler_errors_total", "Socket.IO event handlers that raised", ["event"])
+REVEAL_SECONDS = metrics.Histogram("quizzer_reveal_seconds", "Reveal latency: scoring through the last answer_result", ["phase"])
+REGISTRATIONS = metrics.Counter("quizzer_registrations_total", "New player registrations")
+EMITS = metrics.Counter("quizzer_emits_total", "Socket.IO emits by target room kind", ["room"])
+EMIT_RECIPIENTS = metrics.Counter("quizzer_emit_recipients_total", "Sockets on this worker addressed by emits, by room kind", ["room"])
+PACKETS_SENT = metrics.Counter("quizzer_packets_sent_total", "Engine.IO packets written to sockets on this worker")
+RESUMES = metrics.Counter("quizzer_stream_resumes_total", "Player (re)joins by how their state was restored", ["outcome"])
+BYTES_SENT = metrics.Counter("quizzer_packet_bytes_sent_total", "Engine.IO packet payload bytes written to sockets on this worker")
+metrics.Gauge("quizzer_sessions", "Quiz sessions held by this worker", fn=lambda: len(SESSIONS))
+metrics.Gauge("quizzer_active_player_sockets", "Players with a live socket (state owner)", fn=lambda: len(ACTIVE_PLAYER_SOCKETS))
+metrics.Gauge("quizzer_connected_sockets", "Sockets connected to this worker", fn=lambda: len(sio.manager.rooms.get("/", {}).get(None) or ()))
+metrics.Gauge("quizzer_persist_pending_sessions", "Sessions waiting for the write-behind flusher", fn=lambda: PERSISTER.pending)
+
+
+def _mark_dirty(code: str, *parts: str, lifecycle: bool = False) -> None:
+    """Queue the touched parts of a session (all if none given) for the background flusher.
+
+    Lifecycle events are flushed right away (off the loop).
+    """
+    PERSISTER.mark_dirty(code, urgent=lifecycle, parts=parts or storage.SESSION_PARTS)
+
+
+def _journal(session: QuizSession, kind: str, **fields) -> None:
+    """Append a state-changing event to the session journal (durable after the next group fsync)."""
+    session.journal_seq += 1
+    JOURNAL.append(session.code, session.journal_seq, {"type": kind, **fields})
+
+
+def _reset_question_state(session: QuizSession, index: int, started_at: Optional[float] = None) -> None:
+    session.current_index = index
+    session.revealed = False
+    session.current_answers = {}
+    session.current_answer_times = {}
+    session.question_started_at = started_at if started_at is not None else time.time()
+    session.paused = False
+    session.paused_at = None
+    session.paused_accumulated = 0.0
+    session._reveal_table = None
+    session._locked_elapsed = None
+
+
+def _replay_journal(session: QuizSession, events: List[Dict]) -> int:
+    """Re-apply journal events newer than the snapshot parts they touch. Returns how many were applied."""
+    applied = 0
+    part_seqs = session._part_seqs
+    for ev in events:
+        seq = int(ev.get("seq") or 0)
+        if seq <= session.journal_seq:
+            continue
+        # parts are written independently, so an event may already be reflected in some of them
+        roster = seq > part_seqs.get("roster", 0)
+        round_ = seq > part_seqs.get("round", 0)
+        kind = ev.get("type")
+        pid = ev.get("id")
+        if kind == "register" and roster and pid and pid not in session.players:
+            session.add_player(Player(id=pid, name=ev.get("name") or "", email=ev.get("email"), participant_code=ev.get("participantCode")))
+        elif kind == "answer_locked" and round_ and pid and int(ev.get("index", -1)) == session.current_index:
+            session.current_answers.setdefault(pid, str(ev.get("answer")))
+            session.current_answer_times.setdefault(pid, float(ev.get("ts") or time.time()))
+        elif kind == "lifeline_used" and roster and pid in session.players:
+            session.players[pid].use_lifeline(str(ev.get("lifeline")))
+        elif kind == "start":
+            if round_:
+                session.is_active = True
+                _reset_question_state(session, int(ev.get("index", 0)), ev.get("startedAt"))
+            if roster:
+                session.players.reset_lifelines()
+        elif kind == "question" and round_:
+            session.is_active = bool(ev.get("active", True))
+            _reset_question_state(session, int(ev.get("index", 0)), ev.get("startedAt"))
+        elif kind == "reveal" and round_ and int(ev.get("index", -1)) == session.current_index and not session.revealed \
+                and 0 <= session.current_index < len(session.questions):
+            if roster:
+                _apply_reveal_scoring(session)
+            else:
+                # scores were already written with the roster (which is always written before the round)
+                session.revealed = True
+        session.journal_seq = seq
+        applied += 1
+    return applied
+
+
+def _load_session(code: str) -> Optional[QuizSession]:
+    """Build a session from its stored parts and journal; None if the code has neither (or is malformed)."""
+    if not code or len(code) > 32 or not _CODE_CHARS.issuperset(code):
+        return None
+    try:
+        # SESSIONS.get is synchronous, so this read happens on the loop; it is timed as such
+        with STORAGE.blocking("load_session"):
+            parts = storage.load_session_parts(code)
+            events = EventJournal.replay(code)
+        if not parts and not events:
+            return None
+        session = _assemble_session(code, parts) if parts else QuizSession(code=code)
+    except Exception:
+        # corrupt session files
+        return None
+    # migrate single-file snapshots (and fill in missing parts) on the first flush
+    dirty = "legacy" in parts or any(name not in parts for name in storage.SESSION_PARTS)
+    covered = session.journal_seq
+    if _replay_journal(session, events):
+        dirty = True
+    # new events must sort after everything any stored part already covers
+    session.journal_seq = max(session.journal_seq, *session._part_seqs.values(), 0)
+    JOURNAL.restore_tail(code, events, covered)
+    if dirty:
+        _mark_dirty(code, lifecycle=True)
+    # a question that was running when the session was unloaded (or the process stopped) keeps its deadline
+    _arm_question_timer(session)
+    return session
+
+
+def _session_idle(code: str, session: QuizSession) -> bool:
+    if session.is_active:
+        return False
+    return not any(s.get("code") == code for s in SOCKET_SESSIONS.values())
+
+
+async def _flush_session(code: str) -> None:
+    """Write out a session before it is unloaded, so its journal compacts to empty and startup can skip it."""
+    session = SESSIONS.peek(code)
+    if session is not None:
+        behind = [name for name in JOURNALED_PARTS if session._part_seqs.get(name, 0) < session.journal_seq]
+        if behind:
+            PERSISTER.mark_dirty(code, parts=behind)
+    await PERSISTER.flush([code])
+    if PERSISTER.is_dirty(code):
+        raise RuntimeError(f"session {code} changed or failed to save while flushing")
+    await JOURNAL.close(code)
+
+
+def _drop_session(code: str, session: QuizSession) -> None:
+    _cancel_question_timer(session)
+    for task in (session._progress_task, session._display_task):
+        if task is not None and not task.done():
+            task.cancel()
+    JOURNAL.forget(code)
+
+
+def _session_stored(code: str) -> bool:
+    """Whether a code has stored parts or journal events, checked without reading them."""
+    if not code or len(code) > 32 or not _CODE_CHARS.issuperset(code):
+        return False
+    with STORAGE.blocking("session_exists"):
+        if storage.session_exists(code):
+            return True
+        journal = storage.journal_path(code)
+        return os.path.exists(journal) and os.path.getsize(journal) > 0
+
+
+SESSIONS: SessionCache[QuizSession] = SessionCache(
+    _load_session, _session_idle, _flush_session, _drop_session,
+    capacity=SESSION_CACHE_SIZE, idle_seconds=SESSION_IDLE_SECONDS, pinned=(GLOBAL_CODE,),
+    stored=_session_stored,
+)
+
+
+async def _all_session_codes() -> List[str]:
+    """Resident sessions plus everything on disk (snapshots or journals)."""
+    stored = await STORAGE.run("list_sessions", lambda: storage.list_session_codes() + storage.list_journal_codes())
+    return sorted(set(SESSIONS.keys()) | set(stored))
+
+
 def require_admin(x_admin_token: str = Header(default="")):
     secret = os.getenv("ADMIN_SECRET", "changeme")
     if not x_admin_token or x_admin_token != secret:
@@ -155,6 +580,11 @@ class LifelinesPayload(BaseModel):
     lifelines: Dict[str, bool]
 
 
+class TimersPayload(BaseModel):
+    autoRevealDelay: Optional[float] = None  # seconds after the deadline lock; None = reveal manually
+    autoAdvanceDelay: Optional[float] = None  # seconds after a reveal; None = advance manually
+
+
 class AllowedEmailsPayload(BaseModel):
     emails: List[str]
     mode: Optional[str] = "replace"  # replace | append | remove
@@ -169,44 +599,43 @@ class SuddenDeathStartPayload(BaseModel):
 
 
 @app.post("/api/admin/sudden_death/start")
-async def sudden_death_start(payload: SuddenDeathStartPayload | None = None, _: None = Depends(require_admin)):
-    session = SESSIONS.get(GLOBAL_CODE)
+async def sudden_death_start(payload: SuddenDeathStartPayload | None = None, _: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    session = SESSIONS.get(code)
     if not session:
         raise HTTPException(404, "Quiz not found")
     # Choose eligible players
-    players_sorted = _sort_players_for_leaderboard(list(session.players.values()))
     if payload and payload.playerIds:
         allowed = [pid for pid in payload.playerIds if pid in session.players]
     elif payload and payload.topN:
-        allowed = [p.id for p in players_sorted[: max(0, int(payload.topN))]]
+        allowed = [p.id for p in session.ranked_players(max(0, int(payload.topN)))]
     else:
         # default: all players currently in session
-        allowed = [p.id for p in players_sorted]
+        allowed = [p.id for p in session.ranked_players()]
     session.sudden_death_active = True
     session.sudden_death_allowed = allowed
-    storage.save_session_dict(GLOBAL_CODE, session.model_dump())
-    await sio.emit("sudden_death", {"active": True, "allowed": allowed}, room=QUIZ_ROOM)
+    _mark_dirty(code, "round", lifecycle=True)
+    await _emit_to_quiz(code, "sudden_death", {"active": True, "allowed": allowed})
     return {"ok": True, "count": len(allowed)}
 
 
 @app.post("/api/admin/sudden_death/stop")
-async def sudden_death_stop(_: None = Depends(require_admin)):
-    session = SESSIONS.get(GLOBAL_CODE)
+async def sudden_death_stop(_: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    session = SESSIONS.get(code)
     if not session:
         raise HTTPException(404, "Quiz not found")
     session.sudden_death_active = False
     session.sudden_death_allowed = None
-    storage.save_session_dict(GLOBAL_CODE, session.model_dump())
-    await sio.emit("sudden_death", {"active": False}, room=QUIZ_ROOM)
+    _mark_dirty(code, "round", lifecycle=True)
+    await _emit_to_quiz(code, "sudden_death", {"active": False})
     return {"ok": True}
 
 
 @app.get("/api/admin/final_results")
-async def final_results(_: None = Depends(require_admin)):
-    session = SESSIONS.get(GLOBAL_CODE)
+async def final_results(_: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    session = SESSIONS.get(code)
     if not session:
         raise HTTPException(404, "Quiz not found")
-    lb = _sort_players_for_leaderboard(list(session.players.values()))
+    lb = session.ranked_players()
     # Provide tie-break info in admin result
     out = [
         {
@@ -218,34 +647,98 @@ async def final_results(_: None = Depends(require_admin)):
         }
         for p in lb
     ]
-    await sio.emit("final_results", {"leaderboard": out}, room=ADMIN_ROOM)
+    await sio.emit("final_results", {"leaderboard": out}, room=admin_room(code))
     return {"leaderboard": out}
 
 
 @app.post("/api/admin/quiz", response_model=CreateQuizResponse)
 async def create_quiz(_: None = Depends(require_admin)):
-    # Backwards compatibility: returns existing global code
-    if GLOBAL_CODE not in SESSIONS:
+    # Backwards compatibility: idempotently ensures the default quiz and returns its code
+    if not SESSIONS.exists(GLOBAL_CODE):
         SESSIONS[GLOBAL_CODE] = QuizSession(code=GLOBAL_CODE)
-        storage.save_session_dict(GLOBAL_CODE, SESSIONS[GLOBAL_CODE].model_dump())
+        _mark_dirty(GLOBAL_CODE, lifecycle=True)
     return {"code": GLOBAL_CODE}
 
+
+def _mint_code(length: int = 6) -> str:
+    while True:
+        code = "".join(secrets.choice(_CODE_ALPHABET) for _ in range(length))
+        if not SESSIONS.exists(code):
+            return code
+
+
+@app.post("/api/admin/quizzes", response_model=CreateQuizResponse)
+async def create_quiz_new(_: None = Depends(require_admin)):
+    """Create a separate quiz with a freshly minted code (pass it as ?code= / socket `code`)."""
+    code = _mint_code()
+    SESSIONS[code] = QuizSession(code=code)
+    _mark_dirty(code, lifecycle=True)
+    return {"code": code}
+
+
+@app.get("/api/admin/quizzes")
+async def list_quizzes(_: None = Depends(require_admin)):
+    # Unloaded quizzes are listed by code only; loading them all would defeat the session cache
+    out = []
+    for code in await _all_session_codes():
+        s = SESSIONS.peek(code)
+        if s is None:
+            out.append({"code": code, "loaded": False})
+        else:
+            out.append({"code": s.code, "players": len(s.players), "questions": len(s.questions), "active": s.is_active, "index": s.current_index, "loaded": True})
+    return out
+
+
+@app.delete("/api/admin/quiz/{code}")
+async def delete_quiz(code: str, _: None = Depends(require_admin)):
+    """Remove one quiz: disconnect its players and delete its session and journal (snapshots are kept)."""
+    if code == GLOBAL_CODE:
+        raise HTTPException(422, "The default quiz cannot be deleted; use full_reset")
+    session = SESSIONS.pop(code, None)
+    if not session:
+        raise HTTPException(404, "Quiz not found")
+    # same teardown as unloading: timers, progress/display senders and the journal tail
+    _drop_session(code, session)
+    await _emit_to_quiz(code, "reset", {"code": code})
+    for pid in session.players:
+        sid = ACTIVE_PLAYER_SOCKETS.pop(pid, None)
+        if sid:
+            SID_TO_PLAYER.pop(sid, None)
+            try:
+                await sio.disconnect(sid)
+            except Exception:
+                pass
+    await PERSISTER.delete(code)
+    await JOURNAL.delete(code)
+    return {"ok": True}
+
 # --- Question set management (global) ---
 @app.get("/api/admin/question_sets")
-async def qsets_list(_: None = Depends(require_admin)):
-    items = storage.list_question_sets()
-    return {"items": [{"name": n, "count": c} for n, c in items]}
+async def qsets_list(
+    _: None = Depends(require_admin),
+    offset: int = 0,
+    limit: Optional[int] = None,
+    sort: str = "name",
+    order: str = "asc",
+):
+    # listing refreshes the shared catalog file, so it queues behind saves and deletes on the same key
+    items = await STORAGE.run("list_question_sets", storage.list_question_sets, sort=sort,
+                              descending=(order == "desc"), key="question_sets")
+    offset = max(0, offset)
+    page = items[offset:] if limit is None else items[offset:offset + max(0, limit)]
+    return {"items": page, "total": len(items), "offset": offset}
 
 
 @app.post("/api/admin/question_sets/save")
 async def qsets_save(payload: QuestionSetSavePayload, _: None = Depends(require_admin)):
-    fname = storage.save_question_set(payload.name, [q.model_dump() for q in payload.questions])
+    fname = await STORAGE.run("save_question_set", storage.save_question_set, payload.name,
+                              [q.model_dump() for q in payload.questions], key="question_sets")
     return {"ok": True, "file": fname}
 
 
 @app.post("/api/admin/question_sets/load")
 async def qsets_load(payload: QuestionSetNamePayload, _: None = Depends(require_admin)):
-    arr = storage.load_question_set(payload.name)
+    arr = await STORAGE.run("load_question_set", storage.load_question_set, payload.name)
     if arr is None:
         raise HTTPException(404, "Question set not found")
     # validate/parse into Question models
@@ -258,98 +751,102 @@ async def qsets_load(payload: QuestionSetNamePayload, _: None = Depends(require_
 
 @app.delete("/api/admin/question_sets/{name}")
 async def qsets_delete(name: str, _: None = Depends(require_admin)):
-    ok = storage.delete_question_set(name)
+    ok = await STORAGE.run("delete_question_set", storage.delete_question_set, name, key="question_sets")
     if not ok:
         raise HTTPException(404, "Question set not found")
     return {"ok": True}
 
 
 @app.post("/api/admin/question_sets/apply")
-async def qsets_apply(payload: QuestionSetNamePayload, _: None = Depends(require_admin)):
+async def qsets_apply(payload: QuestionSetNamePayload, _: None = Depends(require_admin), code: str = GLOBAL_CODE):
     # load the set and set it as current questions for the global quiz
-    session = SESSIONS.get(GLOBAL_CODE)
+    session = SESSIONS.get(code)
     if not session:
         raise HTTPException(404, "Quiz not found")
-    arr = storage.load_question_set(payload.name)
+    arr = await STORAGE.run("load_question_set", storage.load_question_set, payload.name)
     if arr is None:
         raise HTTPException(404, "Question set not found")
     try:
-        session.questions = [Question(**item) for item in arr]
+        session.set_questions([Question(**item) for item in arr])
     except Exception:
         raise HTTPException(422, "Invalid question set format")
-    storage.save_session_dict(GLOBAL_CODE, session.model_dump())
+    _arm_question_timer(session)
+    _mark_dirty(code, "config", lifecycle=True)
     return {"ok": True, "count": len(session.questions)}
 
 # --- Global (code-less) admin endpoints ---
 @app.post("/api/admin/questions")
-async def upload_questions_global(payload: QuestionsPayload, _: None = Depends(require_admin)):
-    return await upload_questions(GLOBAL_CODE, payload, _)
+async def upload_questions_global(payload: QuestionsPayload, _: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    return await upload_questions(code, payload, _)
 
 @app.post("/api/admin/start")
-async def start_quiz_global(payload: StartPayload | None = None, _: None = Depends(require_admin)):
-    return await start_quiz(GLOBAL_CODE, payload, _)
+async def start_quiz_global(payload: StartPayload | None = None, _: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    return await start_quiz(code, payload, _)
 
 @app.post("/api/admin/next")
-async def next_quiz_global(_: None = Depends(require_admin)):
-    return await next_question(GLOBAL_CODE, _)
+async def next_quiz_global(_: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    return await next_question(code, _)
 
 @app.post("/api/admin/reveal")
-async def reveal_global(_: None = Depends(require_admin)):
-    return await reveal_only(GLOBAL_CODE, _)
+async def reveal_global(_: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    return await reveal_only(code, _)
 
 @app.post("/api/admin/goto")
-async def goto_quiz_global(payload: GotoPayload, _: None = Depends(require_admin)):
-    return await goto_question(GLOBAL_CODE, payload, _)
+async def goto_quiz_global(payload: GotoPayload, _: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    return await goto_question(code, payload, _)
 
 @app.post("/api/admin/pause")
-async def pause_quiz_global(_: None = Depends(require_admin)):
-    return await pause_quiz(GLOBAL_CODE, _)
+async def pause_quiz_global(_: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    return await pause_quiz(code, _)
 
 @app.post("/api/admin/reset")
-async def reset_quiz_global(_: None = Depends(require_admin)):
-    return await reset_quiz(GLOBAL_CODE, _)
+async def reset_quiz_global(_: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    return await reset_quiz(code, _)
 
 @app.post("/api/admin/lifelines")
-async def lifelines_global(payload: LifelinesPayload, _: None = Depends(require_admin)):
-    return await set_lifelines(GLOBAL_CODE, payload, _)
+async def lifelines_global(payload: LifelinesPayload, _: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    return await set_lifelines(code, payload, _)
+
+@app.post("/api/admin/timers")
+async def timers_global(payload: TimersPayload, _: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    return await set_timers(code, payload, _)
 
 @app.get("/api/admin/leaderboard")
-async def leaderboard_global(_: None = Depends(require_admin)):
-    return await leaderboard(GLOBAL_CODE, _)
+async def leaderboard_global(_: None = Depends(require_admin), limit: Optional[int] = None, code: str = GLOBAL_CODE):
+    return await leaderboard(code, _, limit)
 
 @app.post("/api/admin/leaderboard/show")
-async def leaderboard_show_global(_: None = Depends(require_admin)):
-    session = SESSIONS.get(GLOBAL_CODE)
+async def leaderboard_show_global(_: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    session = SESSIONS.get(code)
     if not session:
         raise HTTPException(404, "Quiz not found")
-    lb = _sort_players_for_leaderboard(list(session.players.values()))
-    payload = [{"id": pl.id, "name": pl.name, "email": pl.email, "score": pl.score, "participantCode": pl.participant_code, "firsts": pl.correct_firsts, "cumTime": round(float(pl.cumulative_answer_time or 0.0), 3)} for pl in lb]
-    await sio.emit("leaderboard_show", payload, room=QUIZ_ROOM)
+    await _broadcast_leaderboard(session, "leaderboard_show", admins=False)
     return {"ok": True}
 
 @app.post("/api/admin/leaderboard/hide")
-async def leaderboard_hide_global(_: None = Depends(require_admin)):
-    await sio.emit("leaderboard_hide", {}, room=QUIZ_ROOM)
+async def leaderboard_hide_global(_: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    await _emit_to_quiz(code, "leaderboard_hide", {})
     return {"ok": True}
 
 @app.get("/api/admin/leaderboard/snapshots")
-async def leaderboard_snapshots_list(_: None = Depends(require_admin)):
-    items = storage.list_leaderboard_snapshots(GLOBAL_CODE)
-    return {"items": items}
+async def leaderboard_snapshots_list(_: None = Depends(require_admin), offset: int = 0, limit: Optional[int] = None, code: str = GLOBAL_CODE):
+    items = await STORAGE.run("list_leaderboard_snapshots", storage.list_leaderboard_snapshots, code, offset=offset, limit=limit)
+    total = await STORAGE.run("count_leaderboard_snapshots", storage.count_leaderboard_snapshots, code)
+    return {"items": items, "total": total, "offset": offset}
 
 @app.post("/api/admin/leaderboard/snapshots/load")
 async def leaderboard_snapshot_load(payload: SnapshotFilePayload, _: None = Depends(require_admin)):
-    data = storage.load_leaderboard_snapshot(payload.file)
+    data = await STORAGE.run("load_leaderboard_snapshot", storage.load_leaderboard_snapshot, payload.file)
     if not data:
         raise HTTPException(404, "Snapshot not found")
     return data
 
 @app.post("/api/admin/leaderboard/snapshots/apply")
-async def leaderboard_snapshot_apply(payload: SnapshotFilePayload, _: None = Depends(require_admin)):
-    session = SESSIONS.get(GLOBAL_CODE)
+async def leaderboard_snapshot_apply(payload: SnapshotFilePayload, _: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    session = SESSIONS.get(code)
     if not session:
         raise HTTPException(404, "Quiz not found")
-    data = storage.load_leaderboard_snapshot(payload.file)
+    data = await STORAGE.run("load_leaderboard_snapshot", storage.load_leaderboard_snapshot, payload.file)
     if not data:
         raise HTTPException(404, "Snapshot not found")
     lb = data.get("leaderboard") or []
@@ -360,32 +857,25 @@ async def leaderboard_snapshot_apply(payload: SnapshotFilePayload, _: None = Dep
     for p in session.players.values():
         key = (p.participant_code or '').lower()
         p.score = code_to_score.get(key, 0)
-    storage.save_session_dict(GLOBAL_CODE, session.model_dump())
+    session.rerank()
+    _mark_dirty(code, "roster", lifecycle=True)
     # emit refreshed leaderboard
-    new_lb = sorted(session.players.values(), key=lambda pl: pl.score, reverse=True)
-    payload_out = [{"id": pl.id, "name": pl.name, "email": pl.email, "score": pl.score, "participantCode": pl.participant_code} for pl in new_lb]
-    await sio.emit("leaderboard", payload_out, room=ADMIN_ROOM)
-    await sio.emit("leaderboard", payload_out, room=QUIZ_ROOM)
-    return {"ok": True, "applied": len(new_lb)}
+    await _broadcast_leaderboard(session)
+    return {"ok": True, "applied": len(session.players)}
 
 @app.post("/api/admin/leaderboard/reset")
-async def leaderboard_reset_global(_: None = Depends(require_admin)):
-    session = SESSIONS.get(GLOBAL_CODE)
+async def leaderboard_reset_global(_: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    session = SESSIONS.get(code)
     if not session:
         raise HTTPException(404, "Quiz not found")
     # Zero scores for all players
-    for p in session.players.values():
-        p.score = 0
-    p.correct_firsts = 0
-    p.cumulative_answer_time = 0.0
-    storage.save_session_dict(GLOBAL_CODE, session.model_dump())
+    session.players.reset_scores()
+    session.rerank()
+    _mark_dirty(code, "roster", lifecycle=True)
     # Broadcast updated leaderboard snapshot
-    lb = sorted(session.players.values(), key=lambda pl: pl.score, reverse=True)
-    payload = [{"id": pl.id, "name": pl.name, "email": pl.email, "score": pl.score, "participantCode": pl.participant_code} for pl in lb]
-    await sio.emit("leaderboard", payload, room=ADMIN_ROOM)
-    await sio.emit("leaderboard", payload, room=QUIZ_ROOM)
+    await _broadcast_leaderboard(session)
     # Ensure any overlay is hidden unless host shows again
-    await sio.emit("leaderboard_hide", {}, room=QUIZ_ROOM)
+    await _emit_to_quiz(code, "leaderboard_hide", {})
     return {"ok": True}
 
 @app.post("/api/admin/full_reset")
@@ -404,85 +894,131 @@ async def full_reset_global(_: None = Depends(require_admin)):
     SID_TO_PLAYER.clear()
     # Delete persisted sessions and reset in-memory
     try:
-        for code in list(SESSIONS.keys()):
+        for code in await _all_session_codes():
             try:
-                storage.delete_session(code)
+                await PERSISTER.delete(code)
+                await JOURNAL.delete(code)
             except Exception:
                 pass
     except Exception:
         pass
+    codes = SESSIONS.keys()
+    for code, session in SESSIONS.items():
+        _drop_session(code, session)
     SESSIONS.clear()
     SESSIONS[GLOBAL_CODE] = QuizSession(code=GLOBAL_CODE)
-    storage.save_session_dict(GLOBAL_CODE, SESSIONS[GLOBAL_CODE].model_dump())
+    _mark_dirty(GLOBAL_CODE, lifecycle=True)
     # Notify displays/anyone listening
-    await sio.emit("leaderboard_hide", {}, room=QUIZ_ROOM)
-    await sio.emit("reset", {"code": GLOBAL_CODE}, room=QUIZ_ROOM)
+    for code in codes:
+        await _emit_to_quiz(code, "leaderboard_hide", {})
+        await _emit_to_quiz(code, "reset", {"code": code})
     return {"ok": True}
 
 
 @app.post("/api/admin/disconnect_all")
-async def disconnect_all(_: None = Depends(require_admin)):
-    """Disconnect all connected quiz clients (players and displays)."""
+async def disconnect_all(_: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    """Disconnect all connected clients of one quiz (players and displays)."""
     count = 0
-    # Disconnect all tracked player sockets
-    for sid in list(ACTIVE_PLAYER_SOCKETS.values()):
+    session = SESSIONS.get(code)
+    # Disconnect this quiz's tracked player sockets
+    for pid in (list(session.players) if session else []):
+        sid = ACTIVE_PLAYER_SOCKETS.pop(pid, None)
+        if not sid:
+            continue
+        SID_TO_PLAYER.pop(sid, None)
         try:
             await sio.disconnect(sid)
             count += 1
         except Exception:
             pass
-    ACTIVE_PLAYER_SOCKETS.clear()
-    SID_TO_PLAYER.clear()
     # Also try to clear quiz room by emitting a reset notice (clients may voluntarily disconnect)
     try:
-        await sio.emit("reset", {"code": GLOBAL_CODE}, room=QUIZ_ROOM)
+        await _emit_to_quiz(code, "reset", {"code": code})
     except Exception:
         pass
     return {"ok": True, "disconnected": count}
 
 
+def require_metrics_auth(x_admin_token: str = Header(default=""), authorization: str = Header(default="")):
+    """Admin token as X-Admin-Token or `Authorization: Bearer <token>` (what Prometheus scrapers send)."""
+    secret = os.getenv("ADMIN_SECRET", "changeme").encode()
+    bearer = authorization[7:].strip() if authorization[:7].lower() == "bearer " else ""
+    # an unset secret must not match a request that sends no token
+    if not secret or not any(t and hmac.compare_digest(t.encode(), secret) for t in (x_admin_token, bearer)):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics(_: None = Depends(require_metrics_auth)):
+    """Prometheus text exposition of this worker's counters, gauges and latency histograms."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/admin/stats")
+async def admin_stats(_: None = Depends(require_admin)):
+    """Operational counters (persistence flush latency, pending dirty age, reveal latency, loop lag, cluster)."""
+    stats = {"sessions": len(SESSIONS), "sessionCache": SESSIONS.stats(), "persistence": PERSISTER.stats(), "storage": STORAGE.stats(), "reveal": _reveal_stats(), "loop": PROFILER.lag_stats()}
+    if CLUSTER is not None:
+        stats["cluster"] = CLUSTER.stats()
+    return stats
+
+
+@app.get("/api/admin/profile/slow")
+async def profile_slow_calls(_: None = Depends(require_admin), clear: bool = False):
+    """Recent slow handlers/emits/routes and event-loop stalls, newest first, with captured stacks."""
+    report = PROFILER.report()
+    if clear:
+        PROFILER.clear()
+    return report
+
+
+@app.post("/api/admin/profile", response_class=PlainTextResponse)
+async def profile_sample(_: None = Depends(require_admin), seconds: float = 5.0, interval_ms: float = 5.0):
+    """Sample the event loop's stack for `seconds`; returns collapsed stacks (flamegraph.pl / speedscope)."""
+    limit = PROFILE_MAX_SECONDS
+    if CLUSTER is not None:
+        limit = min(limit, CLUSTER.call_timeout - 1)  # forwarded to the owner; must answer before the call times out
+    if not (0 < seconds <= limit) or interval_ms < 1:
+        raise HTTPException(422, f"seconds must be in (0, {limit:g}] and interval_ms >= 1")
+    try:
+        samples = await asyncio.to_thread(PROFILER.sample, seconds, interval_ms)
+    except RuntimeError as e:
+        raise HTTPException(409, str(e))
+    return PlainTextResponse(Profiler.collapsed(samples))
+
+
 @app.post("/api/admin/leaderboard/snapshots/clear")
-async def leaderboard_snapshots_clear(_: None = Depends(require_admin)):
+async def leaderboard_snapshots_clear(_: None = Depends(require_admin), code: str = GLOBAL_CODE):
     """Delete all leaderboard snapshots for the global quiz."""
     try:
-        deleted = storage.delete_leaderboard_snapshots(GLOBAL_CODE)
+        deleted = await STORAGE.run("delete_leaderboard_snapshots", storage.delete_leaderboard_snapshots, code, key=f"snapshots:{code}")
     except Exception:
         deleted = 0
     return {"ok": True, "deleted": deleted}
 
 @app.get("/api/admin/allowed_emails")
-async def get_allowed_emails_global(_: None = Depends(require_admin)):
-    sess = SESSIONS.get(GLOBAL_CODE)
+async def get_allowed_emails_global(_: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    sess = SESSIONS.get(code)
     if not sess:
         raise HTTPException(404, "Quiz not found")
     return {"emails": sess.allowed_emails}
 
 @app.post("/api/admin/allowed_emails")
-async def set_allowed_emails_global(payload: AllowedEmailsPayload, _: None = Depends(require_admin)):
-    sess = SESSIONS.get(GLOBAL_CODE)
+async def set_allowed_emails_global(payload: AllowedEmailsPayload, _: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    sess = SESSIONS.get(code)
     if not sess:
         raise HTTPException(404, "Quiz not found")
-    normalized = [e.strip().lower() for e in payload.emails if e.strip()]
-    if payload.mode == "append":
-        existing = set(sess.allowed_emails)
-        for e in normalized:
-            if e not in existing:
-                sess.allowed_emails.append(e)
-    elif payload.mode == "remove":
-        remove_set = set(normalized)
-        sess.allowed_emails = [e for e in sess.allowed_emails if e not in remove_set]
-    else:  # replace
-        sess.allowed_emails = normalized
-    storage.save_session_dict(GLOBAL_CODE, sess.model_dump())
+    sess.set_allowed_emails(payload.emails, payload.mode)
+    _mark_dirty(code, "allow", lifecycle=True)
     return {"emails": sess.allowed_emails, "count": len(sess.allowed_emails)}
 
 @app.get("/api/quiz/validate")
-async def validate_global():
-    return {"valid": True}
+async def validate_global(code: str = GLOBAL_CODE):
+    return {"valid": SESSIONS.exists(code)}
 
 @app.post("/api/quiz/register", response_model=RegisterResponse)
-async def register_global(payload: RegisterPayload):
-    return await register_user(GLOBAL_CODE, payload)
+async def register_global(payload: RegisterPayload, code: str = GLOBAL_CODE):
+    return await register_user(code, payload)
 
 
 ## (removed duplicate QuestionsPayload definition)
@@ -493,14 +1029,15 @@ async def upload_questions(code: str, payload: QuestionsPayload, _: None = Depen
     session = SESSIONS.get(code)
     if not session:
         raise HTTPException(404, "Quiz not found")
-    session.questions = payload.questions
-    storage.save_session_dict(code, session.model_dump())
+    session.set_questions(payload.questions)
+    _arm_question_timer(session)
+    _mark_dirty(code, "config", lifecycle=True)
     return {"ok": True, "count": len(session.questions)}
 
 
 @app.post("/api/admin/questions/export")
-async def export_questions(_: None = Depends(require_admin)):
-    session = SESSIONS.get(GLOBAL_CODE)
+async def export_questions(_: None = Depends(require_admin), code: str = GLOBAL_CODE):
+    session = SESSIONS.get(code)
     if not session:
         raise HTTPException(404, "Quiz not found")
     return {"questions": [q.model_dump() for q in session.questions]}
@@ -522,39 +1059,39 @@ async def register_user(code: str, payload: RegisterPayload):  # legacy path; st
         raise HTTPException(404, "Quiz not found")
     if not payload.email:
         raise HTTPException(422, "Email required")
-    # Allowed list check (case-insensitive)
-    if session.allowed_emails:
-        if payload.email.strip().lower() not in {e.lower() for e in session.allowed_emails}:
-            raise HTTPException(403, "Email not allowed")
-    normalized_email = payload.email.strip().lower()
+    # Allowed list check (case-insensitive, indexed)
+    if not session.is_email_allowed(payload.email):
+        raise HTTPException(403, "Email not allowed")
+    normalized_email = _normalize_email(payload.email)
     # Reuse existing player if email already registered (allow reconnect)
-    existing = next((p for p in session.players.values() if (p.email or '').lower() == normalized_email), None)
+    existing = session.player_by_email(normalized_email)
     if existing:
         return {"playerId": existing.id, "participantCode": existing.participant_code or normalized_email}
     # Create new player
     pid = secrets.token_hex(8)
     player = Player(id=pid, name=payload.name, email=payload.email, participant_code=normalized_email)
-    session.players[pid] = player
-    # Defer disk write to reduce I/O under load; registration will be persisted
-    # by the next lifecycle event (start/goto/next/reveal/reset) or periodic snapshot.
+    session.add_player(player)
+    # No full-session write per registration: the journal append is durable after the next group fsync
+    _journal(session, "register", id=pid, name=player.name, email=player.email, participantCode=player.participant_code)
+    REGISTRATIONS.inc()
     return {"playerId": pid, "participantCode": player.participant_code}
 
 
 @app.get("/api/admin/quiz/{code}/leaderboard")
-async def leaderboard(code: str, _: None = Depends(require_admin)):
+async def leaderboard(code: str, _: None = Depends(require_admin), limit: Optional[int] = None):
     session = SESSIONS.get(code)
     if not session:
         raise HTTPException(404, "Quiz not found")
-    lb = _sort_players_for_leaderboard(list(session.players.values()))
+    lb = session.ranked_players(limit)
     return [{"id": p.id, "name": p.name, "email": p.email, "score": p.score, "participantCode": p.participant_code, "online": bool(ACTIVE_PLAYER_SOCKETS.get(p.id)), "firsts": p.correct_firsts, "cumTime": round(float(p.cumulative_answer_time or 0.0), 3)} for p in lb]
 
 
 @app.get("/api/quiz/leaderboard")
-async def public_leaderboard():
-    session = SESSIONS.get(GLOBAL_CODE)
+async def public_leaderboard(limit: Optional[int] = None, code: str = GLOBAL_CODE):
+    session = SESSIONS.get(code)
     if not session:
         raise HTTPException(404, "Quiz not found")
-    lb = _sort_players_for_leaderboard(list(session.players.values()))
+    lb = session.ranked_players(limit)
     return [{"name": p.name, "score": p.score} for p in lb]
 
 
@@ -571,29 +1108,26 @@ async def start_quiz(code: str, payload: StartPayload | None = None, _: None = D
     # If no questions uploaded yet, guard
     if not session.questions:
         session.current_index = -1
-        storage.save_session_dict(code, session.model_dump())
+        _mark_dirty(code, "round", lifecycle=True)
         return {"ok": False, "message": "No questions uploaded"}
-    session.current_index = payload.index if payload and payload.index is not None else 0
-    session.revealed = False
-    session.current_answers = {}
-    session.question_started_at = time.time()
-    session.paused_at = None
-    session.paused_accumulated = 0.0
-    session.current_answer_times = {}
+    _reset_question_state(session, payload.index if payload and payload.index is not None else 0)
     # Reset per-player lifelines for the new round (once per round)
-    for p in session.players.values():
-        p.lifelines = {"5050": True, "hint": True}
+    session.players.reset_lifelines()
+    fresh = {"5050": True, "hint": True}
+    for pid in session.players:
         # notify connected player of fresh lifeline status
-        sid = ACTIVE_PLAYER_SOCKETS.get(p.id)
+        sid = ACTIVE_PLAYER_SOCKETS.get(pid)
         if sid:
             try:
-                await sio.emit("lifeline_status", p.lifelines, to=sid)
+                await sio.emit("lifeline_status", fresh, to=sid)
             except Exception:
                 pass
-    # Persist on lifecycle to amortize disk writes.
-    storage.save_session_dict(code, session.model_dump())
+    _journal(session, "start", index=session.current_index, startedAt=session.question_started_at)
+    # Persist on lifecycle (flushed immediately by the write-behind task).
+    _mark_dirty(code, "roster", "round", lifecycle=True)
+    _arm_question_timer(session)
     await emit_current_question(code)
-    await _emit_answers_progress(session)
+    await _reset_answers_progress(session)
     return {"ok": True}
 
 
@@ -609,20 +1143,15 @@ async def goto_question(code: str, payload: GotoPayload, _: None = Depends(requi
         raise HTTPException(422, f"Index out of range: {target}")
     # Set quiz active and move to the target index; reset per-question state
     session.is_active = True
-    session.current_index = target
-    session.revealed = False
-    session.current_answers = {}
-    session.current_answer_times = {}
-    session.question_started_at = time.time()
-    session.paused = False
-    session.paused_at = None
-    session.paused_accumulated = 0.0
-    # Persist on lifecycle to amortize disk writes.
-    storage.save_session_dict(code, session.model_dump())
+    _reset_question_state(session, target)
+    _journal(session, "question", index=target, startedAt=session.question_started_at, active=True)
+    # Persist on lifecycle (flushed immediately by the write-behind task).
+    _mark_dirty(code, "round", lifecycle=True)
+    _arm_question_timer(session)
     # Hide overlays and broadcast the selected question
-    await sio.emit("leaderboard_hide", {}, room=QUIZ_ROOM)
+    await _emit_to_quiz(code, "leaderboard_hide", {})
     await emit_current_question(code)
-    await _emit_answers_progress(session)
+    await _reset_answers_progress(session)
     return {"ok": True, "index": target}
 
 
@@ -636,27 +1165,20 @@ async def next_question(code: str, _: None = Depends(require_admin)):
     # If not yet revealed, do a reveal (once) and do not advance yet
     if not session.revealed and 0 <= session.current_index < len(session.questions):
         await _reveal_answers(session)
-        storage.save_session_dict(code, session.model_dump())
+        _mark_dirty(code, "roster", "round", lifecycle=True)
+        _arm_question_timer(session)
         return {"ok": True, "revealed": True}
     # First next after reset: set to 0 if currently -1
-    if session.current_index < 0:
-        session.current_index = 0
-    else:
-        session.current_index += 1
     # Reset per-question state for the new index
-    session.revealed = False
-    session.current_answers = {}
-    session.question_started_at = time.time()
-    session.paused = False
-    session.paused_at = None
-    session.paused_accumulated = 0.0
-    session.current_answer_times = {}
-    # Persist on lifecycle to amortize disk writes.
-    storage.save_session_dict(code, session.model_dump())
+    _reset_question_state(session, 0 if session.current_index < 0 else session.current_index + 1)
+    _journal(session, "question", index=session.current_index, startedAt=session.question_started_at, active=session.is_active)
+    # Persist on lifecycle (flushed immediately by the write-behind task).
+    _mark_dirty(code, "round", lifecycle=True)
+    _arm_question_timer(session)
     # Ensure leaderboard is hidden when moving to the next question
-    await sio.emit("leaderboard_hide", {}, room=QUIZ_ROOM)
+    await _emit_to_quiz(code, "leaderboard_hide", {})
     await emit_current_question(code)
-    await _emit_answers_progress(session)
+    await _reset_answers_progress(session)
     return {"ok": True}
 
 
@@ -668,8 +1190,9 @@ async def reveal_only(code: str, _: None = Depends(require_admin)):
     if not (0 <= session.current_index < len(session.questions)):
         return {"ok": False, "message": "No active question"}
     await _reveal_answers(session)
-    # Persist on lifecycle to amortize disk writes.
-    storage.save_session_dict(code, session.model_dump())
+    # Persist on lifecycle (flushed immediately by the write-behind task).
+    _mark_dirty(code, "roster", "round", lifecycle=True)
+    _arm_question_timer(session)
     return {"ok": True, "revealed": True}
 
 
@@ -682,15 +1205,17 @@ async def pause_quiz(code: str, _: None = Depends(require_admin)):
     if not session.paused:
         session.paused = True
         session.paused_at = time.time()
-        await sio.emit("paused", {"code": code}, room=QUIZ_ROOM)
+        await _emit_to_quiz(code, "paused", {"code": code})
     else:
         session.paused = False
         now = time.time()
         if session.paused_at:
             session.paused_accumulated += max(0.0, now - session.paused_at)
         session.paused_at = None
-        await sio.emit("resumed", {"code": code}, room=QUIZ_ROOM)
-    storage.save_session_dict(code, session.model_dump())
+        await _emit_to_quiz(code, "resumed", {"code": code})
+    # pausing stops the clock; resuming re-arms the deadline with the paused time added
+    _arm_question_timer(session)
+    _mark_dirty(code, "round", lifecycle=True)
     return {"ok": True}
 
 
@@ -700,7 +1225,7 @@ async def reset_quiz(code: str, _: None = Depends(require_admin)):
     if not session:
         raise HTTPException(404, "Quiz not found")
     # Keep players, but clear all questions and per-question state
-    session.questions = []
+    session.set_questions([])
     session.current_index = -1
     session.is_active = False
     session.paused = False
@@ -710,12 +1235,15 @@ async def reset_quiz(code: str, _: None = Depends(require_admin)):
     session.question_started_at = None
     session.paused_at = None
     session.paused_accumulated = 0.0
+    session._reveal_table = None
+    session._locked_elapsed = None
     session.sudden_death_active = False
     session.sudden_death_allowed = None
+    _cancel_question_timer(session)
     # Hide any overlays and send everyone back to lobby
-    await sio.emit("leaderboard_hide", {}, room=QUIZ_ROOM)
-    await sio.emit("reset", {"code": code}, room=QUIZ_ROOM)
-    storage.save_session_dict(code, session.model_dump())
+    await _emit_to_quiz(code, "leaderboard_hide", {})
+    await _emit_to_quiz(code, "reset", {"code": code})
+    _mark_dirty(code, "config", "round", lifecycle=True)
     return {"ok": True}
 
 
@@ -730,43 +1258,191 @@ async def set_lifelines(code: str, payload: LifelinesPayload, _: None = Depends(
     allowed_keys = {"5050", "hint"}
     filtered = {k: bool(v) for k, v in payload.lifelines.items() if k in allowed_keys}
     session.lifelines_enabled.update(filtered)
-    await sio.emit("lifelines", session.lifelines_enabled, room=ADMIN_ROOM)
-    storage.save_session_dict(code, session.model_dump())
+    await sio.emit("lifelines", session.lifelines_enabled, room=admin_room(code))
+    _mark_dirty(code, "config", lifecycle=True)
     return {"ok": True, "lifelines": session.lifelines_enabled}
 
 
+@app.post("/api/admin/quiz/{code}/timers")
+async def set_timers(code: str, payload: TimersPayload, _: None = Depends(require_admin)):
+    """Configure auto-reveal / auto-advance gaps (seconds; null = manual). Questions always lock at their deadline."""
+    session = SESSIONS.get(code)
+    if not session:
+        raise HTTPException(404, "Quiz not found")
+    for value in (payload.autoRevealDelay, payload.autoAdvanceDelay):
+        if value is not None and value < 0:
+            raise HTTPException(422, "Delays must be >= 0 seconds")
+    session.auto_reveal_delay = payload.autoRevealDelay
+    session.auto_advance_delay = payload.autoAdvanceDelay
+    _arm_question_timer(session)
+    timers = _timer_settings(session)
+    await sio.emit("timers", timers, room=admin_room(code))
+    _mark_dirty(code, "config", lifecycle=True)
+    return {"ok": True, "timers": timers}
+
+
 # --- Socket.IO server (ASGI) ---
-sio = socketio.AsyncServer(
+def _room_kind(room: Optional[str]) -> str:
+    if room is None:
+        return "all"
+    if room.startswith("quiz:"):
+        return "quiz"
+    if room.startswith("admin:"):
+        return "admin"
+    if room.startswith("display:"):
+        return "display"
+    return "socket"
+
+
+class QuizServer(socketio.AsyncServer):
+    """AsyncServer that counts emits, recipients and bytes for /metrics and times handlers/emits for the profiler.
+
+    It also speaks msgpack to connections that ask for it (`?serializer=msgpack`, see wire.py):
+    their packets are decoded with the msgpack parser, and room broadcasts, which the manager
+    encodes once as JSON, are transcoded once per emit for them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._msgpack_sids: Set[str] = set()
+        self._transcoded: Tuple[object, object] = (None, None)
+
+    async def emit(self, event, data=None, to=None, room=None, skip_sid=None, namespace=None, callback=None, ignore_queue=False):
+        target = room or to
+        kind = _room_kind(target)
+        EMITS.labels(kind).inc()
+        if kind != "socket":
+            EMIT_RECIPIENTS.labels(kind).inc(len(self.manager.rooms.get(namespace or "/", {}).get(target) or ()))
+        else:
+            EMIT_RECIPIENTS.labels(kind).inc()
+        with PROFILER.call("emit", f"{event} -> {kind}"):
+            return await super().emit(event, data=data, to=to, room=room, skip_sid=skip_sid, namespace=namespace, callback=callback, ignore_queue=ignore_queue)
+
+    async def _trigger_event(self, event, namespace, *args):
+        with PROFILER.call("socket", event):
+            return await super()._trigger_event(event, namespace, *args)
+
+    async def _handle_eio_connect(self, eio_sid, environ):
+        if wire.wants_msgpack(environ):
+            self._msgpack_sids.add(eio_sid)
+        return await super()._handle_eio_connect(eio_sid, environ)
+
+    async def _handle_eio_disconnect(self, eio_sid):
+        try:
+            return await super()._handle_eio_disconnect(eio_sid)
+        finally:
+            self._msgpack_sids.discard(eio_sid)
+
+    async def _handle_eio_message(self, eio_sid, data):
+        if eio_sid not in self._msgpack_sids:
+            return await super()._handle_eio_message(eio_sid, data)
+        # msgpack packets carry binary data inline, so there are no attachment packets to collect
+        pkt = wire.decode_msgpack(data)
+        if pkt.packet_type == socketio.packet.CONNECT:
+            await self._handle_connect(eio_sid, pkt.namespace, pkt.data)
+        elif pkt.packet_type == socketio.packet.DISCONNECT:
+            await self._handle_disconnect(eio_sid, pkt.namespace)
+        elif pkt.packet_type == socketio.packet.EVENT:
+            await self._handle_event(eio_sid, pkt.namespace, pkt.id, pkt.data)
+        elif pkt.packet_type == socketio.packet.ACK:
+            await self._handle_ack(eio_sid, pkt.namespace, pkt.id, pkt.data)
+        else:
+            raise ValueError("Unexpected packet type from a msgpack client.")
+
+    async def _send_packet(self, eio_sid, pkt):
+        if eio_sid in self._msgpack_sids:
+            return await self.eio.send(eio_sid, wire.to_msgpack(pkt))
+        return await super()._send_packet(eio_sid, pkt)
+
+    def _as_msgpack(self, eio_pkt):
+        """msgpack form of a JSON-encoded broadcast packet; the last conversion is reused for the rest of the room."""
+        source, converted = self._transcoded
+        if source is not eio_pkt:
+            data = wire.transcode_to_msgpack(eio_pkt.data)
+            converted = eio_pkt if data is None else eio_packet.Packet(eio_packet.MESSAGE, data)
+            self._transcoded = (eio_pkt, converted)
+        return converted
+
+    async def _send_eio_packet(self, eio_sid, eio_pkt):
+        if eio_sid in self._msgpack_sids and isinstance(eio_pkt.data, str):
+            eio_pkt = self._as_msgpack(eio_pkt)
+        PACKETS_SENT.inc()
+        payload = eio_pkt.data
+        if isinstance(payload, (str, bytes)):
+            BYTES_SENT.inc(len(payload))
+        return await super()._send_eio_packet(eio_sid, eio_pkt)
+
+
+sio = QuizServer(
     async_mode="asgi",
+    serializer=wire.TextPacket,
+    json=wire.json_module(),
     cors_allowed_origins="*",
     transports=["websocket"],  # reduce overhead: disable long-polling
+    client_manager=CLUSTER.manager if CLUSTER else None,
 )
 
+# Per-socket data ({code, playerId, admin}). Kept here rather than in the Socket.IO session
+# so that handlers forwarded to the state owner in multi-worker mode can see it.
+SOCKET_SESSIONS: Dict[str, Dict] = {}
+# Unwrapped handlers of owner-only Socket.IO events, by event name
+_OWNED_EVENTS: Dict[str, object] = {}
+
+
+def _owned(handler):
+    """Run a Socket.IO handler where the quiz state lives (forwarded to the owner worker when clustered)."""
+    _OWNED_EVENTS[handler.__name__] = handler
+
+    @functools.wraps(handler)
+    async def wrapper(sid, *args):
+        if CLUSTER is None:
+            return await _timed_handler(handler, sid, args)
+        if CLUSTER.is_owner:
+            await CLUSTER.wait_ready()
+            return await _timed_handler(handler, sid, args)
+        try:
+            return await CLUSTER.call_owner("sio", handler.__name__, sid, args)
+        except (ClusterError, asyncio.TimeoutError) as e:
+            print("Forwarding", handler.__name__, "failed:", e)
+    return wrapper
+
+
+async def _timed_handler(handler, sid: str, args: tuple):
+    event = handler.__name__
+    t0 = time.perf_counter()
+    try:
+        return await handler(sid, *args)
+    except Exception:
+        HANDLER_ERRORS.labels(event).inc()
+        raise
+    finally:
+        HANDLER_SECONDS.labels(event).observe(time.perf_counter() - t0)
+
+
+async def _serve_socket_event(caller: str, event: str, sid: str, args: tuple):
+    """Owner side of a forwarded Socket.IO event; remembers which worker holds the socket."""
+    if event == "disconnect":
+        CLUSTER.manager.sid_hosts.pop(sid, None)
+    else:
+        CLUSTER.manager.sid_hosts[sid] = caller
+    return await _timed_handler(_OWNED_EVENTS[event], sid, args)
+
 
 async def emit_current_question(code: str):
     session = SESSIONS.get(code)
     if not session:
         return
     if 0 <= session.current_index < len(session.questions):
-        q = session.questions[session.current_index]
-        q_player = q.model_dump()
-        if "answer" in q_player:
-            q_player["answer"] = None
-        # compute remaining
-        now = time.time()
-        total_paused = session.paused_accumulated + ((now - session.paused_at) if session.paused_at else 0.0)
-        elapsed = (now - session.question_started_at) - total_paused if session.question_started_at else 0.0
-        remaining = max(0.0, float(q.duration) - max(0.0, elapsed))
-        await sio.emit("question", {"question": q_player, "index": session.current_index, "duration": q.duration, "startedAt": session.question_started_at, "serverTime": now, "remaining": remaining}, room=QUIZ_ROOM)
-        status_payload = {"index": session.current_index, "total": len(session.questions), "paused": session.paused, "revealed": session.revealed, "duration": q.duration, "startedAt": session.question_started_at, "serverTime": now, "remaining": remaining}
-        await sio.emit("status", status_payload, room=ADMIN_ROOM)
-        await sio.emit("status", status_payload, room=QUIZ_ROOM)
+        question_payload, status_payload = _current_question_payloads(session)
+        await _emit_to_quiz(code, "question", question_payload)
+        await sio.emit("status", status_payload, room=admin_room(code))
+        await _emit_to_quiz(code, "status", status_payload)
     else:
         if session.is_active:
-            await sio.emit("complete", {}, room=QUIZ_ROOM)
+            await _emit_to_quiz(code, "complete", {})
         session.is_active = False
         # Emit final results (with tie-break info) to admins
-        lb = _sort_players_for_leaderboard(list(session.players.values())) if session.players else []
+        lb = session.ranked_players()
         out = [
             {
                 "id": p.id,
@@ -777,15 +1453,18 @@ async def emit_current_question(code: str):
             }
             for p in lb
         ]
-        await sio.emit("final_results", {"leaderboard": out}, room=ADMIN_ROOM)
+        await sio.emit("final_results", {"leaderboard": out}, room=admin_room(code))
         # End sudden-death if any
         session.sudden_death_active = False
         session.sudden_death_allowed = None
-    storage.save_session_dict(code, session.model_dump())
+    _mark_dirty(code, "round")
 
 
 async def _emit_answers_progress(session: QuizSession, to_sid: Optional[str] = None):
-    """Send how many and which players have locked answers to admins (or to a specific SID)."""
+    """Send a full snapshot of how many and which players have locked answers to admins (or to a specific SID).
+
+    Only used on admin_join / explicit resync; live updates go through _queue_answers_progress.
+    """
     try:
         locked_ids = list(session.current_answers.keys())
         items = []
@@ -806,26 +1485,215 @@ async def _emit_answers_progress(session: QuizSession, to_sid: Optional[str] = N
         if to_sid:
             await sio.emit("answers_progress", payload, to=to_sid)
         else:
-            await sio.emit("answers_progress", payload, room=ADMIN_ROOM)
+            await sio.emit("answers_progress", payload, room=admin_room(session.code))
+    except Exception:
+        pass
+
+
+def _queue_answers_progress(session: QuizSession, locked_pid: Optional[str] = None, joined: Optional[PlayerRow] = None):
+    """Record a lock/join for the next coalesced answers_progress_delta and make sure a flush is scheduled."""
+    if locked_pid:
+        session._progress_locked.append(locked_pid)
+    if joined is not None:
+        session._progress_joined[joined.id] = joined.name
+    if session._progress_task is None or session._progress_task.done():
+        session._progress_task = asyncio.create_task(_flush_answers_progress(session))
+    # displays show the same counts
+    _queue_display_frame(session)
+
+
+def _display_frame(session: QuizSession) -> Dict:
+    """Everything a display shows, in one payload: question and clock, answer counts, top K."""
+    frame = {
+        "code": session.code,
+        "active": session.is_active,
+        "index": session.current_index,
+        "total": len(session.questions),
+        "question": None,
+        "players": len(session.players),
+        "locked": len(session.current_answers),
+        "histogram": {},
+        "top": [{"rank": rank, "name": p.name, "score": p.score} for rank, p in enumerate(session.ranked_players(LEADERBOARD_TOP_K), 1)],
+        "leaderboard": session._display_leaderboard,
+    }
+    if 0 <= session.current_index < len(session.questions):
+        _, status = _current_question_payloads(session)
+        frame.update(status)
+        frame["question"] = session.question_payload(session.current_index)["question"]
+        frame["histogram"] = session.answer_histogram()
+        frame["correctAnswer"] = session.questions[session.current_index].answer if session.revealed else None
+    return frame
+
+
+def _queue_display_frame(session: QuizSession) -> None:
+    """Mark the display frame stale and make sure a sender is scheduled."""
+    session._display_dirty = True
+    if session._display_task is None or session._display_task.done():
+        session._display_task = asyncio.create_task(_send_display_frames(session))
+
+
+async def _send_display_frames(session: QuizSession):
+    """One frame per tick while changes keep coming, built once and shared by every display."""
+    while session._display_dirty:
+        await asyncio.sleep(1.0 / DISPLAY_FRAME_HZ)
+        session._display_dirty = False
+        try:
+            await sio.emit("frame", _display_frame(session), room=display_room(session.code))
+        except Exception:
+            pass
+
+
+async def _flush_answers_progress(session: QuizSession):
+    """One coalesced delta per tick; locks/joins queued while a delta was being sent go out on the next one."""
+    while session._progress_locked or session._progress_joined:
+        await asyncio.sleep(ANSWERS_PROGRESS_TICK_MS / 1000.0)
+        locked_ids, session._progress_locked = session._progress_locked, []
+        joined, session._progress_joined = session._progress_joined, {}
+        locked = []
+        for pid in locked_ids:
+            p = session.players.get(pid)
+            if p:
+                locked.append({"id": pid, "name": p.name})
+        payload = {
+            "lockedCount": len(session.current_answers),
+            "playersCount": len(session.players),
+            "locked": locked,
+            "joined": [{"id": pid, "name": name} for pid, name in joined.items()],
+        }
+        try:
+            await sio.emit("answers_progress_delta", payload, room=admin_room(session.code))
+        except Exception:
+            pass
+
+
+async def _reset_answers_progress(session: QuizSession):
+    """New question: drop pending deltas and tell admins every player is unlocked again."""
+    if session._progress_task is not None and not session._progress_task.done():
+        session._progress_task.cancel()
+    session._progress_task = None
+    session._progress_locked = []
+    joined, session._progress_joined = session._progress_joined, {}
+    payload = {
+        "reset": True,
+        "lockedCount": len(session.current_answers),
+        "playersCount": len(session.players),
+        "locked": [],
+        "joined": [{"id": pid, "name": name} for pid, name in joined.items()],
+    }
+    try:
+        await sio.emit("answers_progress_delta", payload, room=admin_room(session.code))
     except Exception:
         pass
 
 
+# --- Server-driven question timers ---
+def _timer_settings(session: QuizSession) -> Dict:
+    return {"autoRevealDelay": session.auto_reveal_delay, "autoAdvanceDelay": session.auto_advance_delay}
+
+
+def _cancel_question_timer(session: QuizSession) -> None:
+    task = session._timer_task
+    # a timer that is itself advancing the quiz re-arms from inside its own task; don't cancel it mid-way
+    if task is not None and not task.done() and task is not asyncio.current_task():
+        task.cancel()
+    session._timer_task = None
+
+
+def _arm_question_timer(session: QuizSession) -> None:
+    """(Re)schedule the current question's timer from session state; call after anything that changes it.
+
+    Not revealed: lock at question_started_at + duration + paused_accumulated, then reveal after
+    auto_reveal_delay (if set). Revealed: advance after auto_advance_delay (if set). Paused or
+    inactive sessions have no timer; resuming re-arms it, without locking a question twice and
+    with only what was left of the reveal delay (paused time does not count towards it).
+    """
+    _cancel_question_timer(session)
+    if not session.is_active or session.paused or session.question_started_at is None:
+        return
+    if not (0 <= session.current_index < len(session.questions)):
+        return
+    if session.revealed and session.auto_advance_delay is None:
+        return
+    session._timer_task = asyncio.create_task(_run_question_timer(session, session.current_index, session.question_started_at))
+
+
+def _question_elapsed(session: QuizSession) -> float:
+    """Seconds the current question has been running, paused time excluded."""
+    now = time.time()
+    total_paused = session.paused_accumulated + ((now - session.paused_at) if session.paused_at else 0.0)
+    return now - session.question_started_at - total_paused
+
+
+async def _run_question_timer(session: QuizSession, index: int, started_at: float) -> None:
+    code = session.code
+
+    def still_current() -> bool:
+        return (SESSIONS.peek(code) is session and session.is_active and not session.paused
+                and session.current_index == index and session.question_started_at == started_at)
+
+    try:
+        if not session.revealed:
+            if session._locked_elapsed is None:
+                q = session.questions[index]
+                deadline = started_at + float(q.duration) + session.paused_accumulated
+                await asyncio.sleep(max(0.0, deadline - time.time()))
+                if not still_current() or session.revealed:
+                    return
+                session._locked_elapsed = _question_elapsed(session)
+                # submit_answer already rejects late answers; this tells clients to stop the clock now
+                locked = {"code": code, "index": index, "lockedAt": time.time(), "answered": len(session.current_answers)}
+                await _emit_to_quiz(code, "question_locked", locked)
+                await sio.emit("question_locked", locked, room=admin_room(code))
+            if session.auto_reveal_delay is None:
+                return
+            # measured on the question's running clock, so a pause after the lock holds the countdown
+            await asyncio.sleep(max(0.0, session._locked_elapsed + session.auto_reveal_delay - _question_elapsed(session)))
+            if not still_current() or session.revealed:
+                return
+            await _reveal_answers(session)
+            _mark_dirty(code, "roster", "round", lifecycle=True)
+        if session.auto_advance_delay is None:
+            return
+        await asyncio.sleep(session.auto_advance_delay)
+        if not still_current() or not session.revealed:
+            return
+        await next_question(code)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print("Question timer failed for", code, ":", e)
+
+
 @sio.event
 async def connect(sid, environ, auth):
     print("Client connected", sid)
 
 
 @sio.event
+@_owned
 async def disconnect(sid):
     print("Client disconnected", sid)
+    SOCKET_SESSIONS.pop(sid, None)
     # clean active socket tracking
     player_id = SID_TO_PLAYER.pop(sid, None)
     if player_id and ACTIVE_PLAYER_SOCKETS.get(player_id) == sid:
         ACTIVE_PLAYER_SOCKETS.pop(player_id, None)
 
 
+async def _emit_answer_result(sid: str, session: QuizSession, pid: str) -> None:
+    """Re-send a player's result for the revealed current question."""
+    player = session.players.get(pid)
+    if player is None:
+        return
+    q = session.questions[session.current_index]
+    res = _revealed_results(session).get(pid)
+    correct = res["correct"] if res else q.answer is None
+    awarded = res["awarded"] if res else 0
+    await sio.emit("answer_result", {"correct": correct, "score": player.score, "rank": res["rank"] if res else None, "bonus": awarded, "awarded": awarded}, to=sid)
+
+
 @sio.event
+@_owned
 async def join_quiz(sid, data):
     code = data.get("code") or GLOBAL_CODE
     name = data.get("name")
@@ -843,13 +1711,15 @@ async def join_quiz(sid, data):
         # Always sync email & participant_code to email (or keep existing unique variant)
         if not player.email:
             player.email = email
+            session.index_player_email(player)
+            _mark_dirty(code, "roster")
         if player.participant_code and not player.participant_code.startswith(player.email.lower()):
             # leave customized unique variant
             pass
         elif not player.participant_code:
             player.participant_code = player.email.lower()
-        storage.save_session_dict(code, session.model_dump())
-    await sio.save_session(sid, {"code": code, "playerId": pid, "name": name, "admin": False})
+            _mark_dirty(code, "roster")
+    SOCKET_SESSIONS[sid] = {"code": code, "playerId": pid, "name": name, "admin": False}
     # Enforce single active socket per player: disconnect prior if exists
     prev_sid = ACTIVE_PLAYER_SOCKETS.get(pid)
     if prev_sid and prev_sid != sid:
@@ -860,61 +1730,55 @@ async def join_quiz(sid, data):
             pass
     ACTIVE_PLAYER_SOCKETS[pid] = sid
     SID_TO_PLAYER[sid] = pid
-    await sio.enter_room(sid, QUIZ_ROOM)
-    await sio.emit("joined", {"ok": True, "participantCode": player.participant_code if player else None}, to=sid)
+    joined = {"ok": True, "participantCode": player.participant_code if player else None}
+    # A reconnect that still has its missed broadcasts in the buffer gets just those, plus its own state
+    replayed = await _resume_stream(sid, session, data, joined)
+    if replayed is not None:
+        if player:
+            await sio.emit("lifeline_status", player.lifelines, to=sid)
+        if 0 <= session.current_index < len(session.questions):
+            if pid in session.current_answers:
+                await sio.emit("answer_locked", {"locked": True, "answer": session.current_answers.get(pid)}, to=sid)
+            if "reveal" in replayed and session.revealed:
+                await _emit_answer_result(sid, session, pid)
+        if player and replayed & {"leaderboard", "leaderboard_show"}:
+            standing = session.standing(pid)
+            if standing:
+                await sio.emit("your_rank", standing, to=sid)
+        _queue_answers_progress(session, joined=player)
+        return
+    await sio.enter_room(sid, quiz_room(code))
+    await sio.emit("joined", {**joined, "stream": session._stream.position()}, to=sid)
     # send current lifeline status to this player
     if player:
         await sio.emit("lifeline_status", player.lifelines, to=sid)
     # If a quiz is already active, send the current question immediately so late joiners see it
     if session.is_active and 0 <= session.current_index < len(session.questions):
         q = session.questions[session.current_index]
-        q_player = q.model_dump()
-        if "answer" in q_player:
-            q_player["answer"] = None
-        now = time.time()
-        total_paused = session.paused_accumulated + ((now - session.paused_at) if session.paused_at else 0.0)
-        elapsed = (now - session.question_started_at) - total_paused if session.question_started_at else 0.0
-        remaining = max(0.0, float(q.duration) - max(0.0, elapsed))
-        await sio.emit("question", {"question": q_player, "index": session.current_index, "duration": q.duration, "startedAt": session.question_started_at, "serverTime": now, "remaining": remaining}, to=sid)
-        await sio.emit("status", {"index": session.current_index, "total": len(session.questions), "paused": session.paused, "revealed": session.revealed, "duration": q.duration, "startedAt": session.question_started_at, "serverTime": now, "remaining": remaining}, to=sid)
+        question_payload, status_payload = _current_question_payloads(session)
+        await sio.emit("question", question_payload, to=sid)
+        await sio.emit("status", status_payload, to=sid)
         # If player had previously locked, reflect that for seamless reconnection
         if pid in session.current_answers:
             await sio.emit("answer_locked", {"locked": True, "answer": session.current_answers.get(pid)}, to=sid)
         # If already revealed, replay reveal and player's result
         if session.revealed:
             await sio.emit("reveal", {"correctAnswer": q.answer}, to=sid)
-            correct_ids: List[str] = []
-            for ppid, ans in session.current_answers.items():
-                corr = q.answer is None or str(ans).strip().lower() == str(q.answer).strip().lower()
-                if corr:
-                    correct_ids.append(ppid)
-            correct_ids.sort(key=lambda ppid: session.current_answer_times.get(ppid, float('inf')))
-            rank = (correct_ids.index(pid) + 1) if (pid in correct_ids) else None
-            player_obj = session.players.get(pid)
-            if player_obj is not None:
-                ans = session.current_answers.get(pid)
-                is_correct = q.answer is None or (ans is not None and str(ans).strip().lower() == str(q.answer).strip().lower())
-                # Compute time-based bonus consistent with reveal scoring
-                submit_ts = session.current_answer_times.get(pid, session.question_started_at or time.time())
-                paused_total = session.paused_accumulated or 0.0
-                elapsed = 0.0
-                if session.question_started_at:
-                    elapsed = max(0.0, submit_ts - session.question_started_at - paused_total)
-                dur = float(q.duration or 0)
-                clamped_elapsed = min(max(elapsed, 0.0), dur if dur > 0 else elapsed)
-                if is_correct and dur > 0:
-                    rem = max(0.0, dur - clamped_elapsed)
-                    bonus = int(round(MAX_POINTS_PER_QUESTION * (rem / dur)))
-                else:
-                    bonus = 0
-                await sio.emit("answer_result", {"correct": bool(is_correct), "score": player_obj.score, "rank": rank, "bonus": bonus}, to=sid)
-        # Update admins with latest counts when someone (re)joins
-        await _emit_answers_progress(session)
+            await _emit_answer_result(sid, session, pid)
+    # Once the quiz has started, tell a (re)joining player where they stand
+    if player and session.current_index >= 0:
+        standing = session.standing(pid)
+        if standing:
+            await sio.emit("your_rank", standing, to=sid)
+    # Update admins with latest counts when someone (re)joins (coalesced)
+    if player:
+        _queue_answers_progress(session, joined=player)
 
 
 @sio.event
+@_owned
 async def submit_answer(sid, data):
-    sess = await sio.get_session(sid)
+    sess = SOCKET_SESSIONS.get(sid)
     code = sess.get("code") if sess else None
     pid = sess.get("playerId") if sess else None
     answer = data.get("answer")
@@ -953,15 +1817,17 @@ async def submit_answer(sid, data):
         return
     session.current_answers[pid] = str(answer)
     session.current_answer_times[pid] = time.time()
-    # Do NOT persist per-answer to avoid heavy I/O; answers will be saved on reveal/next.
-    await sio.emit("answer_submitted", {"playerId": pid, "name": p.name if p else "?"}, room=ADMIN_ROOM)
+    # Journal the lock instead of rewriting the session; snapshots happen on reveal/next.
+    _journal(session, "answer_locked", id=pid, index=idx, answer=str(answer), ts=session.current_answer_times[pid])
     await sio.emit("answer_locked", {"locked": True, "answer": str(answer)}, to=sid)
-    await _emit_answers_progress(session)
+    # Admins learn about the lock through the next batched answers_progress_delta
+    _queue_answers_progress(session, locked_pid=pid)
 
 
 @sio.event
+@_owned
 async def lifeline_request(sid, data):
-    sess = await sio.get_session(sid)
+    sess = SOCKET_SESSIONS.get(sid)
     code = sess.get("code") if sess else GLOBAL_CODE
     pid = sess.get("playerId") if sess else None
     lifeline = data.get("lifeline")
@@ -979,8 +1845,8 @@ async def lifeline_request(sid, data):
         await sio.emit("lifeline_denied", {"lifeline": lifeline}, to=sid)
         return
     # Mark used and notify admin; clients implement effects client-side
-    player.lifelines[lifeline] = False
-    await sio.emit("lifeline_used", {"playerId": pid, "name": player.name, "lifeline": lifeline}, room=ADMIN_ROOM)
+    player.use_lifeline(lifeline)
+    await sio.emit("lifeline_used", {"playerId": pid, "name": player.name, "lifeline": lifeline}, room=admin_room(code))
     # notify player of current lifeline availability
     await sio.emit("lifeline_status", player.lifelines, to=sid)
     # Server-driven effects
@@ -1000,11 +1866,12 @@ async def lifeline_request(sid, data):
         await sio.emit("lifeline_hint", {"hint": q.hint or ""}, to=sid)
     else:
         await sio.emit("lifeline_ack", {"lifeline": lifeline}, to=sid)
-    # Persist lifeline usage with lifecycle batching; optional immediate persist could be enabled if needed.
-    storage.save_session_dict(code, session.model_dump())
+    # Persist lifeline usage through the journal (group fsync, no full-session rewrite)
+    _journal(session, "lifeline_used", id=pid, lifeline=lifeline)
 
 
 @sio.event
+@_owned
 async def admin_join(sid, data):
     code = data.get("code") or GLOBAL_CODE
     token = data.get("token")
@@ -1012,18 +1879,38 @@ async def admin_join(sid, data):
     if not code or token != secret:
         await sio.emit("error", {"message": "Unauthorized"}, to=sid)
         return
-    await sio.save_session(sid, {"code": code, "admin": True})
-    await sio.enter_room(sid, ADMIN_ROOM)
+    SOCKET_SESSIONS[sid] = {"code": code, "admin": True}
+    await sio.enter_room(sid, admin_room(code))
     await sio.emit("admin_joined", {"ok": True}, to=sid)
-    # send snapshot of current answers progress
+    # Admin-room events are not sequenced or replayed (see _emit_to_quiz), so every (re)join gets the full admin state
     session = SESSIONS.get(code)
     if session:
         await _emit_answers_progress(session, to_sid=sid)
+        await sio.emit("timers", _timer_settings(session), to=sid)
+        await sio.emit("lifelines", session.lifelines_enabled, to=sid)
+        if 0 <= session.current_index < len(session.questions):
+            await sio.emit("status", _current_question_payloads(session)[1], to=sid)
+        if len(session.players):
+            await sio.emit("leaderboard", _admin_leaderboard(session), to=sid)
+
+
+@sio.event
+@_owned
+async def answers_progress_resync(sid, data=None):
+    """Admin-requested full answers_progress snapshot (e.g. after missing deltas)."""
+    sess = SOCKET_SESSIONS.get(sid)
+    if not sess or not sess.get("admin"):
+        await sio.emit("error", {"message": "Unauthorized"}, to=sid)
+        return
+    session = SESSIONS.get(sess.get("code") or GLOBAL_CODE)
+    if session:
+        await _emit_answers_progress(session, to_sid=sid)
 
 
 @sio.event
+@_owned
 async def admin_command(sid, data):
-    sess = await sio.get_session(sid)
+    sess = SOCKET_SESSIONS.get(sid)
     if not sess or not sess.get("admin"):
         await sio.emit("error", {"message": "Unauthorized"}, to=sid)
         return
@@ -1037,139 +1924,356 @@ async def admin_command(sid, data):
         session = SESSIONS.get(code)
         if session:
             await _reveal_answers(session)
-            storage.save_session_dict(code, session.model_dump())
+            _mark_dirty(code, "roster", "round", lifecycle=True)
+            _arm_question_timer(session)
     elif action == "show_leaderboard":
         session = SESSIONS.get(code)
         if session:
-            lb = _sort_players_for_leaderboard(list(session.players.values()))
-            payload = [{"id": pl.id, "name": pl.name, "email": pl.email, "score": pl.score, "participantCode": pl.participant_code} for pl in lb]
-            await sio.emit("leaderboard_show", payload, room=QUIZ_ROOM)
+            await _broadcast_leaderboard(session, "leaderboard_show", admins=False)
     elif action == "hide_leaderboard":
-        await sio.emit("leaderboard_hide", {}, room=QUIZ_ROOM)
+        await _emit_to_quiz(code, "leaderboard_hide", {})
 
 
 @sio.event
+@_owned
 async def display_join(sid, data=None):
-    """Allow a display client to receive quiz-room broadcasts without being a player."""
+    """Attach a projector/display client: it gets throttled `frame`s in the display room, not player broadcasts."""
     code = (data or {}).get("code") if isinstance(data, dict) else None
     code = code or GLOBAL_CODE
     session = SESSIONS.get(code)
-    await sio.enter_room(sid, QUIZ_ROOM)
-    # Send current question and status immediately, if active
-    if session and session.is_active and 0 <= session.current_index < len(session.questions):
-        q = session.questions[session.current_index]
-        q_player = q.model_dump()
-        if "answer" in q_player:
-            q_player["answer"] = None
-        now = time.time()
-        total_paused = session.paused_accumulated + ((now - session.paused_at) if session.paused_at else 0.0)
-        elapsed = (now - session.question_started_at) - total_paused if session.question_started_at else 0.0
-        remaining = max(0.0, float(q.duration) - max(0.0, elapsed))
-        await sio.emit("question", {"question": q_player, "index": session.current_index, "duration": q.duration, "startedAt": session.question_started_at, "serverTime": now, "remaining": remaining}, to=sid)
-        await sio.emit("status", {"index": session.current_index, "total": len(session.questions), "paused": session.paused, "revealed": session.revealed, "duration": q.duration, "startedAt": session.question_started_at, "serverTime": now, "remaining": remaining}, to=sid)
+    # tracked so a quiz with a display attached is never unloaded
+    SOCKET_SESSIONS[sid] = {"code": code, "admin": False, "display": True}
+    await sio.enter_room(sid, display_room(code))
+    # Frames carry the whole display state, so a (re)joining display just needs the current one
+    if session:
+        await sio.emit("frame", _display_frame(session), to=sid)
+
+
+# HTTP scope keys a forwarded request needs (the rest is server-specific and not picklable)
+_FORWARDED_SCOPE_KEYS = ("type", "asgi", "http_version", "method", "scheme", "path", "raw_path",
+                         "root_path", "query_string", "headers", "server", "client")
+
+
+def _forward_api_to_owner(http_app):
+    """In multi-worker mode, relay /api requests from non-owner workers to the state owner."""
+    async def forwarding_app(scope, receive, send):
+        if CLUSTER is None or CLUSTER.is_owner or scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            return await http_app(scope, receive, send)
+        body = b""
+        more = True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+        request = {k: scope[k] for k in _FORWARDED_SCOPE_KEYS if k in scope}
+        try:
+            status, headers, payload = await CLUSTER.call_owner("http", request, body)
+        except (ClusterError, asyncio.TimeoutError):
+            status, headers, payload = 503, [(b"content-type", b"application/json")], b'{"detail":"Quiz state owner unavailable"}'
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": payload})
+    return forwarding_app
+
+
+async def _serve_http(caller: str, request: Dict, body: bytes):
+    """Owner side of a forwarded HTTP request: run it through the app and return the buffered response."""
+    response = {"status": 500, "headers": [], "body": []}
+    consumed = False
+
+    async def receive():
+        nonlocal consumed
+        if consumed:
+            return {"type": "http.disconnect"}
+        consumed = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = [tuple(h) for h in message.get("headers", [])]
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    await app(dict(request), receive, send)
+    return response["status"], response["headers"], b"".join(response["body"])
 
 
 # Compose ASGI app so that both HTTP and Socket.IO share the same server
-asgi_app = socketio.ASGIApp(sio, other_asgi_app=app, socketio_path="/ws/socket.io")
+asgi_app = socketio.ASGIApp(sio, other_asgi_app=_forward_api_to_owner(app), socketio_path="/ws/socket.io")
+
 
-# Load persisted sessions on startup
 @app.on_event("startup")
+async def _startup():
+    PROFILER.start()
+    if CLUSTER is None:
+        await _load_sessions()
+        return
+    # Every worker serves sockets; only the elected owner loads and mutates quiz state
+    CLUSTER.serve("sio", _serve_socket_event)
+    CLUSTER.serve("http", _serve_http)
+    await CLUSTER.start(on_owner=_load_sessions)
+
+
+# Load persisted sessions on startup (or when promoted to state owner)
 async def _load_sessions():
-    data = storage.load_all_session_dicts()
-    for code, sess_dict in data.items():
-        try:
-            SESSIONS[code] = QuizSession(**sess_dict)
-        except Exception:
-            # skip corrupt sessions
-            continue
-    if GLOBAL_CODE not in SESSIONS:
+    # Only sessions that may be running are loaded now: the default quiz, active rounds, single-file
+    # snapshots awaiting migration and journals with events not yet in a snapshot. The rest load on first access.
+    for code in await _all_session_codes():
+        if code == GLOBAL_CODE or _may_be_running(code):
+            SESSIONS.get(code)
+    if SESSIONS.get(GLOBAL_CODE) is None:
         SESSIONS[GLOBAL_CODE] = QuizSession(code=GLOBAL_CODE)
-        storage.save_session_dict(GLOBAL_CODE, SESSIONS[GLOBAL_CODE].model_dump())
+        _mark_dirty(GLOBAL_CODE, lifecycle=True)
+    JOURNAL.start()
+    PERSISTER.start()
+    SESSIONS.start()
+
+
+def _may_be_running(code: str) -> bool:
+    try:
+        journal = storage.journal_path(code)
+        if os.path.exists(journal) and os.path.getsize(journal) > 0:
+            return True
+        round_ = storage.load_session_part(code, "round")
+    except Exception:
+        return False
+    return round_ is None or bool(round_["data"].get("is_active"))
+
+
+@app.on_event("shutdown")
+async def _flush_sessions():
+    # Guaranteed final flush of anything still dirty, then sync and close journals
+    if CLUSTER is None or CLUSTER.is_owner:
+        await SESSIONS.stop()
+        await PERSISTER.stop()
+        await JOURNAL.stop()
+    STORAGE.close()
+    # Leaving the broker only after the flush lets the next owner load complete state
+    if CLUSTER is not None:
+        await CLUSTER.close()
+    await PROFILER.stop()
 
 # Run with: uvicorn backend.app.main:asgi_app --reload --app-dir .
 
 # --- Helper to reveal answers ---
+def _reveal_results(session: QuizSession) -> Dict[str, Dict]:
+    """Per-player outcome of the current question, scored in one batch without mutating the session.
+
+    Maps player id -> {correct, rank, awarded, elapsed}; rank is the 1-based position
+    among correct responders by submission time (None when wrong).
+    """
+    q = session.questions[session.current_index]
+    expected = None if q.answer is None else str(q.answer).strip().lower()
+    pids = [pid for pid in session.current_answers if pid in session.players]
+    # answers are choice ids: check each distinct value once
+    verdicts: Dict[str, bool] = {}
+    correct: List[bool] = []
+    for pid in pids:
+        ans = session.current_answers[pid]
+        ok = verdicts.get(ans)
+        if ok is None:
+            ok = verdicts[ans] = expected is None or str(ans).strip().lower() == expected
+        correct.append(ok)
+    times = session.current_answer_times
+    started = session.question_started_at
+    elapsed, awarded, ranks = reveal_scores(
+        [times.get(pid, math.inf) for pid in pids], correct, started, session.paused_accumulated or 0.0,
+        float(q.duration or 0), MAX_POINTS_PER_QUESTION, started or time.time(),
+    )
+    return {
+        pid: {"correct": ok, "rank": rank or None, "awarded": points, "elapsed": secs}
+        for pid, ok, rank, points, secs in zip(pids, correct, ranks, awarded, elapsed)
+    }
+
+
+def _apply_reveal_scoring(session: QuizSession) -> Dict[str, Dict]:
+    """Score the current question and mark it revealed. Returns the per-player result table."""
+    results = _reveal_results(session)
+    slot_of = session.players.slot
+    winners = [(slot_of(pid), res) for pid, res in results.items() if res["correct"]]
+    slots = [slot for slot, _ in winners]
+    # Track first-correct for tie-breaks
+    first = next((slot for slot, res in winners if res["rank"] == 1), None)
+    session.players.award(slots, [res["awarded"] for _, res in winners], [res["elapsed"] for _, res in winners], first)
+    # Only correct responders changed score/tie-break fields; re-rank just those
+    session.rerank(slots)
+    session.revealed = True
+    session._reveal_table = results
+    return results
+
+
+def _revealed_results(session: QuizSession) -> Dict[str, Dict]:
+    """Result table of the revealed current question, served from the session cache."""
+    if session._reveal_table is None:
+        # Restored from a snapshot taken after the reveal: rebuild the table without re-scoring
+        session._reveal_table = _reveal_results(session)
+    return session._reveal_table
+
+
+# Reveal latency counters (scoring, fan-out, reveal-to-last-result), exposed via /api/admin/stats
+REVEAL_STATS: Dict[str, float] = {
+    "reveals": 0, "lastResults": 0, "lastScoringMs": 0.0, "lastFanoutMs": 0.0,
+    "lastTotalMs": 0.0, "maxTotalMs": 0.0, "sumTotalMs": 0.0,
+}
+
+
+def _reveal_stats() -> Dict:
+    stats = {k: (round(v, 3) if isinstance(v, float) else v) for k, v in REVEAL_STATS.items() if k != "sumTotalMs"}
+    n = REVEAL_STATS["reveals"]
+    stats["avgTotalMs"] = round(REVEAL_STATS["sumTotalMs"] / n, 3) if n else 0.0
+    stats["fanoutConcurrency"] = REVEAL_FANOUT_CONCURRENCY
+    return stats
+
+
+async def _emit_to_quiz(code: str, event: str, data: Dict) -> None:
+    """Broadcast to a quiz room; the payload gets the session stream's next `seq` so clients can resume.
+
+    Only quiz rooms are sequenced. Admin-room payloads (some are bare lists) go out unstamped and a
+    reconnecting admin is resynced from a full snapshot by admin_join; display frames carry the
+    whole display state, and display_join sends the current one.
+    """
+    session = SESSIONS.peek(code)
+    if session is not None:
+        data = session._stream.record(event, data)
+        if event == "leaderboard_show":
+            session._display_leaderboard = True
+        elif event in ("leaderboard_hide", "question", "reset"):
+            session._display_leaderboard = False
+        _queue_display_frame(session)
+    await sio.emit(event, data, room=quiz_room(code))
+
+
+async def _resume_stream(sid: str, session: QuizSession, data: Dict, joined: Dict) -> Optional[Set[str]]:
+    """Resume a reconnecting socket from its last-seen broadcast instead of a full snapshot.
+
+    `data` carries the client's `epoch` and `lastSeq`. When the buffer still holds every
+    event after it, sends `joined` (with that position), replays the missed events, a
+    fresh `status` for the clock, and puts the socket back in the quiz room; returns the
+    replayed event names. Otherwise returns None and the caller sends the snapshot.
+    Replays go out before the socket rejoins the room so newer broadcasts can't overtake them.
+    """
+    stream = session._stream
+    last = data.get("lastSeq")
+    if data.get("epoch") != stream.epoch or not isinstance(last, int) or stream.since(last) is None:
+        RESUMES.labels("snapshot").inc()
+        return None
+    await sio.emit("joined", {**joined, "stream": {"epoch": stream.epoch, "seq": last}}, to=sid)
+    replayed: Set[str] = set()
+    while True:
+        missed = stream.since(last)
+        if missed is None:
+            # fell this far behind while replaying: start over from a snapshot
+            RESUMES.labels("snapshot").inc()
+            return None
+        if not missed:
+            break
+        for event, payload in missed:
+            await sio.emit(event, payload, to=sid)
+            replayed.add(event)
+        last = missed[-1][1]["seq"]
+    # nothing awaits between the last check and joining, so no broadcast can fall in between
+    await sio.enter_room(sid, quiz_room(session.code))
+    if session.is_active and 0 <= session.current_index < len(session.questions):
+        await sio.emit("status", _current_question_payloads(session)[1], to=sid)
+    RESUMES.labels("replay").inc()
+    return replayed
+
+
+async def _fan_out(event: str, messages: List[tuple]) -> None:
+    """Emit (sid, payload) pairs concurrently, at most REVEAL_FANOUT_CONCURRENCY in flight."""
+    sem = asyncio.Semaphore(max(1, REVEAL_FANOUT_CONCURRENCY))
+
+    async def send(sid: str, payload: Dict) -> None:
+        async with sem:
+            try:
+                await sio.emit(event, payload, to=sid)
+            except Exception:
+                pass
+
+    await asyncio.gather(*(send(sid, payload) for sid, payload in messages))
+
+
+def _rank_message(rank: int, score: int, players: int, above: Optional[int]) -> Dict:
+    return {"rank": rank, "score": score, "players": players, "gapToNext": None if above is None else above - score}
+
+
+def _admin_leaderboard(session: QuizSession) -> List[Dict]:
+    return [{"id": pl.id, "name": pl.name, "email": pl.email, "score": pl.score, "participantCode": pl.participant_code, "firsts": pl.correct_firsts, "cumTime": round(float(pl.cumulative_answer_time or 0.0), 3)} for pl in session.ranked_players()]
+
+
+def _player_leaderboard(session: QuizSession) -> Tuple[Dict, List[tuple]]:
+    """Top LEADERBOARD_TOP_K with aggregates for the quiz room, plus a (sid, your_rank) pair per connected player.
+
+    One walk of the ranking; emails and participant codes never leave the admin room.
+    """
+    ranked = session.ranked_players()
+    total = len(ranked)
+    top: List[Dict] = []
+    messages: List[tuple] = []
+    score_sum = 0
+    above: Optional[int] = None
+    for rank, pl in enumerate(ranked, 1):
+        score_sum += pl.score
+        if rank <= LEADERBOARD_TOP_K:
+            top.append({"rank": rank, "name": pl.name, "score": pl.score})
+        sid = ACTIVE_PLAYER_SOCKETS.get(pl.id)
+        if sid:
+            messages.append((sid, _rank_message(rank, pl.score, total, above)))
+        above = pl.score
+    public = {"top": top, "players": total, "topScore": top[0]["score"] if top else 0, "avgScore": round(score_sum / total, 1) if total else 0.0}
+    return public, messages
+
+
+async def _broadcast_leaderboard(session: QuizSession, event: str = "leaderboard", admins: bool = True) -> None:
+    """Full table to admins (optional), top K to the quiz room as `event`, your_rank to each player."""
+    if admins:
+        await sio.emit("leaderboard", _admin_leaderboard(session), room=admin_room(session.code))
+    public, messages = _player_leaderboard(session)
+    await _emit_to_quiz(session.code, event, public)
+    await _fan_out("your_rank", messages)
+
+
 async def _reveal_answers(session: QuizSession):
     if session.revealed or not (0 <= session.current_index < len(session.questions)):
         return
+    t0 = time.perf_counter()
     q = session.questions[session.current_index]
-    # Evaluate all locked answers with rank-based bonus
-    correct_ids: List[str] = []
-    for pid, ans in session.current_answers.items():
-        player = session.players.get(pid)
-        if not player:
-            continue
-        correct = q.answer is None or str(ans).strip().lower() == str(q.answer).strip().lower()
-        if correct:
-            correct_ids.append(pid)
-    # Sort correct responders by submission time (earlier is better)
-    correct_ids.sort(key=lambda pid: session.current_answer_times.get(pid, float('inf')))
-    # Track first-correct for tie-breaks
-    if correct_ids:
-        first_pid = correct_ids[0]
-        first_player = session.players.get(first_pid)
-        if first_player:
-            first_player.correct_firsts = int(first_player.correct_firsts or 0) + 1
-    # Award scores purely based on remaining time and capture cumulative time for correct answers
-    per_player_awarded: Dict[str, int] = {}
-    for pid in correct_ids:
-        player = session.players.get(pid)
-        if not player:
-            continue
-        submit_ts = session.current_answer_times.get(pid, session.question_started_at or time.time())
-        paused_total = session.paused_accumulated or 0.0
-        elapsed = 0.0
-        if session.question_started_at:
-            elapsed = max(0.0, submit_ts - session.question_started_at - paused_total)
-        # Clamp to question duration
-        dur = float(q.duration or 0)
-        clamped_elapsed = min(max(elapsed, 0.0), dur if dur > 0 else elapsed)
-        if dur > 0:
-            rem = max(0.0, dur - clamped_elapsed)
-            awarded = int(round(MAX_POINTS_PER_QUESTION * (rem / dur)))
-        else:
-            awarded = 0
-        player.score += awarded
-        per_player_awarded[pid] = awarded
-        player.cumulative_answer_time = float(player.cumulative_answer_time or 0.0) + float(clamped_elapsed)
-    session.revealed = True
+    results = _apply_reveal_scoring(session)
+    _journal(session, "reveal", index=session.current_index)
+    t_scored = time.perf_counter()
     # Emit reveal to players (include correct answer id/text)
     reveal_payload = {"correctAnswer": q.answer}
-    await sio.emit("reveal", reveal_payload, room=QUIZ_ROOM)
+    await _emit_to_quiz(session.code, "reveal", reveal_payload)
     # Send per-player answer result (include rank/bonus for correct answers)
-    for pid, ans in session.current_answers.items():
-        player = session.players.get(pid)
-        if not player:
-            continue
-        correct = q.answer is None or str(ans).strip().lower() == str(q.answer).strip().lower()
+    messages = []
+    for pid, res in results.items():
         sid = ACTIVE_PLAYER_SOCKETS.get(pid)
         if sid:
-            rank = (correct_ids.index(pid) + 1) if correct and pid in correct_ids else None
-            # Informational: report awarded points based on the player submission
-            submit_ts = session.current_answer_times.get(pid, session.question_started_at or time.time())
-            paused_total = session.paused_accumulated or 0.0
-            elapsed = 0.0
-            if session.question_started_at:
-                elapsed = max(0.0, submit_ts - session.question_started_at - paused_total)
-            dur = float(q.duration or 0)
-            clamped_elapsed = min(max(elapsed, 0.0), dur if dur > 0 else elapsed)
-            if correct and dur > 0:
-                rem = max(0.0, dur - clamped_elapsed)
-                awarded = int(round(MAX_POINTS_PER_QUESTION * (rem / dur)))
-            else:
-                awarded = 0
             # Keep legacy 'bonus' field for compatibility; add 'awarded'
-            await sio.emit("answer_result", {"correct": correct, "score": player.score, "rank": rank, "bonus": awarded, "awarded": awarded}, to=sid)
-    # Update leaderboard for admins
-    lb = _sort_players_for_leaderboard(list(session.players.values()))
-    lb_payload = [{"id": pl.id, "name": pl.name, "email": pl.email, "score": pl.score, "participantCode": pl.participant_code, "firsts": pl.correct_firsts, "cumTime": round(float(pl.cumulative_answer_time or 0.0), 3)} for pl in lb]
+            messages.append((sid, {"correct": res["correct"], "score": session.players[pid].score, "rank": res["rank"], "bonus": res["awarded"], "awarded": res["awarded"]}))
+    await _fan_out("answer_result", messages)
+    t_done = time.perf_counter()
+    total_ms = (t_done - t0) * 1000.0
+    REVEAL_STATS["reveals"] += 1
+    REVEAL_STATS["lastResults"] = len(messages)
+    REVEAL_STATS["lastScoringMs"] = (t_scored - t0) * 1000.0
+    REVEAL_STATS["lastFanoutMs"] = (t_done - t_scored) * 1000.0
+    REVEAL_STATS["lastTotalMs"] = total_ms
+    REVEAL_STATS["maxTotalMs"] = max(REVEAL_STATS["maxTotalMs"], total_ms)
+    REVEAL_STATS["sumTotalMs"] += total_ms
+    REVEAL_SECONDS.labels("scoring").observe(t_scored - t0)
+    REVEAL_SECONDS.labels("fanout").observe(t_done - t_scored)
+    REVEAL_SECONDS.labels("total").observe(t_done - t0)
+    # Full table for admins (and the snapshot); players get top K plus their own rank
+    lb_payload = _admin_leaderboard(session)
     try:
-        storage.save_leaderboard_snapshot(session.code, lb_payload)
+        await STORAGE.run("save_leaderboard_snapshot", storage.save_leaderboard_snapshot, session.code, lb_payload,
+                          key=f"snapshots:{session.code}")
     except Exception:
         pass
-    await sio.emit("leaderboard", lb_payload, room=ADMIN_ROOM)
-    await sio.emit("leaderboard", lb_payload, room=QUIZ_ROOM)
+    await sio.emit("leaderboard", lb_payload, room=admin_room(session.code))
+    await _broadcast_leaderboard(session, admins=False)
     # Update status for admins and players
     status_payload = {"index": session.current_index, "total": len(session.questions), "paused": session.paused, "revealed": session.revealed}
-    await sio.emit("status", status_payload, room=ADMIN_ROOM)
-    await sio.emit("status", status_payload, room=QUIZ_ROOM)
+    await sio.emit("status", status_payload, room=admin_room(session.code))
+    await _emit_to_quiz(session.code, "status", status_payload)
@@ -0,0 +1,164 @@
+"""Minimal Prometheus-style metrics (counters, gauges, histograms).
+
+Kept dependency-free and cheap on the hot path: an observation is a dict lookup,
+a bisect and two additions. `render()` produces the text exposition format served
+at /metrics.
+"""
+from __future__ import annotations
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Default latency buckets (seconds): sub-millisecond handlers up to multi-second reveals/flushes
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+COUNT_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000)
+
+_REGISTRY: List["_Metric"] = []
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _num(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) and not v.is_integer() else str(int(v))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        _REGISTRY.append(self)
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_fmt_labels(self.label_names, k)} {_num(c.value)}" for k, c in self._children.items()]
+
+
+class Gauge(_Metric):
+    """Set directly, or computed at scrape time from `fn` (unlabelled)."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), fn: Optional[Callable[[], float]] = None) -> None:
+        super().__init__(name, help, labels)
+        self.fn = fn
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def _samples(self) -> List[str]:
+        if self.fn is not None:
+            try:
+                return [f"{self.name} {_num(self.fn())}"]
+            except Exception:
+                return []
+        return [f"{self.name}{_fmt_labels(self.label_names, k)} {_num(c.value)}" for k, c in self._children.items()]
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> List[str]:
+        out = []
+        for key, child in self._children.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += n
+                le = 'le="%s"' % _num(bound)
+                out.append(f"{self.name}_bucket{_fmt_labels(self.label_names, key, le)} {cumulative}")
+            out.append(f"{self.name}_sum{_fmt_labels(self.label_names, key)} {_num(child.sum)}")
+            out.append(f"{self.name}_count{_fmt_labels(self.label_names, key)} {child.count}")
+        return out
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text exposition format (0.0.4)."""
+    return "\n".join(m.render() for m in _REGISTRY) + "\n"
+
+
+# --- metrics shared across modules ---
+SESSION_SAVE_SECONDS = Histogram("quizzer_session_save_seconds", "Time to encode and write one session snapshot")
+SESSION_SAVE_BYTES = Histogram("quizzer_session_save_bytes", "Size of written session snapshots", buckets=SIZE_BUCKETS)
+SESSION_SAVE_ERRORS = Counter("quizzer_session_save_errors_total", "Failed session snapshot writes")
@@ -0,0 +1,151 @@
+from __future__ import annotations
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set
+from . import storage
+from .async_storage import STORAGE
+from .metrics import SESSION_SAVE_BYTES, SESSION_SAVE_ERRORS, SESSION_SAVE_SECONDS
+
+
+class WriteBehindPersister:
+    """Write-behind session persistence.
+
+    Mutations call `mark_dirty(code, parts)` with the session parts they touched
+    (all of them by default); a single background task snapshots just those parts
+    on the event loop (cheap `model_dump`) and writes them through the storage pool,
+    at most once per `interval_ms` (immediately for lifecycle events). `snapshot`
+    returns {"journal_seq": n, "parts": {name: data}}. `stop()` performs a final
+    flush so nothing dirty is lost on shutdown.
+    """
+
+    def __init__(
+        self,
+        snapshot: Callable[[str, Set[str]], Optional[Dict]],
+        interval_ms: int = 1000,
+        after_write: Optional[Callable[[str, Dict], Awaitable[None]]] = None,
+    ) -> None:
+        self._snapshot = snapshot
+        self._after_write = after_write  # e.g. compact the event journal against the new snapshot
+        self.interval = max(0, interval_ms) / 1000.0
+        self._dirty: Dict[str, float] = {}  # code -> monotonic time it first became dirty
+        self._dirty_parts: Dict[str, Set[str]] = {}  # code -> parts to rewrite
+        self._wake = asyncio.Event()
+        self._urgent = asyncio.Event()
+        self._lock = asyncio.Lock()  # one flush at a time keeps per-session writes ordered
+        self._task: Optional[asyncio.Task] = None
+        self._last_flush_at = 0.0
+        # stats
+        self._flushes = 0
+        self._writes = 0
+        self._errors = 0
+        self._last_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+        self._last_error: Optional[str] = None
+
+    def mark_dirty(self, code: str, urgent: bool = False, parts: Iterable[str] = storage.SESSION_PARTS) -> None:
+        self._dirty.setdefault(code, time.monotonic())
+        self._dirty_parts.setdefault(code, set()).update(parts)
+        self._wake.set()
+        if urgent:
+            self._urgent.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        await self.flush()
+
+    async def flush(self, codes: Optional[Iterable[str]] = None) -> None:
+        async with self._lock:
+            targets = list(self._dirty.keys()) if codes is None else [c for c in codes if c in self._dirty]
+            if not targets:
+                return
+            started = time.perf_counter()
+            for code in targets:
+                since = self._dirty.pop(code, None)
+                parts = self._dirty_parts.pop(code, None) or set(storage.SESSION_PARTS)
+                data = self._snapshot(code, parts)
+                if data is None:
+                    # session was removed since it was marked dirty
+                    continue
+                try:
+                    t0 = time.perf_counter()
+                    size = await STORAGE.run("save_session", storage.save_session_parts, code, data["parts"], data["journal_seq"], key=code)
+                    SESSION_SAVE_SECONDS.observe(time.perf_counter() - t0)
+                    if size:
+                        SESSION_SAVE_BYTES.observe(size)
+                    self._writes += 1
+                    if self._after_write is not None:
+                        await self._after_write(code, data)
+                except Exception as e:
+                    self._errors += 1
+                    SESSION_SAVE_ERRORS.inc()
+                    self._last_error = f"{code}: {e}"
+                    # keep it dirty (with its original age) so the next flush retries
+                    if since is not None:
+                        self._dirty.setdefault(code, since)
+                    self._dirty_parts.setdefault(code, set()).update(parts)
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            self._flushes += 1
+            self._last_flush_ms = elapsed_ms
+            self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+            self._total_flush_ms += elapsed_ms
+            self._last_flush_at = time.monotonic()
+
+    async def delete(self, code: str) -> None:
+        """Drop pending writes for a session and remove it from disk (after any in-flight flush)."""
+        async with self._lock:
+            self._dirty.pop(code, None)
+            self._dirty_parts.pop(code, None)
+            await STORAGE.run("delete_session", storage.delete_session, code, key=code)
+
+    def is_dirty(self, code: str) -> bool:
+        return code in self._dirty
+
+    @property
+    def pending(self) -> int:
+        return len(self._dirty)
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        oldest = min(self._dirty.values()) if self._dirty else None
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "intervalMs": int(self.interval * 1000),
+            "flushes": self._flushes,
+            "writes": self._writes,
+            "errors": self._errors,
+            "lastError": self._last_error,
+            "lastFlushMs": round(self._last_flush_ms, 3),
+            "maxFlushMs": round(self._max_flush_ms, 3),
+            "avgFlushMs": round(self._total_flush_ms / self._flushes, 3) if self._flushes else 0.0,
+            "pendingDirty": len(self._dirty),
+            "oldestDirtyAgeMs": round((now - oldest) * 1000.0, 1) if oldest is not None else 0.0,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            # debounce: at most one flush per interval unless a lifecycle event asks for one now
+            delay = self.interval - (time.monotonic() - self._last_flush_at)
+            if delay > 0 and not self._urgent.is_set():
+                try:
+                    await asyncio.wait_for(self._urgent.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+            self._wake.clear()
+            self._urgent.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                self._errors += 1
+                self._last_error = str(e)
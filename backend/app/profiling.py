@@ -0,0 +1,218 @@
+"""Runtime profiling for the event loop.
+
+- slow calls: socket handlers, emits and HTTP routes slower than a threshold go
+  into a ring buffer, with the loop stacks captured while they ran;
+- loop lag: a ticker measures how late the loop wakes up, and a watchdog thread
+  snapshots the loop thread's stack when it stops ticking (a stall);
+- sampling profile: on demand, sample the loop thread's stack for a few seconds
+  and return collapsed stacks (`frame;frame;frame count`) for flame graphs.
+"""
+from __future__ import annotations
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter as _Tally, deque
+from typing import Dict, List, Optional
+from .metrics import Counter, Histogram
+
+LOOP_LAG_SECONDS = Histogram("quizzer_event_loop_lag_seconds", "How late the event loop woke up for a timer",
+                             buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+SLOW_CALLS = Counter("quizzer_slow_calls_total", "Calls slower than SLOW_CALL_MS", ["kind"])
+LOOP_STALLS = Counter("quizzer_event_loop_stalls_total", "Times the event loop was blocked longer than SLOW_CALL_MS")
+
+_MAX_DEPTH = 64
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _stack(frame) -> List[str]:
+    """Frame names, outermost first."""
+    out: List[str] = []
+    while frame is not None and len(out) < _MAX_DEPTH:
+        out.append(_frame_name(frame))
+        frame = frame.f_back
+    out.reverse()
+    return out
+
+
+class _Call:
+    __slots__ = ("profiler", "kind", "name", "started")
+
+    def __init__(self, profiler: "Profiler", kind: str, name: str) -> None:
+        self.profiler = profiler
+        self.kind = kind
+        self.name = name
+
+    def __enter__(self) -> "_Call":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.profiler.record(self.kind, self.name, self.started)
+
+
+class Profiler:
+    """Slow-call log, loop lag/stall detection and an on-demand sampler for one event loop."""
+
+    def __init__(self, slow_ms: float = 100.0, keep: int = 100, tick_ms: float = 100.0) -> None:
+        self.slow = max(0.001, slow_ms / 1000.0)
+        self.tick = max(0.01, tick_ms / 1000.0)
+        self.slow_calls: deque = deque(maxlen=keep)
+        self.stalls: deque = deque(maxlen=keep)
+        self._loop_thread: Optional[int] = None
+        self._beat = time.perf_counter()
+        self._open_stall: Optional[Dict] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+        self._sampling = threading.Lock()
+        # lag stats
+        self._lag_last = 0.0
+        self._lag_max = 0.0
+        self._lag_sum = 0.0
+        self._ticks = 0
+
+    def start(self) -> None:
+        """Start the lag ticker and stall watchdog (call from the loop's thread)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._run())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+    def call(self, kind: str, name: str) -> _Call:
+        """Context manager timing one call; slow ones land in the ring buffer."""
+        return _Call(self, kind, name)
+
+    def record(self, kind: str, name: str, started: float) -> None:
+        ended = time.perf_counter()
+        elapsed = ended - started
+        if elapsed < self.slow:
+            return
+        SLOW_CALLS.labels(kind).inc()
+        # stacks of loop stalls seen while this call was running show what blocked the loop
+        stalls = [s for s in list(self.stalls) if started <= s["_t"] <= ended]
+        self.slow_calls.append({
+            "kind": kind,
+            "name": name,
+            "ms": round(elapsed * 1000.0, 3),
+            "at": time.time(),
+            "blocked": bool(stalls),
+            "stacks": [s["stack"] for s in stalls],
+        })
+
+    def lag_stats(self) -> Dict:
+        return {
+            "tickMs": round(self.tick * 1000.0, 3),
+            "lastLagMs": round(self._lag_last * 1000.0, 3),
+            "maxLagMs": round(self._lag_max * 1000.0, 3),
+            "avgLagMs": round(self._lag_sum / self._ticks * 1000.0, 3) if self._ticks else 0.0,
+            "stalls": len(self.stalls),
+        }
+
+    def report(self) -> Dict:
+        return {
+            "slowCallMs": round(self.slow * 1000.0, 3),
+            "loop": self.lag_stats(),
+            "slowCalls": list(reversed(self.slow_calls)),
+            "stalls": [{k: v for k, v in s.items() if k != "_t"} for s in reversed(self.stalls)],
+        }
+
+    def clear(self) -> None:
+        self.slow_calls.clear()
+        self.stalls.clear()
+        self._lag_max = 0.0
+
+    def sample(self, seconds: float, interval_ms: float = 5.0) -> Dict[str, int]:
+        """Sample the loop thread's stack for `seconds`; blocking, so run it in a worker thread.
+
+        Returns collapsed stacks -> sample count. Raises RuntimeError if a profile is already running.
+        """
+        if not self._sampling.acquire(blocking=False):
+            raise RuntimeError("a profile is already running")
+        try:
+            target = self._loop_thread or threading.main_thread().ident
+            interval = max(0.001, interval_ms / 1000.0)
+            tally: _Tally = _Tally()
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                frame = sys._current_frames().get(target)
+                if frame is not None:
+                    tally[";".join(_stack(frame))] += 1
+                del frame
+                time.sleep(interval)
+            return dict(tally)
+        finally:
+            self._sampling.release()
+
+    @staticmethod
+    def collapsed(samples: Dict[str, int]) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in sorted(samples.items(), key=lambda kv: -kv[1]))
+
+    async def _run(self) -> None:
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(self.tick)
+            now = time.perf_counter()
+            lag = max(0.0, now - before - self.tick)
+            self._beat = now
+            self._lag_last = lag
+            self._lag_max = max(self._lag_max, lag)
+            self._lag_sum += lag
+            self._ticks += 1
+            LOOP_LAG_SECONDS.observe(lag)
+            stall = self._open_stall
+            if stall is not None:
+                stall["blockedMs"] = round(lag * 1000.0, 3)
+                self._open_stall = None
+
+    def _watch(self) -> None:
+        """Watchdog thread: snapshot the loop thread's stack once per stall."""
+        while not self._stop.wait(self.slow / 2):
+            silent = time.perf_counter() - self._beat
+            if silent < self.tick + self.slow or self._open_stall is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            stall = {"_t": time.perf_counter(), "at": time.time(), "blockedMs": round(silent * 1000.0, 3), "stack": _stack(frame)}
+            del frame
+            self._open_stall = stall
+            self.stalls.append(stall)
+            LOOP_STALLS.inc()
+
+
+class ProfilingMiddleware:
+    """ASGI middleware timing every HTTP request by route template."""
+
+    def __init__(self, app, profiler: Profiler) -> None:
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = scope.get("route")
+            self.profiler.record("http", f"{scope['method']} {getattr(route, 'path', scope['path'])}", started)
@@ -0,0 +1,279 @@
+from __future__ import annotations
+import math
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .leaderboard import RankKey
+
+try:  # optional: vectorized reveal scoring and ranking
+    import numpy as _np
+except ImportError:  # pragma: no cover - depends on environment
+    _np = None
+
+LIFELINES = ("5050", "hint")
+_ALL_LIFELINES = (1 << len(LIFELINES)) - 1
+_LIFELINE_BITS = {name: 1 << i for i, name in enumerate(LIFELINES)}
+# Below this many rows the NumPy conversions cost more than the Python loop they replace
+_VECTOR_MIN = 256
+
+
+class PlayerRow:
+    """One roster slot, read and written through the attribute names of the `Player` model."""
+
+    __slots__ = ("_roster", "_slot")
+
+    def __init__(self, roster: "Roster", slot: int) -> None:
+        self._roster = roster
+        self._slot = slot
+
+    @property
+    def id(self) -> str:
+        return self._roster.ids[self._slot]
+
+    @property
+    def name(self) -> str:
+        return self._roster.names[self._slot]
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._roster.names[self._slot] = value or ""
+
+    @property
+    def email(self) -> Optional[str]:
+        return self._roster.emails[self._slot]
+
+    @email.setter
+    def email(self, value: Optional[str]) -> None:
+        self._roster.emails[self._slot] = value
+
+    @property
+    def participant_code(self) -> Optional[str]:
+        return self._roster.codes[self._slot]
+
+    @participant_code.setter
+    def participant_code(self, value: Optional[str]) -> None:
+        self._roster.codes[self._slot] = value
+
+    @property
+    def score(self) -> int:
+        return self._roster.scores[self._slot]
+
+    @score.setter
+    def score(self, value: int) -> None:
+        self._roster.scores[self._slot] = int(value or 0)
+
+    @property
+    def correct_firsts(self) -> int:
+        return self._roster.firsts[self._slot]
+
+    @correct_firsts.setter
+    def correct_firsts(self, value: int) -> None:
+        self._roster.firsts[self._slot] = int(value or 0)
+
+    @property
+    def cumulative_answer_time(self) -> float:
+        return self._roster.cum_times[self._slot]
+
+    @cumulative_answer_time.setter
+    def cumulative_answer_time(self, value: float) -> None:
+        self._roster.cum_times[self._slot] = float(value or 0.0)
+
+    @property
+    def lifelines(self) -> Dict[str, bool]:
+        """A fresh {lifeline: available} dict; use `use_lifeline` (or assign a whole dict) to change it."""
+        bits = self._roster.lifelines[self._slot]
+        return {name: bool(bits & bit) for name, bit in _LIFELINE_BITS.items()}
+
+    @lifelines.setter
+    def lifelines(self, value: Dict[str, bool]) -> None:
+        self._roster.lifelines[self._slot] = _pack_lifelines(value)
+
+    def use_lifeline(self, name: str) -> None:
+        self._roster.lifelines[self._slot] &= ~_LIFELINE_BITS.get(name, 0) & 0xFF
+
+
+def _pack_lifelines(value: Optional[Dict[str, bool]]) -> int:
+    if value is None:
+        return _ALL_LIFELINES
+    return sum(bit for name, bit in _LIFELINE_BITS.items() if value.get(name, False))
+
+
+class Roster:
+    """Columnar player store: each player is a slot, each field a compact array.
+
+    Scores, first-correct counts, cumulative answer time and lifeline bits live in
+    `array`s indexed by slot (strings in plain lists), so a 50k-player roster is a
+    handful of buffers instead of 50k models with a dict each. It behaves like the
+    old `Dict[str, Player]` (get / in / iteration / values / items) and hands out
+    `PlayerRow` views; `dump()` / `load()` keep the persisted per-player layout.
+    Players are never removed individually (a quiz is reset or deleted as a whole).
+    """
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.emails: List[Optional[str]] = []
+        self.codes: List[Optional[str]] = []
+        self.scores = array("q")
+        self.firsts = array("q")
+        self.cum_times = array("d")
+        self.lifelines = array("B")
+        self._slots: Dict[str, int] = {}
+
+    @classmethod
+    def load(cls, players) -> "Roster":
+        """Build from the persisted {id: {field: value}} mapping (or Player-like objects)."""
+        roster = cls()
+        for value in (players or {}).values():
+            roster.add(value)
+        return roster
+
+    def dump(self) -> Dict[str, Dict]:
+        out: Dict[str, Dict] = {}
+        for slot, pid in enumerate(self.ids):
+            out[pid] = {
+                "id": pid,
+                "name": self.names[slot],
+                "email": self.emails[slot],
+                "participant_code": self.codes[slot],
+                "score": self.scores[slot],
+                "lifelines": PlayerRow(self, slot).lifelines,
+                "correct_firsts": self.firsts[slot],
+                "cumulative_answer_time": self.cum_times[slot],
+            }
+        return out
+
+    def add(self, player) -> PlayerRow:
+        """Append a player (a `Player`, a row or a persisted dict); an existing id is overwritten in place."""
+        get = player.get if isinstance(player, dict) else lambda key, default=None: getattr(player, key, default)
+        pid = get("id")
+        slot = self._slots.get(pid)
+        if slot is None:
+            slot = self._slots[pid] = len(self.ids)
+            self.ids.append(pid)
+            self.names.append("")
+            self.emails.append(None)
+            self.codes.append(None)
+            self.scores.append(0)
+            self.firsts.append(0)
+            self.cum_times.append(0.0)
+            self.lifelines.append(_ALL_LIFELINES)
+        self.names[slot] = get("name") or ""
+        self.emails[slot] = get("email")
+        self.codes[slot] = get("participant_code")
+        self.scores[slot] = int(get("score") or 0)
+        self.firsts[slot] = int(get("correct_firsts") or 0)
+        self.cum_times[slot] = float(get("cumulative_answer_time") or 0.0)
+        self.lifelines[slot] = _pack_lifelines(get("lifelines"))
+        return PlayerRow(self, slot)
+
+    def slot(self, player_id: str) -> Optional[int]:
+        return self._slots.get(player_id)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, player_id) -> bool:
+        return player_id in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.ids))
+
+    def __getitem__(self, player_id: str) -> PlayerRow:
+        return PlayerRow(self, self._slots[player_id])
+
+    def get(self, player_id: Optional[str], default=None) -> Optional[PlayerRow]:
+        slot = self._slots.get(player_id)
+        return default if slot is None else PlayerRow(self, slot)
+
+    def keys(self) -> List[str]:
+        return list(self.ids)
+
+    def values(self) -> Iterator[PlayerRow]:
+        return (PlayerRow(self, slot) for slot in range(len(self.ids)))
+
+    def items(self) -> Iterator[Tuple[str, PlayerRow]]:
+        return ((pid, PlayerRow(self, slot)) for slot, pid in enumerate(self.ids))
+
+    # --- batched column operations ---
+    def reset_scores(self) -> None:
+        n = len(self.ids)
+        self.scores = array("q", bytes(8 * n))
+        self.firsts = array("q", bytes(8 * n))
+        self.cum_times = array("d", bytes(8 * n))
+
+    def reset_lifelines(self) -> None:
+        self.lifelines = array("B", bytes((_ALL_LIFELINES,)) * len(self.ids))
+
+    def award(self, slots: Sequence[int], points: Sequence[int], elapsed: Sequence[float], first: Optional[int]) -> None:
+        """Add points and answer time to each slot (one entry per correct responder); +1 first-correct to `first`."""
+        if _np is not None and len(slots) >= _VECTOR_MIN:
+            idx = _np.asarray(slots, dtype=_np.int64)
+            scores = _np.frombuffer(self.scores, dtype=_np.int64)
+            times = _np.frombuffer(self.cum_times, dtype=_np.float64)
+            # slots are unique (one answer per player), so fancy-index += is exact
+            scores[idx] += _np.asarray(points, dtype=_np.int64)
+            times[idx] += _np.asarray(elapsed, dtype=_np.float64)
+            del scores, times  # release the buffer exports so the arrays can grow again
+        else:
+            for slot, pts, secs in zip(slots, points, elapsed):
+                self.scores[slot] += pts
+                self.cum_times[slot] += secs
+        if first is not None:
+            self.firsts[first] += 1
+
+    def rank_keys(self, slots: Optional[Iterable[int]] = None) -> List[RankKey]:
+        """Leaderboard sort keys (see leaderboard.rank_key) for the given slots, or every player (already in score order when vectorized)."""
+        if slots is not None:
+            return [(-self.scores[s], -self.firsts[s], self.cum_times[s], self.names[s] or "", self.ids[s]) for s in slots]
+        n = len(self.ids)
+        if _np is not None and n >= _VECTOR_MIN:
+            # numeric tie-breaks in one lexsort; the caller's sort then only has to settle name/id ties
+            order = _np.lexsort((
+                _np.frombuffer(self.cum_times, dtype=_np.float64),
+                -_np.frombuffer(self.firsts, dtype=_np.int64),
+                -_np.frombuffer(self.scores, dtype=_np.int64),
+            )).tolist()
+        else:
+            order = range(n)
+        return self.rank_keys(order)
+
+
+def reveal_scores(submitted: Sequence[float], correct: Sequence[bool], started: Optional[float], paused: float,
+                  duration: float, max_points: int, fallback: float) -> Tuple[List[float], List[int], List[int]]:
+    """Score one question's answers in a batch.
+
+    `submitted` holds submit times (inf when unknown, which ranks last and is timed
+    from `fallback`). Returns per answer: elapsed seconds (clamped to the duration),
+    points awarded for the remaining-time share of `max_points`, and the 1-based
+    speed rank among correct answers (0 for wrong ones).
+    """
+    n = len(submitted)
+    if _np is not None and n >= _VECTOR_MIN:
+        ts = _np.asarray(submitted, dtype=_np.float64)
+        ok = _np.asarray(correct, dtype=bool)
+        if started:
+            elapsed = _np.maximum(0.0, _np.where(_np.isinf(ts), fallback, ts) - started - paused)
+        else:
+            elapsed = _np.zeros(n)
+        if duration > 0:
+            elapsed = _np.minimum(elapsed, duration)
+            points = _np.where(ok, _np.rint(max_points * (_np.maximum(0.0, duration - elapsed) / duration)), 0).astype(_np.int64)
+        else:
+            points = _np.zeros(n, dtype=_np.int64)
+        ranks = _np.zeros(n, dtype=_np.int64)
+        winners = _np.flatnonzero(ok)
+        ranks[winners[_np.argsort(ts[winners], kind="stable")]] = _np.arange(1, len(winners) + 1)
+        return elapsed.tolist(), points.tolist(), ranks.tolist()
+    elapsed_out: List[float] = []
+    points_out: List[int] = []
+    for ts, ok in zip(submitted, correct):
+        elapsed = max(0.0, (fallback if math.isinf(ts) else ts) - started - paused) if started else 0.0
+        if duration > 0:
+            elapsed = min(elapsed, duration)
+        elapsed_out.append(elapsed)
+        points_out.append(int(round(max_points * (max(0.0, duration - elapsed) / duration))) if ok and duration > 0 else 0)
+    ranks_out = [0] * n
+    winners = sorted((i for i in range(n) if correct[i]), key=lambda i: submitted[i])
+    for rank, i in enumerate(winners, start=1):
+        ranks_out[i] = rank
+    return elapsed_out, points_out, ranks_out
@@ -0,0 +1,191 @@
+from __future__ import annotations
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from .metrics import Counter
+
+SESSION_LOADS = Counter("quizzer_session_loads_total", "Sessions loaded from disk on first access")
+SESSION_EVICTIONS = Counter("quizzer_session_evictions_total", "Idle sessions flushed and dropped from memory")
+
+V = TypeVar("V")
+
+
+class SessionCache(Generic[V]):
+    """Sessions resident in memory, loaded on first access and evicted least-recently-used.
+
+    `get(code)` returns the resident session or builds it with `load(code)` (None if
+    the code has nothing on disk). Once more than `capacity` sessions are resident,
+    a background pass walks them oldest-first and, for each one `is_idle` allows that
+    nobody touched for `idle_seconds`, awaits `flush(code)` and then, if it is still
+    untouched and idle, removes it and calls `drop(code, session)`. `pinned` codes and
+    busy sessions stay, so the bound can be exceeded while they are in use. After
+    `start()` the pass also runs every `sweep_seconds`, so sessions that go idle
+    without anything new being loaded are still unloaded. `code in cache` (like
+    `exists`) asks `stored(code)` instead of loading.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[str], Optional[V]],
+        is_idle: Callable[[str, V], bool],
+        flush: Callable[[str], Awaitable[None]],
+        drop: Callable[[str, V], None],
+        capacity: int = 32,
+        idle_seconds: float = 300.0,
+        pinned: Iterable[str] = (),
+        stored: Callable[[str], bool] = lambda code: False,
+    ) -> None:
+        self._load = load
+        self._stored = stored
+        self._is_idle = is_idle
+        self._flush = flush
+        self._drop = drop
+        self.capacity = max(1, capacity)
+        self.idle_seconds = max(0.0, idle_seconds)
+        self.pinned = set(pinned)
+        self.sweep_seconds = min(60.0, max(1.0, self.idle_seconds / 2))
+        self._resident: "OrderedDict[str, V]" = OrderedDict()
+        self._touched: Dict[str, float] = {}
+        self._evicting: Optional[asyncio.Task] = None
+        self._sweeper: Optional[asyncio.Task] = None
+        # stats
+        self._loads = 0
+        self._evictions = 0
+
+    def get(self, code: str, default: Optional[V] = None) -> Optional[V]:
+        session = self._resident.get(code)
+        if session is None:
+            session = self._load(code)
+            if session is None:
+                return default
+            self._loads += 1
+            SESSION_LOADS.inc()
+            self._insert(code, session)
+        else:
+            self._resident.move_to_end(code)
+        self._touched[code] = time.monotonic()
+        return session
+
+    def peek(self, code: str) -> Optional[V]:
+        """The resident session, without loading it or counting as a use."""
+        return self._resident.get(code)
+
+    def __getitem__(self, code: str) -> V:
+        session = self.get(code)
+        if session is None:
+            raise KeyError(code)
+        return session
+
+    def __setitem__(self, code: str, session: V) -> None:
+        self._insert(code, session)
+        self._touched[code] = time.monotonic()
+
+    def exists(self, code: str) -> bool:
+        """Whether the code is resident or has something on disk, without loading it."""
+        return code in self._resident or self._stored(code)
+
+    def __contains__(self, code: str) -> bool:
+        return self.exists(code)
+
+    def __len__(self) -> int:
+        return len(self._resident)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._resident))
+
+    def keys(self) -> List[str]:
+        return list(self._resident)
+
+    def values(self) -> List[V]:
+        return list(self._resident.values())
+
+    def items(self) -> List[Tuple[str, V]]:
+        return list(self._resident.items())
+
+    def pop(self, code: str, default: Optional[V] = None) -> Optional[V]:
+        session = self.get(code)
+        if session is None:
+            return default
+        self._resident.pop(code, None)
+        self._touched.pop(code, None)
+        return session
+
+    def clear(self) -> None:
+        self._resident.clear()
+        self._touched.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "resident": len(self._resident),
+            "capacity": self.capacity,
+            "idleSeconds": self.idle_seconds,
+            "loads": self._loads,
+            "evictions": self._evictions,
+        }
+
+    def start(self) -> None:
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep())
+
+    async def stop(self) -> None:
+        for task in (self._sweeper, self._evicting):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._sweeper = self._evicting = None
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_seconds)
+            if len(self._resident) > self.capacity:
+                self._schedule_eviction()
+
+    def _insert(self, code: str, session: V) -> None:
+        self._resident[code] = session
+        self._resident.move_to_end(code)
+        if len(self._resident) > self.capacity:
+            self._schedule_eviction()
+
+    def _schedule_eviction(self) -> None:
+        if self._evicting is not None and not self._evicting.done():
+            return
+        try:
+            self._evicting = asyncio.get_running_loop().create_task(self.evict_idle())
+        except RuntimeError:
+            # no loop yet (startup); the next insert on the loop schedules it
+            pass
+
+    def _evictable(self, code: str, session: V, now: float) -> bool:
+        return (code not in self.pinned
+                and now - self._touched.get(code, 0.0) >= self.idle_seconds
+                and self._is_idle(code, session))
+
+    async def evict_idle(self) -> int:
+        """Flush and drop idle sessions, least recently used first, until within capacity."""
+        evicted = 0
+        for code in list(self._resident):
+            if len(self._resident) <= self.capacity:
+                break
+            session = self._resident.get(code)
+            if session is None or not self._evictable(code, session, time.monotonic()):
+                continue
+            touched = self._touched.get(code)
+            try:
+                await self._flush(code)
+            except Exception:
+                continue
+            # anything that used the session while it was being flushed keeps it resident
+            if (self._resident.get(code) is not session or self._touched.get(code) != touched
+                    or not self._evictable(code, session, time.monotonic())):
+                continue
+            del self._resident[code]
+            self._touched.pop(code, None)
+            self._drop(code, session)
+            evicted += 1
+            self._evictions += 1
+            SESSION_EVICTIONS.inc()
+        return evicted
@@ -1,6 +1,9 @@
 from __future__ import annotations
+import hashlib
 import json
 import os
+import threading
+import zlib
 from typing import Dict, List, Optional, Tuple
 
 
@@ -14,50 +17,215 @@ def get_data_dir() -> str:
     return base
 
 
-def _session_path(code: str) -> str:
-    code = str(code).upper()
-    return os.path.join(get_data_dir(), "sessions", f"{code}.json")
+# --- Document codecs ---
+# Documents are written either as plain JSON (".json", the legacy/readable format) or as a
+# binary container (".qz"): MAGIC + codec byte + compression byte + payload. Loads sniff the
+# magic, so either extension can hold either layout and existing .json files keep loading.
+_MAGIC = b"QZB1"
+_CODEC_IDS = {"json": 1, "msgpack": 2}
+_COMPRESSION_IDS = {"none": 0, "zlib": 1, "lz4": 2}
+_DOC_EXTS = (".qz", ".json")
+
+try:  # optional fast binary codec
+    import msgpack as _msgpack
+except ImportError:  # pragma: no cover - depends on environment
+    _msgpack = None
+
+try:  # optional fast compressor
+    import lz4.frame as _lz4
+except ImportError:  # pragma: no cover - depends on environment
+    _lz4 = None
+
+
+def storage_format() -> Tuple[str, str]:
+    """(codec, compression) from QUIZ_STORAGE_CODEC / QUIZ_STORAGE_COMPRESSION; defaults to compact json, no compression."""
+    codec = (os.getenv("QUIZ_STORAGE_CODEC") or "json").strip().lower()
+    compression = (os.getenv("QUIZ_STORAGE_COMPRESSION") or "none").strip().lower()
+    if codec not in _CODEC_IDS:
+        raise ValueError(f"Unknown QUIZ_STORAGE_CODEC: {codec}")
+    if compression not in _COMPRESSION_IDS:
+        raise ValueError(f"Unknown QUIZ_STORAGE_COMPRESSION: {compression}")
+    return codec, compression
+
+
+def encode_doc(obj, codec: str = "json", compression: str = "none") -> bytes:
+    if codec == "msgpack":
+        if _msgpack is None:
+            raise RuntimeError("msgpack codec selected but the msgpack package is not installed")
+        payload = _msgpack.packb(obj, use_bin_type=True)
+    else:
+        payload = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if codec == "json" and compression == "none":
+        return payload  # plain JSON, readable and compatible with older builds
+    if compression == "zlib":
+        payload = zlib.compress(payload, 6)
+    elif compression == "lz4":
+        if _lz4 is None:
+            raise RuntimeError("lz4 compression selected but the lz4 package is not installed")
+        payload = _lz4.compress(payload)
+    return _MAGIC + bytes((_CODEC_IDS[codec], _COMPRESSION_IDS[compression])) + payload
+
+
+def decode_doc(raw: bytes):
+    if not raw.startswith(_MAGIC):
+        return json.loads(raw.decode("utf-8"))
+    codec_id, compression_id = raw[4], raw[5]
+    payload = raw[6:]
+    if compression_id == _COMPRESSION_IDS["zlib"]:
+        payload = zlib.decompress(payload)
+    elif compression_id == _COMPRESSION_IDS["lz4"]:
+        if _lz4 is None:
+            raise RuntimeError("document is lz4-compressed but the lz4 package is not installed")
+        payload = _lz4.decompress(payload)
+    if codec_id == _CODEC_IDS["msgpack"]:
+        if _msgpack is None:
+            raise RuntimeError("document is msgpack-encoded but the msgpack package is not installed")
+        return _msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    return json.loads(payload.decode("utf-8"))
+
+
+def _doc_file(base: str) -> Optional[str]:
+    """Existing file for a document stem (newest wins if both layouts are present)."""
+    found = [base + ext for ext in _DOC_EXTS if os.path.exists(base + ext)]
+    if not found:
+        return None
+    return max(found, key=os.path.getmtime)
 
 
-def save_session_dict(code: str, data: Dict) -> None:
-    path = _session_path(code)
+def _write_doc(base: str, obj, fsync: bool = False) -> str:
+    codec, compression = storage_format()
+    ext = ".json" if codec == "json" and compression == "none" else ".qz"
+    path = base + ext
     tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(tmp, "wb") as f:
+        f.write(encode_doc(obj, codec, compression))
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
     os.replace(tmp, path)
+    # migration: drop the other layout so loads never see a stale copy
+    for other in _DOC_EXTS:
+        if other != ext and os.path.exists(base + other):
+            os.remove(base + other)
+    return path
 
 
-def load_session_dict(code: str) -> Dict | None:
-    path = _session_path(code)
-    if not os.path.exists(path):
+def _read_doc(base: str):
+    path = _doc_file(base)
+    if path is None:
         return None
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    with open(path, "rb") as f:
+        return decode_doc(f.read())
 
 
-def load_all_session_dicts() -> Dict[str, Dict]:
-    base = get_data_dir()
-    sessions_dir = os.path.join(base, "sessions")
-    if not os.path.isdir(sessions_dir):
-        return {}
+def _doc_stem(name: str) -> Optional[str]:
+    for ext in _DOC_EXTS:
+        if name.endswith(ext):
+            return name[: -len(ext)]
+    return None
+
+
+def _session_base(code: str) -> str:
+    code = str(code).upper()
+    return os.path.join(get_data_dir(), "sessions", code)
+
+
+# --- Session snapshots ---
+# A session is stored as independently written parts under sessions/<CODE>/, so a mutation
+# only rewrites what it touched. Parts are written in this order (roster before round: a reveal
+# touches both, and a crash in between must never leave round state ahead of the scores).
+SESSION_PARTS = ("config", "allow", "roster", "round")
+
+
+def _session_dir(code: str) -> str:
+    return os.path.join(get_data_dir(), "sessions", str(code).upper())
+
+
+def save_session_parts(code: str, parts: Dict[str, Dict], journal_seq: int) -> int:
+    """Write the given parts of a session, each stamped with the journal_seq it covers; returns bytes written."""
+    sdir = _session_dir(code)
+    os.makedirs(sdir, exist_ok=True)
+    written = 0
+    for name in sorted(parts, key=lambda n: SESSION_PARTS.index(n) if n in SESSION_PARTS else len(SESSION_PARTS)):
+        doc = {"part": name, "journal_seq": int(journal_seq), "data": parts[name]}
+        # fsync: durable before the event journal is compacted against it
+        written += os.path.getsize(_write_doc(os.path.join(sdir, name), doc, fsync=True))
+    # migration: once every part exists the old single-file snapshot is superseded
+    legacy = _session_base(code)
+    if all(_doc_file(os.path.join(sdir, n)) for n in SESSION_PARTS):
+        for ext in _DOC_EXTS:
+            if os.path.exists(legacy + ext):
+                os.remove(legacy + ext)
+    return written
+
+
+def load_session_parts(code: str) -> Dict[str, Dict]:
+    """{part: {"journal_seq", "data"}} for a session; a single-file snapshot from older builds shows up as "legacy"."""
     out: Dict[str, Dict] = {}
-    for name in os.listdir(sessions_dir):
-        if not name.endswith(".json"):
-            continue
-        code = name[:-5]
-        try:
-            with open(os.path.join(sessions_dir, name), "r", encoding="utf-8") as f:
-                out[code] = json.load(f)
-        except Exception:
-            # skip corrupt file
-            continue
+    legacy = _read_doc(_session_base(code))
+    if isinstance(legacy, dict):
+        out["legacy"] = {"journal_seq": int(legacy.get("journal_seq") or 0), "data": legacy}
+    if os.path.isdir(_session_dir(code)):
+        for name in SESSION_PARTS:
+            part = load_session_part(code, name)
+            if part is not None:
+                out[name] = part
     return out
 
 
+def session_exists(code: str) -> bool:
+    return _doc_file(_session_base(code)) is not None or os.path.isdir(_session_dir(code))
+
+
+def load_session_part(code: str, name: str) -> Optional[Dict]:
+    """One stored part ({"journal_seq", "data"}), or None if the session has no such part file."""
+    doc = _read_doc(os.path.join(_session_dir(code), name))
+    if not isinstance(doc, dict):
+        return None
+    return {"journal_seq": int(doc.get("journal_seq") or 0), "data": doc.get("data") or {}}
+
+
+def list_session_codes() -> List[str]:
+    """Codes with a stored snapshot (partitioned or single-file), without reading them."""
+    sessions_dir = os.path.join(get_data_dir(), "sessions")
+    codes = set()
+    for entry in os.scandir(sessions_dir):
+        code = entry.name if entry.is_dir() else _doc_stem(entry.name)
+        if code is not None:
+            codes.add(code)
+    return sorted(codes)
+
+
+def save_session_dict(code: str, data: Dict) -> int:
+    """Write a whole session as one document (the pre-partition layout; still loaded as "legacy")."""
+    return os.path.getsize(_write_doc(_session_base(code), data, fsync=True))
+
+
+def load_session_dict(code: str) -> Dict | None:
+    return _read_doc(_session_base(code))
+
+
 def delete_session(code: str) -> None:
-    path = _session_path(code)
-    if os.path.exists(path):
-        os.remove(path)
+    base = _session_base(code)
+    for ext in _DOC_EXTS:
+        if os.path.exists(base + ext):
+            os.remove(base + ext)
+    sdir = _session_dir(code)
+    if os.path.isdir(sdir):
+        for name in os.listdir(sdir):
+            os.remove(os.path.join(sdir, name))
+        os.rmdir(sdir)
+
+
+# --- Session event journals (append-only, replayed over the last snapshot) ---
+def journal_path(code: str) -> str:
+    code = str(code).upper()
+    return os.path.join(get_data_dir(), "sessions", f"{code}.journal")
+
+
+def list_journal_codes() -> List[str]:
+    sessions_dir = os.path.join(get_data_dir(), "sessions")
+    return [name[:-8] for name in os.listdir(sessions_dir) if name.endswith(".journal")]
 
 
 # --- Question set (bank) helpers ---
@@ -67,56 +235,130 @@ def _sanitized_name(name: str) -> str:
     return safe or 'untitled'
 
 
-def _qset_path(name: str) -> str:
+def _qset_base(name: str) -> str:
     base = get_data_dir()
-    return os.path.join(base, "question_sets", f"{_sanitized_name(name)}.json")
+    return os.path.join(base, "question_sets", _sanitized_name(name))
 
 
 def save_question_set(name: str, questions: List[Dict]) -> str:
-    path = _qset_path(name)
-    tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(questions, f, indent=2, ensure_ascii=False)
-    os.replace(tmp, path)
+    path = _write_doc(_qset_base(name), questions)
+    # refresh the catalog entry from what we just wrote (no re-parse)
+    with open(path, "rb") as f:
+        raw = f.read()
+    st = os.stat(path)
+    catalog = _qset_catalog()
+    for ext in _DOC_EXTS:
+        catalog.pop(os.path.basename(_qset_base(name)) + ext, None)
+    catalog[os.path.basename(path)] = _qset_entry(os.path.basename(path), st, raw, questions)
+    _save_qset_catalog(catalog)
     return os.path.basename(path)
 
 
 def load_question_set(name: str) -> Optional[List[Dict]]:
-    path = _qset_path(name)
-    if not os.path.exists(path):
-        return None
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    doc = _read_doc(_qset_base(name))
+    if isinstance(doc, dict):
+        # banks may be wrapped as {"title", "tags", "questions": [...]}
+        return doc.get("questions") or []
+    return doc
 
 
-def list_question_sets() -> List[Tuple[str, int]]:
-    base = get_data_dir()
-    qdir = os.path.join(base, "question_sets")
-    out: List[Tuple[str, int]] = []
-    if not os.path.isdir(qdir):
-        return out
-    for name in os.listdir(qdir):
-        if not name.endswith('.json'):
-            continue
-        filepath = os.path.join(qdir, name)
+# --- Question set catalog (metadata cache keyed by file name + mtime/size) ---
+_QSET_CATALOG: Optional[Tuple[str, Dict[str, Dict]]] = None  # (catalog path, file name -> entry)
+
+
+def _qset_catalog_path() -> str:
+    cdir = os.path.join(get_data_dir(), "question_sets", "_catalog")
+    os.makedirs(cdir, exist_ok=True)
+    return os.path.join(cdir, "index.json")
+
+
+def _qset_catalog() -> Dict[str, Dict]:
+    global _QSET_CATALOG
+    path = _qset_catalog_path()
+    if _QSET_CATALOG is None or _QSET_CATALOG[0] != path:
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                arr = json.load(f)
-                count = len(arr) if isinstance(arr, list) else 0
+            with open(path, "r", encoding="utf-8") as f:
+                _QSET_CATALOG = (path, json.load(f))
         except Exception:
-            count = 0
-        out.append((name[:-5], count))
-    # sort by name
-    out.sort(key=lambda t: t[0])
+            _QSET_CATALOG = (path, {})
+    return _QSET_CATALOG[1]
+
+
+def _save_qset_catalog(catalog: Dict[str, Dict]) -> None:
+    path = _qset_catalog_path()
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _qset_entry(fname: str, st: os.stat_result, raw: bytes, doc) -> Dict:
+    stem = _doc_stem(fname) or fname
+    title, tags, questions = stem, [], doc
+    if isinstance(doc, dict):
+        title = str(doc.get("title") or stem)
+        tags = [str(t) for t in (doc.get("tags") or [])]
+        questions = doc.get("questions") or []
+    return {
+        "name": stem,
+        "file": fname,
+        "mtime": st.st_mtime,
+        "size": st.st_size,
+        "count": len(questions) if isinstance(questions, list) else 0,
+        "title": title,
+        "tags": tags,
+        "checksum": hashlib.sha1(raw).hexdigest(),
+    }
+
+
+def list_question_sets(sort: str = "name", descending: bool = False) -> List[Dict]:
+    """Metadata for every bank. Only files whose mtime/size changed since the last call are parsed."""
+    qdir = os.path.join(get_data_dir(), "question_sets")
+    catalog = _qset_catalog()
+    changed = False
+    seen: Dict[str, Dict] = {}
+    for entry in os.scandir(qdir):
+        stem = _doc_stem(entry.name)
+        if stem is None or not entry.is_file():
+            continue
+        st = entry.stat()
+        cached = catalog.get(entry.name)
+        if not cached or cached.get("mtime") != st.st_mtime or cached.get("size") != st.st_size:
+            try:
+                with open(entry.path, "rb") as f:
+                    raw = f.read()
+                cached = _qset_entry(entry.name, st, raw, decode_doc(raw))
+            except Exception:
+                cached = {"name": stem, "file": entry.name, "mtime": st.st_mtime, "size": st.st_size,
+                          "count": 0, "title": stem, "tags": [], "checksum": None}
+            catalog[entry.name] = cached
+            changed = True
+        # if both layouts exist for a stem, the newer file wins (same rule as loads)
+        if stem not in seen or seen[stem]["mtime"] < cached["mtime"]:
+            seen[stem] = cached
+    for fname in [f for f in catalog if not os.path.exists(os.path.join(qdir, f))]:
+        catalog.pop(fname)
+        changed = True
+    if changed:
+        _save_qset_catalog(catalog)
+    key = sort if sort in ("name", "count", "mtime", "title", "size") else "name"
+    out = list(seen.values())
+    out.sort(key=lambda d: (d.get(key) if d.get(key) is not None else "", d["name"]), reverse=descending)
     return out
 
 
 def delete_question_set(name: str) -> bool:
-    path = _qset_path(name)
-    if os.path.exists(path):
-        os.remove(path)
-        return True
-    return False
+    base = _qset_base(name)
+    catalog = _qset_catalog()
+    deleted = False
+    for ext in _DOC_EXTS:
+        if os.path.exists(base + ext):
+            os.remove(base + ext)
+            deleted = True
+        catalog.pop(os.path.basename(base) + ext, None)
+    if deleted:
+        _save_qset_catalog(catalog)
+    return deleted
 
 
 # --- Leaderboard snapshots ---
@@ -124,6 +366,106 @@ def _leaderboard_dir() -> str:
     return os.path.join(get_data_dir(), "leaderboards")
 
 
+def _snapshot_catalog_path(code: str) -> str:
+    cdir = os.path.join(_leaderboard_dir(), "_catalog")
+    os.makedirs(cdir, exist_ok=True)
+    return os.path.join(cdir, f"{str(code).upper()}.json")
+
+
+# code -> (catalog file mtime, entries oldest-first); avoids re-reading the manifest per listing
+_SNAPSHOT_CATALOGS: Dict[str, Tuple[float, List[Dict]]] = {}
+# listings span every code, so they can't share a per-code storage key with saves; this
+# lock orders catalog read-modify-writes (and the cache above) across pool threads
+_SNAPSHOT_CATALOG_LOCK = threading.RLock()
+
+
+def _snapshot_entry(name: str, code: str, created_at: Optional[str], count: int) -> Dict:
+    created_human = None
+    if isinstance(created_at, str):
+        try:
+            import datetime as _dt
+            dt = _dt.datetime.strptime(created_at, "%Y%m%d_%H%M%S")
+            created_human = dt.strftime("%Y-%m-%d %H:%M:%S UTC")
+        except Exception:
+            created_human = created_at
+    return {
+        "name": name[:-5],
+        "file": name,
+        "createdAt": created_at,
+        "createdAtHuman": created_human,
+        "count": count,
+        "code": code,
+    }
+
+
+def _scan_snapshots(code: str) -> List[Dict]:
+    # One-time migration path for directories that predate the catalog: parse every snapshot file.
+    items: List[Dict] = []
+    ldir = _leaderboard_dir()
+    prefix = str(code).upper() + "_"
+    for name in os.listdir(ldir):
+        if not name.endswith('.json') or not name.upper().startswith(prefix):
+            continue
+        try:
+            with open(os.path.join(ldir, name), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            items.append(_snapshot_entry(name, data.get("code"), data.get("createdAt"), len(data.get("leaderboard") or [])))
+        except Exception:
+            continue
+    items.sort(key=lambda d: d.get("file"))
+    return items
+
+
+def _load_snapshot_catalog(code: str) -> List[Dict]:
+    code = str(code).upper()
+    path = _snapshot_catalog_path(code)
+    with _SNAPSHOT_CATALOG_LOCK:
+        if not os.path.exists(path):
+            entries = _scan_snapshots(code)
+            _save_snapshot_catalog(code, entries)
+            return entries
+        mtime = os.path.getmtime(path)
+        cached = _SNAPSHOT_CATALOGS.get(code)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        _SNAPSHOT_CATALOGS[code] = (mtime, entries)
+        return entries
+
+
+def _save_snapshot_catalog(code: str, entries: List[Dict]) -> None:
+    code = str(code).upper()
+    path = _snapshot_catalog_path(code)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    _SNAPSHOT_CATALOGS[code] = (os.path.getmtime(path), entries)
+
+
+def _snapshot_retention() -> Tuple[int, float]:
+    """(keep last N per code, max age in days); 0 disables either limit."""
+    keep = int(os.getenv("LEADERBOARD_SNAPSHOT_KEEP", "0") or 0)
+    max_age_days = float(os.getenv("LEADERBOARD_SNAPSHOT_MAX_AGE_DAYS", "0") or 0)
+    return max(0, keep), max(0.0, max_age_days)
+
+
+def _apply_snapshot_retention(entries: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """Split catalog entries (oldest-first) into (kept, expired) per the retention settings."""
+    import datetime as _dt
+    keep, max_age_days = _snapshot_retention()
+    expired: List[Dict] = []
+    if max_age_days:
+        cutoff = (_dt.datetime.utcnow() - _dt.timedelta(days=max_age_days)).strftime("%Y%m%d_%H%M%S")
+        while entries and str(entries[0].get("createdAt") or "") < cutoff:
+            expired.append(entries.pop(0))
+    if keep and len(entries) > keep:
+        expired.extend(entries[: len(entries) - keep])
+        entries = entries[len(entries) - keep:]
+    return entries, expired
+
+
 def save_leaderboard_snapshot(code: str, leaderboard: List[Dict]) -> str:
     import datetime as _dt
     code = str(code).upper()
@@ -135,44 +477,45 @@ def save_leaderboard_snapshot(code: str, leaderboard: List[Dict]) -> str:
     with open(tmp, "w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2, ensure_ascii=False)
     os.replace(tmp, path)
+    # Maintain the per-code catalog and enforce retention incrementally (only the oldest entries are examined)
+    with _SNAPSHOT_CATALOG_LOCK:
+        entries = [e for e in _load_snapshot_catalog(code) if e.get("file") != fname]
+        entries.append(_snapshot_entry(fname, code, ts, len(leaderboard)))
+        entries, expired = _apply_snapshot_retention(entries)
+        for e in expired:
+            try:
+                os.remove(os.path.join(_leaderboard_dir(), e["file"]))
+            except OSError:
+                pass
+        _save_snapshot_catalog(code, entries)
     return fname
 
 
-def list_leaderboard_snapshots(code: Optional[str] = None) -> List[Dict]:
-    items: List[Dict] = []
-    ldir = _leaderboard_dir()
-    if not os.path.isdir(ldir):
-        return items
-    for name in os.listdir(ldir):
-        if not name.endswith('.json'):
-            continue
-        if code and not name.upper().startswith(str(code).upper() + '_'):
-            continue
-        try:
-            with open(os.path.join(ldir, name), 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            created_at = data.get("createdAt")
-            created_human = None
-            if isinstance(created_at, str):
-                try:
-                    import datetime as _dt
-                    dt = _dt.datetime.strptime(created_at, "%Y%m%d_%H%M%S")
-                    created_human = dt.strftime("%Y-%m-%d %H:%M:%S UTC")
-                except Exception:
-                    created_human = created_at
-            items.append({
-                "name": name[:-5],
-                "file": name,
-                "createdAt": created_at,
-                "createdAtHuman": created_human,
-                "count": len(data.get("leaderboard") or []),
-                "code": data.get("code"),
-            })
-        except Exception:
-            continue
-    # newest first
-    items.sort(key=lambda d: d.get("file"), reverse=True)
-    return items
+def _snapshot_catalog_codes() -> List[str]:
+    cdir = os.path.join(_leaderboard_dir(), "_catalog")
+    codes = {name[:-5] for name in os.listdir(cdir) if name.endswith(".json")} if os.path.isdir(cdir) else set()
+    # include codes whose snapshots predate the catalog
+    for name in os.listdir(_leaderboard_dir()):
+        if name.endswith(".json") and "_" in name:
+            codes.add(name.split("_", 1)[0].upper())
+    return sorted(codes)
+
+
+def count_leaderboard_snapshots(code: Optional[str] = None) -> int:
+    codes = [code] if code else _snapshot_catalog_codes()
+    return sum(len(_load_snapshot_catalog(c)) for c in codes)
+
+
+def list_leaderboard_snapshots(code: Optional[str] = None, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+    """Newest-first page of snapshot metadata, served from the catalog without opening snapshot files."""
+    if code:
+        items = list(reversed(_load_snapshot_catalog(code)))
+    else:
+        items = [e for c in _snapshot_catalog_codes() for e in _load_snapshot_catalog(c)]
+        items.sort(key=lambda d: d.get("file"), reverse=True)
+    offset = max(0, int(offset or 0))
+    end = None if limit is None else offset + max(0, int(limit))
+    return items[offset:end]
 
 
 def load_leaderboard_snapshot(file_name: str) -> Optional[Dict]:
@@ -193,14 +536,18 @@ def delete_leaderboard_snapshots(code: Optional[str] = None) -> int:
         return 0
     deleted = 0
     prefix = (str(code).upper() + "_") if code else None
-    for name in list(os.listdir(ldir)):
-        if not name.endswith('.json'):
-            continue
-        if prefix and not name.upper().startswith(prefix):
-            continue
-        try:
-            os.remove(os.path.join(ldir, name))
-            deleted += 1
-        except Exception:
-            continue
+    with _SNAPSHOT_CATALOG_LOCK:
+        for name in list(os.listdir(ldir)):
+            if not name.endswith('.json'):
+                continue
+            if prefix and not name.upper().startswith(prefix):
+                continue
+            try:
+                os.remove(os.path.join(ldir, name))
+                deleted += 1
+            except Exception:
+                continue
+        # Reset the affected catalogs to match
+        for c in ([code] if code else _snapshot_catalog_codes()):
+            _save_snapshot_catalog(c, [])
     return deleted
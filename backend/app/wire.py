@@ -0,0 +1,110 @@
+from __future__ import annotations
+import json
+import os
+from typing import Any, Optional
+from urllib.parse import parse_qs
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from socketio import packet as _packet
+
+# --- Wire serializers ---
+# Socket.IO packets and API responses are JSON; WIRE_JSON picks the encoder ("auto" uses
+# orjson when it is installed, "stdlib" forces the json module). Socket.IO clients can also
+# opt into msgpack packets per connection with the `serializer=msgpack` handshake query.
+
+try:  # optional fast JSON encoder
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on environment
+    _orjson = None
+
+try:  # optional binary Socket.IO packets (imports msgpack itself)
+    from socketio.msgpack_packet import MsgPackPacket as _MsgPackPacket
+except ImportError:  # pragma: no cover - depends on environment
+    _MsgPackPacket = None
+
+
+def json_backend() -> str:
+    """"orjson" or "stdlib" from WIRE_JSON (default "auto": orjson when installed)."""
+    choice = (os.getenv("WIRE_JSON") or "auto").strip().lower()
+    if choice not in ("auto", "orjson", "stdlib"):
+        raise ValueError(f"Unknown WIRE_JSON: {choice}")
+    if choice == "orjson" and _orjson is None:
+        raise RuntimeError("WIRE_JSON=orjson but the orjson package is not installed")
+    return "orjson" if choice != "stdlib" and _orjson is not None else "stdlib"
+
+
+class OrjsonModule:
+    """`json`-module stand-in for python-socketio / python-engineio backed by orjson.
+
+    Both libraries only call `dumps(obj, separators=...)` and `loads(s)`; output is
+    already compact, so the keyword arguments are ignored. Anything orjson refuses
+    (ints beyond 64 bits, unknown types) is retried with the stdlib encoder.
+    """
+
+    _OPTIONS = _orjson.OPT_NON_STR_KEYS if _orjson is not None else 0
+
+    @staticmethod
+    def dumps(obj: Any, **kwargs) -> str:
+        try:
+            return _orjson.dumps(obj, option=OrjsonModule._OPTIONS).decode("utf-8")
+        except TypeError:
+            return json.dumps(obj, **kwargs)
+
+    @staticmethod
+    def loads(s, **kwargs) -> Any:
+        return _orjson.loads(s)
+
+
+class TextPacket(_packet.Packet):
+    """Socket.IO packet that skips the binary-attachment scan when it is built.
+
+    The stock packet walks every list and dict of the payload in Python looking for
+    bytes, which on a full leaderboard costs as much as encoding it. Nothing the
+    server emits contains bytes; one that did would now fail to encode rather than
+    go out as attachments. Decoding (including clients' binary packets) is unchanged.
+    """
+
+    def _data_is_binary(self, data) -> bool:
+        return False
+
+
+def json_module():
+    """Module-like object handed to socketio.AsyncServer(json=...)."""
+    return OrjsonModule if json_backend() == "orjson" else json
+
+
+def response_class():
+    """FastAPI default_response_class for the selected backend."""
+    return ORJSONResponse if json_backend() == "orjson" else JSONResponse
+
+
+# --- Per-connection msgpack ---
+def msgpack_available() -> bool:
+    return _MsgPackPacket is not None
+
+
+def wants_msgpack(environ: dict) -> bool:
+    """True when the Engine.IO handshake asked for msgpack packets (?serializer=msgpack)."""
+    if _MsgPackPacket is None:
+        return False
+    query = parse_qs(environ.get("QUERY_STRING", ""))
+    return (query.get("serializer") or [""])[0].lower() == "msgpack"
+
+
+def decode_msgpack(data: bytes):
+    """A Socket.IO packet sent by a msgpack client."""
+    return _MsgPackPacket(encoded_packet=data)
+
+
+def to_msgpack(pkt: _packet.Packet) -> bytes:
+    """Re-encode a packet for a msgpack client."""
+    # the text encoding omits the default namespace; msgpack clients expect it spelled out
+    return _MsgPackPacket(pkt.packet_type, data=pkt.data, namespace=pkt.namespace or "/", id=pkt.id).encode()
+
+
+def transcode_to_msgpack(encoded: str) -> Optional[bytes]:
+    """A JSON-encoded Socket.IO packet as msgpack, or None for packets with binary attachments."""
+    pkt = _packet.Packet(encoded_packet=encoded)
+    if pkt.attachment_count:
+        return None
+    return to_msgpack(pkt)
@@ -0,0 +1,348 @@
+"""End-to-end load test: simulated Socket.IO players against the real asgi_app.
+
+Starts the backend with uvicorn (or targets --url), mints a fresh quiz, then
+drives it like an event: every player registers and joins over websockets, the
+admin starts and advances questions, players lock answers (some use a lifeline
+first) and the admin reveals. Reports p50/p95/p99 latency for the question
+broadcast, the answer ack (`answer_locked`) and reveal -> `answer_result`, plus
+server CPU time and RSS. Needs only the dev requirements; no external services.
+
+Run from the repository root:
+
+    pip install -r backend/requirements-dev.txt
+    python -m backend.benchmarks.loadtest --players 2000 --questions 5
+    python -m backend.benchmarks.loadtest --players 2000 --workers 4   # multi-worker mode
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+import socketio
+
+try:  # optional: per-process CPU/RSS on any OS, including uvicorn worker children
+    import psutil  # type: ignore
+except Exception:  # pragma: no cover - fall back to /proc on Linux
+    psutil = None
+
+SOCKET_PATH = "/ws/socket.io"
+# what the server answers a lifeline_request with (effect, plain ack, or denied when already used)
+LIFELINE_REPLIES = ("lifeline_hint", "lifeline_5050", "lifeline_ack", "lifeline_denied")
+
+
+# --- server process -------------------------------------------------------
+
+def start_server(port: int, workers: int, data_dir: str) -> List[subprocess.Popen]:
+    env = dict(os.environ, QUIZ_DATA_DIR=data_dir)
+    procs = []
+    cmd = [sys.executable, "-m", "uvicorn", "backend.app.main:asgi_app", "--port", str(port), "--log-level", "warning"]
+    if workers > 1:
+        env["QUIZ_BROKER"] = os.path.join(data_dir, "broker.sock")
+        procs.append(subprocess.Popen([sys.executable, "-m", "backend.app.broker", env["QUIZ_BROKER"]], env=env, stdout=subprocess.DEVNULL))
+        time.sleep(0.5)
+        cmd += ["--workers", str(workers)]
+    procs.append(subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL))
+    return procs
+
+
+def stop_server(procs: List[subprocess.Popen]) -> None:
+    for p in reversed(procs):
+        p.send_signal(signal.SIGINT)
+        try:
+            p.wait(10)
+        except subprocess.TimeoutExpired:
+            p.kill()
+
+
+async def wait_healthy(http: aiohttp.ClientSession, url: str, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with http.get(f"{url}/health") as r:
+                if r.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"server at {url} did not become healthy")
+        await asyncio.sleep(0.2)
+
+
+class ProcSampler:
+    """CPU seconds and peak RSS of a process tree (psutil if installed, else /proc)."""
+
+    def __init__(self, pids: List[int]) -> None:
+        self.pids = pids
+        self.peak_rss = 0
+        self._cpu0 = self._cpu()
+
+    def _tree(self) -> List[int]:
+        out, stack = [], list(self.pids)
+        while stack:
+            pid = stack.pop()
+            out.append(pid)
+            if psutil is not None:
+                try:
+                    stack.extend(c.pid for c in psutil.Process(pid).children())
+                except psutil.Error:
+                    pass
+                continue
+            try:
+                with open(f"/proc/{pid}/task/{pid}/children") as f:
+                    stack.extend(int(c) for c in f.read().split())
+            except OSError:
+                pass
+        return out
+
+    def _cpu(self) -> float:
+        total = 0.0
+        for pid in self._tree():
+            try:
+                if psutil is not None:
+                    t = psutil.Process(pid).cpu_times()
+                    total += t.user + t.system
+                else:
+                    with open(f"/proc/{pid}/stat") as f:
+                        fields = f.read().rsplit(")", 1)[1].split()
+                    total += (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+            except Exception:
+                pass
+        return total
+
+    def _rss(self) -> int:
+        total = 0
+        for pid in self._tree():
+            try:
+                if psutil is not None:
+                    total += psutil.Process(pid).memory_info().rss
+                else:
+                    with open(f"/proc/{pid}/status") as f:
+                        for line in f:
+                            if line.startswith("VmRSS:"):
+                                total += int(line.split()[1]) * 1024
+            except Exception:
+                pass
+        return total
+
+    async def run(self, interval: float = 0.5) -> None:
+        while True:
+            self.peak_rss = max(self.peak_rss, self._rss())
+            await asyncio.sleep(interval)
+
+    def result(self, wall: float) -> Dict:
+        cpu = self._cpu() - self._cpu0
+        return {"cpuSeconds": round(cpu, 2), "cpuPercent": round(100.0 * cpu / wall, 1) if wall else 0.0, "peakRssMB": round(self.peak_rss / 2 ** 20, 1)}
+
+
+# --- measurements ---------------------------------------------------------
+
+class Samples:
+    def __init__(self) -> None:
+        self.values: Dict[str, List[float]] = {}
+        self.timeouts: Dict[str, int] = {}
+
+    def add(self, metric: str, seconds: float) -> None:
+        self.values.setdefault(metric, []).append(seconds * 1000.0)
+
+    def timeout(self, metric: str, n: int = 1) -> None:
+        self.timeouts[metric] = self.timeouts.get(metric, 0) + n
+
+    def summary(self) -> Dict[str, Dict]:
+        out = {}
+        for metric in sorted(set(self.values) | set(self.timeouts)):
+            vals = sorted(self.values.get(metric, []))
+            row = {"n": len(vals), "timeouts": self.timeouts.get(metric, 0)}
+            if vals:
+                for p in (50, 95, 99):
+                    row[f"p{p}"] = round(vals[min(len(vals) - 1, int(len(vals) * p / 100))], 2)
+                row["max"] = round(vals[-1], 2)
+            out[metric] = row
+        return out
+
+
+class Player:
+    def __init__(self, idx: int) -> None:
+        self.idx = idx
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.pid: Optional[str] = None
+        self.waiters: Dict[str, asyncio.Future] = {}
+        for event in ("question", "answer_locked", "answer_result", "joined") + LIFELINE_REPLIES:
+            self.sio.on(event, self._make_handler(event))
+
+    def _make_handler(self, event: str):
+        async def handler(data=None):
+            fut = self.waiters.pop(event, None)
+            if fut is not None and not fut.done():
+                fut.set_result(time.perf_counter())
+        return handler
+
+    def expect(self, *events: str) -> asyncio.Future:
+        """Future resolved with the receive time of the next of `events`."""
+        fut = asyncio.get_running_loop().create_future()
+        for event in events:
+            self.waiters[event] = fut
+        return fut
+
+
+async def wait_all(samples: Samples, metric: str, t0: float, futures: List[asyncio.Future], timeout: float) -> None:
+    done, pending = await asyncio.wait(futures, timeout=timeout)
+    for fut in done:
+        samples.add(metric, fut.result() - t0)
+    for fut in pending:
+        fut.cancel()
+    if pending:
+        samples.timeout(metric, len(pending))
+
+
+# --- scenario -------------------------------------------------------------
+
+async def run(args) -> Dict:
+    url = args.url.rstrip("/") if args.url else f"http://127.0.0.1:{args.port}"
+    headers = {"X-Admin-Token": args.admin_token}
+    procs: List[subprocess.Popen] = []
+    data_dir = None
+    if not args.url:
+        data_dir = tempfile.mkdtemp(prefix="quiz-loadtest-")
+        procs = start_server(args.port, args.workers, data_dir)
+    samples = Samples()
+    players: List[Player] = []
+    rnd = random.Random(7)
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    try:
+        async with aiohttp.ClientSession(connector=connector) as http:
+            await wait_healthy(http, url)
+            server_pids = [p.pid for p in procs] or ([args.server_pid] if args.server_pid else [])
+            sampler = ProcSampler(server_pids) if server_pids else None
+            sampler_task = asyncio.create_task(sampler.run()) if sampler else None
+            wall0 = time.perf_counter()
+
+            async with http.post(f"{url}/api/admin/quizzes", headers=headers) as r:
+                code = (await r.json())["code"]
+            questions = [
+                {"id": f"q{i}", "text": f"Question {i}", "choices": [{"id": c, "text": c.upper()} for c in "abcd"],
+                 "answer": "b", "duration": 30, "hint": "It is not a"}
+                for i in range(args.questions)
+            ]
+            async with http.post(f"{url}/api/admin/questions", params={"code": code}, json={"questions": questions}, headers=headers) as r:
+                r.raise_for_status()
+
+            # register_global -> join_quiz for every player, ramped by --concurrency
+            gate = asyncio.Semaphore(args.concurrency)
+
+            async def join(idx: int) -> None:
+                p = Player(idx)
+                async with gate:
+                    t0 = time.perf_counter()
+                    async with http.post(f"{url}/api/quiz/register", params={"code": code},
+                                         json={"name": f"Player {idx}", "email": f"player{idx}@load.test"}) as r:
+                        p.pid = (await r.json())["playerId"]
+                    samples.add("register", time.perf_counter() - t0)
+                    t0 = time.perf_counter()
+                    await p.sio.connect(url, socketio_path=SOCKET_PATH, transports=["websocket"])
+                    joined = p.expect("joined")
+                    await p.sio.emit("join_quiz", {"code": code, "name": f"Player {idx}", "playerId": p.pid, "email": f"player{idx}@load.test"})
+                    await asyncio.wait_for(joined, args.timeout)
+                    samples.add("join", time.perf_counter() - t0)
+                players.append(p)
+
+            results = await asyncio.gather(*(join(i) for i in range(args.players)), return_exceptions=True)
+            failed = [r for r in results if isinstance(r, Exception)]
+            if failed:
+                samples.timeout("join", len(failed))
+            print(f"{len(players)} players joined quiz {code} ({len(failed)} failed)", file=sys.stderr)
+
+            for qi in range(args.questions):
+                # question broadcast: admin start/next -> every player's `question`
+                waits = [p.expect("question") for p in players]
+                t0 = time.perf_counter()
+                endpoint = "start" if qi == 0 else "next"
+                async with http.post(f"{url}/api/admin/{endpoint}", params={"code": code}, headers=headers) as r:
+                    r.raise_for_status()
+                await wait_all(samples, "question_broadcast", t0, waits, args.timeout)
+
+                # players think, some use a lifeline, then lock an answer
+                async def answer(p: Player) -> None:
+                    await asyncio.sleep(rnd.random() * args.think_ms / 1000.0)
+                    if rnd.random() < args.lifeline_rate:
+                        ack = p.expect(*LIFELINE_REPLIES)
+                        t = time.perf_counter()
+                        await p.sio.emit("lifeline_request", {"lifeline": rnd.choice(["hint", "5050"])})
+                        await wait_all(samples, "lifeline_reply", t, [ack], args.timeout)
+                    locked = p.expect("answer_locked")
+                    t = time.perf_counter()
+                    await p.sio.emit("submit_answer", {"answer": rnd.choice("abcd")})
+                    await wait_all(samples, "answer_ack", t, [locked], args.timeout)
+
+                await asyncio.gather(*(answer(p) for p in players))
+
+                # reveal -> every player's `answer_result`
+                waits = [p.expect("answer_result") for p in players]
+                t0 = time.perf_counter()
+                async with http.post(f"{url}/api/admin/reveal", params={"code": code}, headers=headers) as r:
+                    r.raise_for_status()
+                await wait_all(samples, "reveal_to_result", t0, waits, args.timeout)
+
+            wall = time.perf_counter() - wall0
+            server = sampler.result(wall) if sampler else None
+            if sampler_task:
+                sampler_task.cancel()
+            async with http.get(f"{url}/api/admin/stats", headers=headers) as r:
+                stats = await r.json() if r.status == 200 else None
+    finally:
+        await asyncio.gather(*(p.sio.disconnect() for p in players), return_exceptions=True)
+        if procs:
+            stop_server(procs)
+        if data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    return {
+        "players": args.players, "joined": len(players), "questions": args.questions, "workers": args.workers,
+        "wallSeconds": round(wall, 2), "latencyMs": samples.summary(), "server": server, "serverStats": stats,
+    }
+
+
+def print_report(report: Dict) -> None:
+    print(f"players {report['joined']}/{report['players']}, questions {report['questions']}, "
+          f"workers {report['workers']}, wall {report['wallSeconds']}s")
+    print(f"{'metric':<20}{'n':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'timeouts':>10}")
+    for metric, row in report["latencyMs"].items():
+        cols = "".join(f"{row[k]:>10.1f}" if k in row else f"{'-':>10}" for k in ("p50", "p95", "p99", "max"))
+        print(f"{metric:<20}{row['n']:>8}{cols}{row['timeouts']:>10}")
+    if report["server"]:
+        s = report["server"]
+        print(f"server: cpu {s['cpuSeconds']}s ({s['cpuPercent']}% of one core), peak RSS {s['peakRssMB']} MB")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--players", type=int, default=500)
+    ap.add_argument("--questions", type=int, default=3)
+    ap.add_argument("--think-ms", type=int, default=2000, help="max random delay before a player answers")
+    ap.add_argument("--lifeline-rate", type=float, default=0.1, help="fraction of answers preceded by a lifeline")
+    ap.add_argument("--concurrency", type=int, default=200, help="parallel registrations/connects while ramping up")
+    ap.add_argument("--timeout", type=float, default=10.0, help="seconds to wait for each expected event")
+    ap.add_argument("--port", type=int, default=8799)
+    ap.add_argument("--workers", type=int, default=1, help=">1 starts a local broker and uvicorn --workers")
+    ap.add_argument("--url", help="target an already running server instead of starting one")
+    ap.add_argument("--server-pid", type=int, help="with --url: process to sample for CPU/RSS")
+    ap.add_argument("--admin-token", default=os.getenv("ADMIN_SECRET", "changeme"))
+    ap.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = ap.parse_args()
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Roster memory and reveal scoring time, with and without NumPy.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.reveal_scoring --players 50000
+"""
+from __future__ import annotations
+import argparse
+import gc
+import time
+import tracemalloc
+
+from backend.app import roster as roster_mod
+from backend.app.main import Player, QuizSession, _apply_reveal_scoring
+from backend.benchmarks.storage_codecs import make_session
+
+
+def _allocated(build) -> float:
+    """MB held by whatever `build()` returns."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size / 1e6
+
+
+def _best_reveal(data: dict, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        session = QuizSession(**data)
+        t0 = time.perf_counter()
+        _apply_reveal_scoring(session)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def run(players: int, repeat: int) -> None:
+    data = make_session(players, 10)
+    answered = len(data["current_answers"])
+    models = _allocated(lambda: {pid: Player(**p) for pid, p in data["players"].items()})
+    columns = _allocated(lambda: roster_mod.Roster.load(data["players"]))
+    print(f"roster: {players} players, {answered} answers (best of {repeat})")
+    print(f"{'store':<30}{'MB':>10}")
+    print(f"{'Dict[str, Player] models':<30}{models:>10.1f}")
+    print(f"{'Roster columns':<30}{columns:>10.1f}")
+
+    rows = []
+    numpy = roster_mod._np
+    if numpy is not None:
+        rows.append(("reveal scoring (numpy)", _best_reveal(data, repeat)))
+    roster_mod._np = None
+    try:
+        rows.append(("reveal scoring (python)", _best_reveal(data, repeat)))
+    finally:
+        roster_mod._np = numpy
+    print(f"{'path':<30}{'ms':>10}")
+    for name, ms in rows:
+        print(f"{name:<30}{ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--players", type=int, default=50000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    run(args.players, args.repeat)
@@ -0,0 +1,143 @@
+"""Compare session storage codecs: write/read time and file size.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.storage_codecs --players 20000 --questions 500
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from backend.app import storage
+from backend.app.main import SESSION_PART_FIELDS
+
+
+def make_session(players: int, questions: int) -> dict:
+    rnd = random.Random(42)
+    qs = [
+        {
+            "id": f"q{i}",
+            "text": f"Question number {i}: which option is correct?",
+            "choices": [{"id": c, "text": f"Option {c} for {i}"} for c in "abcd"],
+            "answer": rnd.choice("abcd"),
+            "duration": 30,
+            "hint": "Think about it",
+        }
+        for i in range(questions)
+    ]
+    roster = {}
+    answers = {}
+    times = {}
+    for i in range(players):
+        pid = f"{rnd.getrandbits(64):016x}"
+        email = f"student{i}@example.edu"
+        roster[pid] = {
+            "id": pid,
+            "name": f"Student {i}",
+            "email": email,
+            "participant_code": email,
+            "score": rnd.randint(0, 20000),
+            "lifelines": {"5050": rnd.random() < 0.5, "hint": rnd.random() < 0.5},
+            "correct_firsts": rnd.randint(0, 3),
+            "cumulative_answer_time": rnd.random() * 300,
+        }
+        if rnd.random() < 0.8:
+            answers[pid] = rnd.choice("abcd")
+            times[pid] = 1.7e9 + rnd.random() * 30
+    return {
+        "code": "BENCH",
+        "players": roster,
+        "questions": qs,
+        "current_index": 3,
+        "is_active": True,
+        "lifelines_enabled": {"5050": True, "hint": True},
+        "allowed_emails": [p["email"] for p in roster.values()],
+        "paused": False,
+        "revealed": False,
+        "question_started_at": 1.7e9,
+        "current_answers": answers,
+        "paused_at": None,
+        "paused_accumulated": 0.0,
+        "current_answer_times": times,
+        "sudden_death_active": False,
+        "sudden_death_allowed": None,
+        "journal_seq": 0,
+    }
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def run(players: int, questions: int, repeat: int) -> None:
+    data = make_session(players, questions)
+    workdir = tempfile.mkdtemp(prefix="quiz-bench-")
+    os.environ["QUIZ_DATA_DIR"] = workdir
+    rows = []
+
+    # Baseline: the previous on-disk format (indented stdlib json)
+    legacy = os.path.join(workdir, "legacy.json")
+
+    def legacy_write():
+        with open(legacy, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def legacy_read():
+        with open(legacy, "r", encoding="utf-8") as f:
+            json.load(f)
+
+    w = _best(legacy_write, repeat)
+    rows.append(("json indent=2 (legacy)", w, _best(legacy_read, repeat), os.path.getsize(legacy)))
+
+    combos = [("json", "none"), ("json", "zlib"), ("json", "lz4"), ("msgpack", "none"), ("msgpack", "zlib"), ("msgpack", "lz4")]
+    for codec, compression in combos:
+        os.environ["QUIZ_STORAGE_CODEC"] = codec
+        os.environ["QUIZ_STORAGE_COMPRESSION"] = compression
+        try:
+            w = _best(lambda: storage.save_session_dict("BENCH", data), repeat)
+        except RuntimeError as e:
+            rows.append((f"{codec}+{compression}", None, None, str(e)))
+            continue
+        r = _best(lambda: storage.load_session_dict("BENCH"), repeat)
+        assert storage.load_session_dict("BENCH") == data
+        size = os.path.getsize(storage._doc_file(storage._session_base("BENCH")))
+        rows.append((f"{codec}+{compression}", w, r, size))
+
+    # Partitioned layout (compact json): each mutation rewrites only the part it touched
+    os.environ["QUIZ_STORAGE_CODEC"] = "json"
+    os.environ["QUIZ_STORAGE_COMPRESSION"] = "none"
+    parts = {name: {k: data[k] for k in fields if k in data} for name, fields in SESSION_PART_FIELDS.items()}
+    w = _best(lambda: storage.save_session_parts("BENCH", parts, 0), repeat)
+    r = _best(lambda: storage.load_session_parts("BENCH"), repeat)
+    sdir = storage._session_dir("BENCH")
+    rows.append(("json parts: all", w, r, sum(os.path.getsize(storage._doc_file(os.path.join(sdir, n))) for n in parts)))
+    for name in storage.SESSION_PARTS:
+        w = _best(lambda: storage.save_session_parts("BENCH", {name: parts[name]}, 0), repeat)
+        rows.append((f"json parts: {name} only", w, None, os.path.getsize(storage._doc_file(os.path.join(sdir, name)))))
+
+    print(f"session: {players} players, {questions} questions (best of {repeat})")
+    print(f"{'format':<26}{'write ms':>10}{'read ms':>10}{'size KB':>12}")
+    for name, w, r, size in rows:
+        if w is None:
+            print(f"{name:<26}  skipped: {size}")
+            continue
+        read = f"{r:>10.1f}" if r is not None else f"{'-':>10}"
+        print(f"{name:<26}{w:>10.1f}{read}{size / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--players", type=int, default=20000)
+    ap.add_argument("--questions", type=int, default=500)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    run(args.players, args.questions, args.repeat)
@@ -0,0 +1,98 @@
+"""Socket.IO packet encode time and bytes per reveal for each wire serializer.
+
+"socketio default" is the stock packet class with the stdlib encoder (the server before the
+wire layer); "stdlib" and "orjson" use wire.TextPacket, which skips the binary scan.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.wire_serializers --players 1000 10000 50000
+"""
+from __future__ import annotations
+import argparse
+import json
+import time
+
+from socketio import packet
+
+from backend.app import main, wire
+from backend.app.main import QuizSession, _admin_leaderboard, _apply_reveal_scoring, _player_leaderboard
+from backend.benchmarks.storage_codecs import make_session
+
+
+def _packet_classes() -> dict:
+    # Packet.json is a class attribute (main.sio sets it on its packet class), so each encoder gets its own subclass
+    classes = {
+        "socketio default": type("DefaultPacket", (packet.Packet,), {"json": json}),
+        "stdlib": type("StdlibPacket", (wire.TextPacket,), {"json": json}),
+    }
+    if wire._orjson is not None:
+        classes["orjson"] = type("OrjsonPacket", (wire.TextPacket,), {"json": wire.OrjsonModule})
+    if wire._MsgPackPacket is not None:
+        classes["msgpack"] = wire._MsgPackPacket
+    return classes
+
+
+def reveal_packets(players: int) -> dict:
+    """Events one reveal sends, by kind: room broadcasts are encoded once, per-player ones once each."""
+    session = QuizSession(**make_session(players, 10))
+    main.ACTIVE_PLAYER_SOCKETS.clear()
+    main.ACTIVE_PLAYER_SOCKETS.update({pid: pid for pid in session.players})
+    results = _apply_reveal_scoring(session)
+    public, ranks = _player_leaderboard(session)
+    answer_results = [
+        {"correct": r["correct"], "score": session.players[pid].score, "rank": r["rank"], "bonus": r["awarded"], "awarded": r["awarded"]}
+        for pid, r in results.items()
+    ]
+    names = [{"id": p.id, "name": p.name} for p in session.players.values()]
+    main.ACTIVE_PLAYER_SOCKETS.clear()
+    return {
+        "reveal + top-K leaderboard": [("reveal", {"correctAnswer": "b"}), ("leaderboard", public)],
+        "answer_result (per player)": [("answer_result", m) for m in answer_results],
+        "your_rank (per player)": [("your_rank", m) for _, m in ranks],
+        "admin leaderboard": [("leaderboard", _admin_leaderboard(session))],
+        "final_results": [("final_results", {"leaderboard": _admin_leaderboard(session)})],
+        "answers_progress": [("answers_progress", {"lockedCount": len(results), "playersCount": len(names),
+                                                   "locked": names[:len(results)], "players": names, "unlocked": names[len(results):]})],
+    }
+
+
+def _encode_all(cls, events) -> int:
+    size = 0
+    for event, data in events:
+        size += len(cls(packet.EVENT, data=[event, data], namespace="/").encode())
+    return size
+
+
+def _best(fn, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0, out
+
+
+def run(players_list, repeat: int) -> None:
+    classes = _packet_classes()
+    for players in players_list:
+        groups = reveal_packets(players)
+        print(f"\n{players} players (best of {repeat}; a reveal is the first three rows plus the admin leaderboard)")
+        print(f"{'payload':<30}{'serializer':<18}{'encode ms':>12}{'KB':>12}")
+        totals = {name: [0.0, 0] for name in classes}
+        for group, events in groups.items():
+            for name, cls in classes.items():
+                ms, size = _best(lambda: _encode_all(cls, events), repeat)
+                if group not in ("final_results", "answers_progress"):
+                    totals[name][0] += ms
+                    totals[name][1] += size
+                print(f"{group:<30}{name:<18}{ms:>12.1f}{size / 1024:>12.1f}")
+        for name, (ms, size) in totals.items():
+            print(f"{'= per reveal':<30}{name:<18}{ms:>12.1f}{size / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--players", type=int, nargs="+", default=[1000, 10000, 50000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    run(args.players, args.repeat)
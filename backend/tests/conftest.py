@@ -0,0 +1,32 @@
+import os
+import tempfile
+
+import pytest
+
+# Modules read their settings at import time; keep the first import away from backend/data
+os.environ.setdefault("QUIZ_DATA_DIR", tempfile.mkdtemp(prefix="quizzer-tests-"))
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Every test gets an empty data directory."""
+    monkeypatch.setenv("QUIZ_DATA_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def app_main(data_dir):
+    """backend.app.main with no sessions, journals or pending writes left over from other tests."""
+    from backend.app import main
+
+    yield main
+    for code, session in main.SESSIONS.items():
+        main._drop_session(code, session)
+    main.SESSIONS.clear()
+    for f in main.JOURNAL._files.values():
+        f.close()
+    main.JOURNAL._files.clear()
+    main.JOURNAL._tail.clear()
+    main.JOURNAL._unsynced.clear()
+    main.PERSISTER._dirty.clear()
+    main.PERSISTER._dirty_parts.clear()
@@ -0,0 +1,40 @@
+import asyncio
+
+
+class BlockingSio:
+    """Records admin deltas; the first one stays in flight until `release` is set."""
+
+    def __init__(self):
+        self.deltas = []
+        self.sending = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def emit(self, event, data=None, to=None, room=None, **kwargs):
+        if event != "answers_progress_delta":
+            return
+        if not self.deltas:
+            self.sending.set()
+            await self.release.wait()
+        self.deltas.append([p["id"] for p in data["locked"]])
+
+
+def test_locks_queued_during_a_send_go_out_next(app_main, monkeypatch):
+    main = app_main
+    monkeypatch.setattr(main, "ANSWERS_PROGRESS_TICK_MS", 10)
+    session = main.QuizSession(code="PROG")
+    main.SESSIONS["PROG"] = session
+    for pid in ("p1", "p2"):
+        session.add_player(main.Player(id=pid, name=pid))
+
+    async def run():
+        sio = BlockingSio()
+        monkeypatch.setattr(main, "sio", sio)
+        main._queue_answers_progress(session, locked_pid="p1")
+        await sio.sending.wait()
+        # the flush task is still awaiting its emit, so this lock doesn't schedule a new one
+        main._queue_answers_progress(session, locked_pid="p2")
+        sio.release.set()
+        await asyncio.wait_for(session._progress_task, 1)
+        return sio.deltas
+
+    assert asyncio.run(run()) == [["p1"], ["p2"]]
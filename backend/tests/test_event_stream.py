@@ -0,0 +1,86 @@
+import asyncio
+
+from backend.app.event_stream import EventStream
+
+
+def test_record_stamps_a_copy():
+    stream = EventStream(4)
+    data = {"index": 0}
+    assert stream.record("question", data) == {"index": 0, "seq": 1}
+    assert data == {"index": 0}
+    assert stream.position() == {"epoch": stream.epoch, "seq": 1}
+
+
+def test_since_returns_missed_events():
+    stream = EventStream(4)
+    assert stream.since(0) == []
+    for i in range(3):
+        stream.record("tick", {"i": i})
+    assert [d["seq"] for _, d in stream.since(1)] == [2, 3]
+    assert stream.since(3) == []
+
+
+def test_since_reports_gaps():
+    stream = EventStream(4)
+    for i in range(6):
+        stream.record("tick", {"i": i})
+    # seqs 3..6 are buffered: resuming from 2 still works, from 1 it would miss seq 2
+    assert [d["seq"] for _, d in stream.since(2)] == [3, 4, 5, 6]
+    assert stream.since(1) is None
+    # a seq the stream never reached comes from another stream
+    assert stream.since(7) is None
+    assert EventStream(4).epoch != stream.epoch
+
+
+class FakeSio:
+    def __init__(self):
+        self.calls = []
+
+    async def emit(self, event, data=None, to=None, room=None):
+        self.calls.append((event, data.get("seq") if isinstance(data, dict) else None))
+
+    async def enter_room(self, sid, room):
+        self.calls.append(("enter_room", room))
+
+
+def test_resume_replays_before_rejoining(app_main, monkeypatch):
+    main = app_main
+    sio = FakeSio()
+    monkeypatch.setattr(main, "sio", sio)
+    session = main.QuizSession(code="RESUME")
+    main.SESSIONS["RESUME"] = session
+    stream = session._stream
+
+    async def run(data):
+        sio.calls.clear()
+        return await main._resume_stream("sid1", session, data, {"code": "RESUME"})
+
+    for event in ("question", "answers_progress", "reveal"):
+        asyncio.run(main._emit_to_quiz("RESUME", event, {}))
+    assert asyncio.run(run({"epoch": stream.epoch, "lastSeq": 1})) == {"answers_progress", "reveal"}
+    assert sio.calls == [("joined", None), ("answers_progress", 2), ("reveal", 3), ("enter_room", main.quiz_room("RESUME"))]
+
+    # another epoch (a restart or reload) or a gap the buffer no longer covers falls back to a snapshot
+    assert asyncio.run(run({"epoch": "stale", "lastSeq": 1})) is None
+    monkeypatch.setattr(stream, "_events", type(stream._events)(list(stream._events)[1:], maxlen=2))
+    assert asyncio.run(run({"epoch": stream.epoch, "lastSeq": 0})) is None
+    assert sio.calls == []
+
+
+def test_admin_rejoin_gets_full_state(app_main, monkeypatch):
+    main = app_main
+    sio = FakeSio()
+    monkeypatch.setattr(main, "sio", sio)
+    monkeypatch.setenv("ADMIN_SECRET", "s3cret")
+    session = main.QuizSession(code="ADMINS")
+    session.set_questions([main.Question(id="q1", text="?", duration=30)])
+    session.add_player(main.Player(id="p1", name="p1"))
+    main._reset_question_state(session, 0)
+    session.is_active = True
+    main.SESSIONS["ADMINS"] = session
+
+    asyncio.run(main.admin_join("sid1", {"code": "ADMINS", "token": "s3cret"}))
+    events = [event for event, _ in sio.calls]
+    # admin-room broadcasts are not replayed, so a reconnect has to rebuild everything the panel shows
+    for event in ("admin_joined", "answers_progress", "timers", "lifelines", "status", "leaderboard"):
+        assert event in events
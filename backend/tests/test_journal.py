@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+from backend.app import journal as journal_mod
+from backend.app import storage
+from backend.app.journal import EventJournal
+
+
+def _seqs(code):
+    return [e["seq"] for e in EventJournal.replay(code)]
+
+
+def test_replay_stops_at_torn_line():
+    async def run():
+        j = EventJournal()
+        for seq in (1, 2):
+            j.append("ABC", seq, {"type": "lock"})
+        await j.sync()
+        await j.stop()
+
+    asyncio.run(run())
+    with open(storage.journal_path("ABC"), "a", encoding="utf-8") as f:
+        f.write('{"seq":3,"ty')
+    assert _seqs("ABC") == [1, 2]
+
+
+def test_compact_drops_covered_events():
+    async def run():
+        j = EventJournal()
+        for seq in range(1, 6):
+            j.append("ABC", seq, {"type": "lock"})
+        await j.sync()
+        await j.compact("ABC", 3)
+        await j.stop()
+        return [seq for seq, _ in j._tail["ABC"]]
+
+    assert asyncio.run(run()) == [4, 5]
+    assert _seqs("ABC") == [4, 5]
+
+
+def test_appends_during_compaction_are_kept(monkeypatch):
+    rewrite = journal_mod._rewrite
+
+    def slow_rewrite(path, lines):
+        time.sleep(0.1)
+        rewrite(path, lines)
+
+    monkeypatch.setattr(journal_mod, "_rewrite", slow_rewrite)
+
+    async def run():
+        j = EventJournal()
+        for seq in range(1, 6):
+            j.append("ABC", seq, {"type": "lock"})
+        await j.sync()
+        compaction = asyncio.create_task(j.compact("ABC", 3))
+        await asyncio.sleep(0.02)  # the rewrite is now running in the pool
+        for seq in range(6, 9):
+            j.append("ABC", seq, {"type": "lock"})
+        await compaction
+        for seq in range(9, 11):
+            j.append("ABC", seq, {"type": "lock"})
+        await j.stop()
+        return [seq for seq, _ in j._tail["ABC"]]
+
+    assert asyncio.run(run()) == [4, 5, 6, 7, 8, 9, 10]
+    assert _seqs("ABC") == [4, 5, 6, 7, 8, 9, 10]
@@ -0,0 +1,21 @@
+import pytest
+from fastapi import HTTPException
+
+
+@pytest.mark.parametrize("secret, headers, ok", [
+    ("s3cret", {"x_admin_token": "s3cret"}, True),
+    ("s3cret", {"authorization": "Bearer s3cret"}, True),
+    ("s3cret", {"x_admin_token": "wrong", "authorization": "bearer s3cret"}, True),
+    ("s3cret", {"x_admin_token": "wrong"}, False),
+    ("s3cret", {}, False),
+    ("", {}, False),
+    ("", {"authorization": "Bearer "}, False),
+])
+def test_require_metrics_auth(app_main, monkeypatch, secret, headers, ok):
+    monkeypatch.setenv("ADMIN_SECRET", secret)
+    headers = {"x_admin_token": "", "authorization": "", **headers}
+    if ok:
+        app_main.require_metrics_auth(**headers)
+    else:
+        with pytest.raises(HTTPException):
+            app_main.require_metrics_auth(**headers)
@@ -0,0 +1,121 @@
+import asyncio
+
+from backend.app.session_cache import SessionCache
+
+
+class FakeStore:
+    """Sessions "on disk" as a dict, with a log of what the cache did to them."""
+
+    def __init__(self, codes=()):
+        self.disk = {code: {"code": code} for code in codes}
+        self.busy = set()
+        self.loads, self.flushes, self.drops = [], [], []
+
+    def load(self, code):
+        self.loads.append(code)
+        return self.disk.get(code)
+
+    def is_idle(self, code, session):
+        return code not in self.busy
+
+    async def flush(self, code):
+        self.flushes.append(code)
+
+    def drop(self, code, session):
+        self.drops.append(code)
+
+    def cache(self, **kw):
+        return SessionCache(self.load, self.is_idle, self.flush, self.drop, stored=lambda code: code in self.disk, **kw)
+
+
+def test_loads_on_first_use_only():
+    store = FakeStore(["A"])
+    cache = store.cache()
+    assert cache.get("A") == {"code": "A"}
+    assert cache.get("A") is cache.peek("A")
+    assert cache.get("B") is None
+    assert store.loads == ["A", "B"]
+    assert cache.stats()["loads"] == 1
+
+
+def test_exists_does_not_load():
+    store = FakeStore(["A"])
+    cache = store.cache()
+    cache["NEW"] = {"code": "NEW"}
+    assert "A" in cache and cache.exists("NEW") and not cache.exists("B")
+    assert store.loads == []
+    assert cache.peek("A") is None
+
+
+def test_evicts_least_recently_used_idle_sessions():
+    store = FakeStore(["A", "B", "C"])
+    cache = store.cache(capacity=2, idle_seconds=0)
+    store.busy.add("B")
+
+    async def run():
+        for code in ("A", "B", "C"):
+            cache.get(code)
+        cache.get("A")
+        await cache._evicting
+
+    asyncio.run(run())
+    # B is the least recently used but busy, and A was used again, so C goes
+    assert cache.keys() == ["B", "A"]
+    assert store.flushes == store.drops == ["C"]
+
+
+def test_sweep_evicts_sessions_that_go_idle_later():
+    store = FakeStore(["A", "B"])
+    cache = store.cache(capacity=1, idle_seconds=0)
+    cache.sweep_seconds = 0.01
+    store.busy.update(["A", "B"])
+
+    async def run():
+        cache.get("A")
+        cache.get("B")
+        await cache._evicting
+        assert cache.keys() == ["A", "B"]
+        # nothing else is loaded after the quiz ends; the periodic pass still unloads it
+        cache.start()
+        store.busy.discard("A")
+        await asyncio.sleep(0.1)
+        await cache.stop()
+
+    asyncio.run(run())
+    assert cache.keys() == ["B"]
+    assert store.drops == ["A"]
+
+
+def test_validate_does_not_load_stored_sessions(app_main):
+    main = app_main
+
+    async def run():
+        code = (await main.create_quiz_new(None))["code"]
+        await main.PERSISTER.flush([code])
+        main.SESSIONS._resident.pop(code)
+        return code
+
+    code = asyncio.run(run())
+    assert main._mint_code() != code
+    assert asyncio.run(main.validate_global(code)) == {"valid": True}
+    assert asyncio.run(main.validate_global("NOPE42")) == {"valid": False}
+    assert main.SESSIONS.peek(code) is None
+
+
+def test_delete_quiz_tears_down_like_unloading(app_main):
+    main = app_main
+
+    async def run():
+        code = (await main.create_quiz_new(None))["code"]
+        session = main.SESSIONS.get(code)
+        main._journal(session, "register", id="p1", name="p1")
+        session._display_task = asyncio.get_running_loop().create_task(asyncio.sleep(10))
+        await main.delete_quiz(code, None)
+        await asyncio.sleep(0)
+        # checked on the loop: asyncio.run cancels whatever is still pending when it returns
+        assert session._display_task.cancelled()
+        return code
+
+    code = asyncio.run(run())
+    assert code not in main.JOURNAL._tail
+    assert not main.SESSIONS.exists(code)
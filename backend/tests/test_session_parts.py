@@ -0,0 +1,65 @@
+import asyncio
+
+from backend.app import storage
+from backend.app.journal import EventJournal
+
+CODE = "PARTS2"
+QUESTIONS = [{"id": "q1", "text": "2+2", "choices": [{"id": "a", "text": "3"}, {"id": "b", "text": "4"}], "answer": "b", "duration": 20}]
+
+
+def test_parts_round_trip():
+    storage.save_session_parts(CODE, {"config": {"questions": []}, "roster": {"players": {}}}, 7)
+    parts = storage.load_session_parts(CODE)
+    assert set(parts) == {"config", "roster"}
+    assert parts["config"] == {"journal_seq": 7, "data": {"questions": []}}
+    storage.save_session_parts(CODE, {"roster": {"players": {"p": {}}}}, 9)
+    parts = storage.load_session_parts(CODE)
+    assert parts["config"]["journal_seq"] == 7 and parts["roster"]["journal_seq"] == 9
+
+
+def test_journal_compacts_while_quiz_runs(app_main):
+    main = app_main
+
+    async def run():
+        session = main.QuizSession(code=CODE, questions=QUESTIONS)
+        main.SESSIONS[CODE] = session
+        main._mark_dirty(CODE)
+        await main.PERSISTER.flush([CODE])
+        # gameplay only journals roster/round changes; config and allow keep their old seq
+        session.add_player(main.Player(id="p1", name="P1"))
+        main._journal(session, "register", id="p1", name="P1")
+        session.is_active = True
+        main._reset_question_state(session, 0)
+        main._journal(session, "start", index=0, startedAt=session.question_started_at)
+        main._mark_dirty(CODE, "roster", "round")
+        await main.PERSISTER.flush([CODE])
+        await main.JOURNAL.sync()
+        return dict(session._part_seqs)
+
+    seqs = asyncio.run(run())
+    assert seqs == {"config": 0, "allow": 0, "roster": 2, "round": 2}
+    assert EventJournal.replay(CODE) == []
+
+
+def test_reload_continues_after_stored_parts(app_main):
+    main = app_main
+
+    async def run():
+        session = main.QuizSession(code=CODE, questions=QUESTIONS)
+        main.SESSIONS[CODE] = session
+        session.add_player(main.Player(id="p1", name="P1"))
+        main._journal(session, "register", id="p1", name="P1")
+        main._mark_dirty(CODE)
+        await main.PERSISTER.flush([CODE])
+        # a later register that only reached the journal
+        session.add_player(main.Player(id="p2", name="P2"))
+        main._journal(session, "register", id="p2", name="P2")
+        await main.JOURNAL.sync()
+
+    asyncio.run(run())
+    main.SESSIONS.clear()
+    main.JOURNAL.forget(CODE)
+    loaded = main._load_session(CODE)
+    assert set(loaded.players) == {"p1", "p2"}
+    assert loaded.journal_seq == 2
+    assert [q.id for q in loaded.questions] == ["q1"]
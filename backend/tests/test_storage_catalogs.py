@@ -0,0 +1,37 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.app import storage
+
+QUESTION = {"id": "q1", "text": "2 + 2?", "choices": [{"id": "a", "text": "4"}, {"id": "b", "text": "5"}], "answer": "a"}
+
+
+def test_question_set_listing_keeps_concurrent_saves(app_main, data_dir):
+    main = app_main
+
+    async def run():
+        calls = []
+        for i in range(20):
+            payload = main.QuestionSetSavePayload(name=f"bank{i}", questions=[QUESTION])
+            calls.append(main.qsets_save(payload, None))
+            calls.append(main.qsets_list(None, offset=0, limit=None, sort="name", order="asc"))
+        await asyncio.gather(*calls)
+        return await main.qsets_list(None, offset=0, limit=None, sort="name", order="asc")
+
+    listing = asyncio.run(run())
+    assert listing["total"] == 20
+    with open(os.path.join(data_dir, "question_sets", "_catalog", "index.json"), encoding="utf-8") as f:
+        assert len(json.load(f)) == 20
+
+
+def test_snapshot_listing_keeps_concurrent_saves():
+    codes = [f"C{i:02d}" for i in range(16)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        jobs = [pool.submit(storage.save_leaderboard_snapshot, code, [{"name": "p", "score": 1}]) for code in codes]
+        jobs += [pool.submit(storage.list_leaderboard_snapshots) for _ in codes]
+        for job in jobs:
+            job.result()
+    assert storage.count_leaderboard_snapshots() == len(codes)
+    assert all(len(storage.list_leaderboard_snapshots(code)) == 1 for code in codes)
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+import pytest
+
+
+class FakeSio:
+    def __init__(self):
+        self.events = []
+
+    async def emit(self, event, data=None, to=None, room=None, **kwargs):
+        self.events.append((event, room or to))
+
+    async def enter_room(self, sid, room):
+        pass
+
+    def count(self, event, room):
+        return self.events.count((event, room))
+
+
+@pytest.fixture
+def quiz(app_main, monkeypatch):
+    """A running one-question quiz on a fake socket server; returns (main, session, sio)."""
+    main = app_main
+    sio = FakeSio()
+    monkeypatch.setattr(main, "sio", sio)
+    session = main.QuizSession(code="TIMED")
+    session.set_questions([main.Question(id="q1", text="?", choices=[main.Choice(id="a", text="a")], answer="a", duration=1)])
+    main.SESSIONS["TIMED"] = session
+    session.is_active = True
+    return main, session, sio
+
+
+def test_locks_at_deadline_then_reveals(quiz):
+    main, session, sio = quiz
+
+    async def run():
+        main._reset_question_state(session, 0, time.time() - 0.95)
+        await main.set_timers("TIMED", main.TimersPayload(autoRevealDelay=0.1), None)
+        await asyncio.sleep(0.1)
+        assert sio.count("question_locked", main.quiz_room("TIMED")) == 1
+        assert not session.revealed
+        await asyncio.sleep(0.15)
+        assert session.revealed
+
+    asyncio.run(run())
+
+
+def test_resume_after_lock_keeps_remaining_reveal_delay(quiz):
+    main, session, sio = quiz
+
+    async def run():
+        main._reset_question_state(session, 0, time.time() - 1.0)
+        await main.set_timers("TIMED", main.TimersPayload(autoRevealDelay=1.0), None)
+        await asyncio.sleep(0.5)
+        await main.pause_quiz("TIMED", None)
+        await asyncio.sleep(0.3)
+        await main.pause_quiz("TIMED", None)
+        # half the delay ran before the pause: the reveal is due 0.5 s after resuming, not a full second
+        await asyncio.sleep(0.3)
+        assert not session.revealed
+        await asyncio.sleep(0.45)
+        assert session.revealed
+        assert sio.count("question_locked", main.quiz_room("TIMED")) == 1
+
+    asyncio.run(run())
+
@@ -17,8 +17,17 @@ let rawSocketPath = (import.meta as any).env?.VITE_SOCKET_PATH ?? '/ws/socket.io
 rawSocketPath = '/' + String(rawSocketPath).replace(/^\/+/, '').replace(/\/+$/, '')
 export const SOCKET_PATH: string = rawSocketPath
 
+// Quiz code from the page URL (?code=ABC123); omitted means the default quiz
+export function quizCode(): string | undefined {
+  if (typeof window === 'undefined') return undefined
+  return new URLSearchParams(window.location.search).get('code') || undefined
+}
+
 export function api(path: string) {
   // ensure exactly one slash between base and path
   const p = path.startsWith('/') ? path : '/' + path
-  return `${API_BASE}${p}`
+  // code-less endpoints take the quiz code as a query parameter
+  const code = quizCode()
+  if (!code) return `${API_BASE}${p}`
+  return `${API_BASE}${p}${p.includes('?') ? '&' : '?'}code=${encodeURIComponent(code)}`
 }
@@ -1,8 +1,25 @@
 import { useEffect, useState } from 'react'
 import { io, Socket } from 'socket.io-client'
-import { api, SOCKET_URL, SOCKET_PATH } from '../config'
+import { api, quizCode, SOCKET_URL, SOCKET_PATH } from '../config'
 
 type LifelinesState = { '5050': boolean; hint: boolean }
+type ProgressPlayer = { id: string; name: string }
+type ProgressState = { lockedCount: number; playersCount: number; locked: ProgressPlayer[]; unlocked?: ProgressPlayer[]; players?: ProgressPlayer[] }
+
+// Fold a batched answers_progress_delta into the last full snapshot
+function mergeProgress(prev: ProgressState | null, d: any): ProgressState {
+  const players = [...(prev?.players || [])]
+  const known = new Set(players.map(p => p.id))
+  for (const p of (d.joined || []) as ProgressPlayer[]) {
+    if (!known.has(p.id)) { players.push(p); known.add(p.id) }
+  }
+  const locked = d.reset || !prev ? [] : [...prev.locked]
+  const lockedIds = new Set(locked.map(p => p.id))
+  for (const p of (d.locked || []) as ProgressPlayer[]) {
+    if (!lockedIds.has(p.id)) { locked.push(p); lockedIds.add(p.id) }
+  }
+  return { lockedCount: d.lockedCount, playersCount: d.playersCount, locked, players, unlocked: players.filter(p => !lockedIds.has(p.id)) }
+}
 
 const SAMPLE_QUESTIONS = `[
   {"id":"q1","text":"2 + 2 = ?","choices":[{"id":"a","text":"3"},{"id":"b","text":"4"},{"id":"c","text":"5"},{"id":"d","text":"22"}],"answer":"b","duration":20,"hint":"Even number"},
@@ -24,7 +41,7 @@ export default function Admin() {
   const [snapshots, setSnapshots] = useState<{ name: string; file: string; createdAt: string; count: number }[]>([])
   const [lifelines, setLifelines] = useState<LifelinesState>({ '5050': true, hint: true })
   const [logs, setLogs] = useState<string[]>([])
-  const [lockedStats, setLockedStats] = useState<{ lockedCount: number; playersCount: number; locked: { id: string; name: string }[]; unlocked?: { id: string; name: string }[]; players?: { id: string; name: string }[] } | null>(null)
+  const [lockedStats, setLockedStats] = useState<ProgressState | null>(null)
   const [busy, setBusy] = useState(false)
   const [allowedEmailsText, setAllowedEmailsText] = useState('')
   const [allowedEmails, setAllowedEmails] = useState<string[]>([])
@@ -42,7 +59,8 @@ export default function Admin() {
   const s = io(SOCKET_URL, { path: SOCKET_PATH, transports: ['websocket'] })
     s.on('connect', () => {
       setConnected(true)
-      s.emit('admin_join', { token }) // global quiz (code omitted)
+      // ?code= in the URL, else the default quiz; admin events aren't replayed, so every (re)join resends the full state
+      s.emit('admin_join', { token, code: quizCode() })
       appendLog('Socket connected')
       refreshParticipants()
       loadAllowed()
@@ -58,10 +76,15 @@ export default function Admin() {
       appendLog(`Locked ${p.lockedCount}/${p.playersCount}`)
       refreshParticipants()
     })
+    s.on('answers_progress_delta', (d) => {
+      setLockedStats(prev => mergeProgress(prev, d))
+      if (d.locked?.length) appendLog(`Answers locked: ${d.locked.map((p: ProgressPlayer) => p.name).join(', ')}`)
+      if (d.locked?.length || d.joined?.length) refreshParticipants()
+    })
     s.on('lifelines', (lf) => setLifelines(lf))
-  s.on('answer_submitted', (ans) => { appendLog(`Answer locked: ${ans.name}`); refreshParticipants() })
     s.on('lifeline_used', (lf) => appendLog(`Lifeline: ${lf.name} used ${lf.lifeline}`))
     s.on('question', (q) => appendLog(`Question broadcast: ${q.text}`))
+    s.on('question_locked', (l) => appendLog(`Question ${Number(l?.index) + 1} locked at deadline (${l?.answered ?? 0} answered)`))
     setSocket(s)
   }
 
@@ -139,7 +162,7 @@ export default function Admin() {
   }
 
   async function listSnapshots() {
-    const r = await fetch(api('/api/admin/leaderboard/snapshots'), { headers: { 'X-Admin-Token': token } })
+    const r = await fetch(api('/api/admin/leaderboard/snapshots?limit=100'), { headers: { 'X-Admin-Token': token } })
     if (r.ok) {
       const data = await r.json()
       setSnapshots(data.items || [])
@@ -311,6 +334,7 @@ export default function Admin() {
           <>
             <div className="mt-2 text-sm text-slate-700 flex items-center gap-3">
               <span className="text-indigo-800 bg-indigo-100 px-2 py-0.5 rounded text-xs">Locked {lockedStats.lockedCount}/{lockedStats.playersCount}</span>
+              <button className="text-xs underline text-slate-600" onClick={() => socket?.emit('answers_progress_resync', {})}>Resync</button>
             </div>
             <div className="mt-2 grid grid-cols-1 md:grid-cols-2 gap-2 text-xs text-slate-700">
               <div>
@@ -1,6 +1,6 @@
 import { useEffect, useRef, useState } from 'react'
 import { io, Socket } from 'socket.io-client'
-import { SOCKET_URL, SOCKET_PATH } from '../config'
+import { SOCKET_URL, SOCKET_PATH, quizCode } from '../config'
 
 export default function Display() {
   const [socket, setSocket] = useState<Socket | null>(null)
@@ -11,43 +11,28 @@ export default function Display() {
   const [leaderboard, setLeaderboard] = useState<any[]>([])
   const [revealed, setRevealed] = useState<boolean>(false)
   const [revealAnswer, setRevealAnswer] = useState<string | null>(null)
-  const serverSkewRef = useRef<number>(0)
+  const [locked, setLocked] = useState<number>(0)
+  const [players, setPlayers] = useState<number>(0)
+  const [histogram, setHistogram] = useState<{ [choiceId: string]: number }>({})
   const timerRef = useRef<number | null>(null)
 
   useEffect(() => {
     const s = io(SOCKET_URL, { path: SOCKET_PATH, transports: ['websocket'] })
-    s.on('connect', () => { s.emit('display_join', {}) })
-    s.on('question', (payload) => {
-      const q = payload?.question || payload
-      setQuestion(q)
-      setShowLB(false)
-      setRevealed(false)
-      setRevealAnswer(null)
-      // timing
-      const clientNow = Date.now() / 1000
-      const serverNow = typeof payload?.serverTime === 'number' ? payload.serverTime : clientNow
-      serverSkewRef.current = serverNow - clientNow
-      const duration = payload?.duration ?? q?.duration ?? 30
-      const startedAt = payload?.startedAt ?? clientNow
-      const remaining = typeof payload?.remaining === 'number' ? payload.remaining : Math.max(0, duration - Math.max(0, (serverNow - startedAt)))
-      setTimeLeft(Math.ceil(remaining))
+    // every (re)join gets the current frame, so frames missed while disconnected don't matter
+    s.on('connect', () => { s.emit('display_join', { code: quizCode() }) })
+    // One throttled frame carries the whole display state: question, clock, answer counts, top K
+    s.on('frame', (f) => {
+      setQuestion(f?.question || null)
+      setStatus(f)
+      setRevealed(!!f?.revealed)
+      setRevealAnswer(f?.revealed ? (f?.correctAnswer || null) : null)
+      setLeaderboard(f?.top || [])
+      setShowLB(!!f?.leaderboard)
+      setLocked(f?.locked ?? 0)
+      setPlayers(f?.players ?? 0)
+      setHistogram(f?.histogram || {})
+      if (typeof f?.remaining === 'number') setTimeLeft(Math.ceil(f.remaining))
     })
-    s.on('status', (st) => {
-      setStatus(st)
-      if (typeof st?.revealed === 'boolean') setRevealed(!!st.revealed)
-      if (typeof st?.serverTime === 'number') {
-        const clientNow = Date.now() / 1000
-        serverSkewRef.current = st.serverTime - clientNow
-      }
-      if (typeof st?.remaining === 'number') setTimeLeft(Math.ceil(st.remaining))
-    })
-    s.on('reveal', (data) => {
-      setRevealAnswer(data?.correctAnswer || null)
-      setRevealed(true)
-    })
-    s.on('leaderboard', (lb) => setLeaderboard(lb || []))
-    s.on('leaderboard_show', (lb) => { setLeaderboard(lb || []); setShowLB(true) })
-    s.on('leaderboard_hide', () => setShowLB(false))
     setSocket(s)
     return () => { s.disconnect() }
   }, [])
@@ -80,12 +65,18 @@ export default function Display() {
                 <div className="choices">
                   {question.choices.map((c: any) => {
                     const isCorrect = revealed && !!revealAnswer && c.id === revealAnswer
+                    const count = histogram[c.id] || 0
                     return (
-                      <div key={c.id} className={`choice${isCorrect ? ' correct' : ''}`}>{c.text}</div>
+                      <div key={c.id} className={`choice${isCorrect ? ' correct' : ''}`}>
+                        {c.text}
+                        <div className="bar"><div className="fill" style={{ width: `${locked ? (100 * count) / locked : 0}%` }} /></div>
+                        <span className="count">{count}</span>
+                      </div>
                     )
                   })}
                 </div>
               )}
+              <div className="answered">{locked} / {players} answered</div>
               {!question.choices && revealed && revealAnswer && (
                 <div className="reveal-text"><strong>Correct answer:</strong> {revealAnswer}</div>
               )}
@@ -103,14 +94,13 @@ export default function Display() {
             <div className="lb-table-wrap">
               <table className="lb-table">
                 <thead>
-                  <tr><th className="rank">#</th><th>Name</th><th>Email</th><th className="score">Score</th></tr>
+                  <tr><th className="rank">#</th><th>Name</th><th className="score">Score</th></tr>
                 </thead>
                 <tbody>
-                  {leaderboard.map((p, i) => (
-                    <tr key={p.id}>
-                      <td className="rank">{i + 1}</td>
+                  {leaderboard.map((p) => (
+                    <tr key={p.rank}>
+                      <td className="rank">{p.rank}</td>
                       <td>{p.name}</td>
-                      <td className="email">{p.email || ''}</td>
                       <td className="score">{p.score}</td>
                     </tr>
                   ))}
@@ -134,6 +124,10 @@ export default function Display() {
         .choices { display:grid; grid-template-columns: repeat(2, minmax(0, 1fr)); gap: 16px; }
   .choice { background: rgba(255,255,255,0.06); border: 1px solid rgba(255,255,255,0.12); border-radius: 12px; padding: 14px 16px; font-size: 22px; }
   .choice.correct { background: rgba(16,185,129,0.18); border-color: rgba(16,185,129,0.55); box-shadow: 0 0 0 2px rgba(16,185,129,0.25) inset; }
+  .choice .bar { height: 6px; margin-top: 10px; background: rgba(255,255,255,0.08); border-radius: 3px; overflow: hidden; }
+  .choice .bar .fill { height: 100%; background: linear-gradient(90deg, #60a5fa, #22d3ee); transition: width 0.2s; }
+  .choice .count { float: right; margin-top: -22px; font-size: 16px; color: #cbd5e1; }
+  .answered { margin-top: 18px; font-size: 22px; color: #cbd5e1; text-align: right; }
   .reveal-text { margin-top: 18px; font-size: 28px; color: #a7f3d0; }
         .waiting { text-align:center; color:#cbd5e1; font-size: 22px; }
         .lb-overlay { position:fixed; inset:0; display:flex; align-items:center; justify-content:center; background: rgba(2,6,23,0.85); z-index:50; }
@@ -1,4 +1,4 @@
-import { api } from '../config'
+import { api, quizCode } from '../config'
 import { useState } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { BrandLayout, GlassCard, BrandButton, BrandStrip } from '../components/Brand'
@@ -31,7 +31,7 @@ export default function Lobby() {
         throw new Error('Registration failed')
       }
       const reg = await regResp.json()
-      navigate('/quiz', { state: { name, email, playerId: reg.playerId, participantCode: reg.participantCode } })
+      navigate('/quiz', { state: { name, email, code: quizCode(), playerId: reg.playerId, participantCode: reg.participantCode } })
     } catch (err: any) {
       setError(err.message || 'Join failed')
     } finally {
@@ -7,7 +7,7 @@ import { BrandLayout, GlassCard, BrandButton, BrandStrip } from '../components/B
 export default function Quiz() {
   const nav = useNavigate()
   const loc = useLocation() as any
-  const { name, email, playerId, participantCode } = loc.state || {}
+  const { name, email, code, playerId, participantCode } = loc.state || {}
   const [socket, setSocket] = useState<Socket | null>(null)
   const [question, setQuestion] = useState<any>(null)
   const [questionIndex, setQuestionIndex] = useState<number | null>(null)
@@ -29,6 +29,9 @@ export default function Quiz() {
   const timerRef = useRef<number | null>(null)
   const [showLB, setShowLB] = useState<boolean>(false)
   const [leaderboard, setLeaderboard] = useState<any[]>([])
+  const [myRank, setMyRank] = useState<any>(null)
+  // last quiz-room broadcast seen, so a reconnect only replays what was missed
+  const streamRef = useRef<{ epoch?: string; seq?: number }>({})
 
   useEffect(() => {
   if (!name || !playerId) {
@@ -37,11 +40,13 @@ export default function Quiz() {
     }
   const s = io(SOCKET_URL, { path: SOCKET_PATH, transports: ['websocket'] })
     s.on('connect', () => {
-      s.emit('join_quiz', { name, playerId, email })
+      s.emit('join_quiz', { code, name, playerId, email, epoch: streamRef.current.epoch, lastSeq: streamRef.current.seq })
     })
+  s.onAny((_event, payload) => { if (typeof payload?.seq === 'number') streamRef.current.seq = payload.seq })
   s.on('connect_error', (err) => console.warn('socket connect_error', err.message))
   s.on('error', (err) => console.warn('socket error', err))
     s.on('joined', (j) => {
+      if (j?.stream) streamRef.current = { epoch: j.stream.epoch, seq: j.stream.seq }
       if (j?.participantCode) {
         setResult((r: any) => ({ ...(r || {}), participantCode: j.participantCode }))
       }
@@ -89,6 +94,8 @@ export default function Quiz() {
         // If we optimistically set a choice, clear it when rejected
         if (!locked) setLockedAnswer(null)
       })
+    // server-side deadline: stop the clock even if the local countdown drifted
+    s.on('question_locked', () => setTimeLeft(0))
     s.on('paused', () => { setPaused(true); setStatus((prev: any) => ({ ...(prev || {}), paused: true })) })
     s.on('resumed', () => { setPaused(false); setStatus((prev: any) => ({ ...(prev || {}), paused: false })) })
     s.on('reveal', (data) => {
@@ -100,8 +107,9 @@ export default function Quiz() {
     s.on('lifeline_hint', (data) => setHint(data.hint || null))
   s.on('lifeline_status', (st) => setLifelineStatus(st || { '5050': true, hint: true }))
   s.on('lifeline_denied', (d) => setLifelineMsg(`Lifeline unavailable: ${d?.lifeline}`))
-  s.on('leaderboard', (lb) => setLeaderboard(lb))
-  s.on('leaderboard_show', (lb) => { setLeaderboard(lb || []); setShowLB(true) })
+  s.on('leaderboard', (lb) => setLeaderboard(lb?.top || []))
+  s.on('leaderboard_show', (lb) => { setLeaderboard(lb?.top || []); setShowLB(true) })
+  s.on('your_rank', (r) => setMyRank(r))
   s.on('leaderboard_hide', () => setShowLB(false))
     s.on('reset', () => {
       try { s.disconnect() } catch {}
@@ -252,6 +260,11 @@ export default function Quiz() {
             {result.correct ? 'Correct!' : 'Wrong!'} Score: {result.score}
           </p>
         )}
+        {myRank && revealed && (
+          <p className="mt-1 text-sm text-slate-300">
+            Rank {myRank.rank} of {myRank.players}{myRank.gapToNext ? ` · ${myRank.gapToNext} pts to next place` : ''}
+          </p>
+        )}
       </div>
   <BrandStrip />
       {showLB && (
@@ -274,9 +287,9 @@ export default function Quiz() {
                       </tr>
                     </thead>
                     <tbody>
-                      {leaderboard.map((p, i) => (
-                        <tr key={p.id} className="border-b border-white/5 text-slate-200">
-                          <td className="py-2">{i + 1}</td>
+                      {leaderboard.map((p) => (
+                        <tr key={p.rank} className="border-b border-white/5 text-slate-200">
+                          <td className="py-2">{p.rank}</td>
                           <td className="py-2">{p.name}</td>
                           <td className="py-2 text-right">{p.score}</td>
                         </tr>
@@ -284,6 +297,7 @@ export default function Quiz() {
                     </tbody>
                   </table>
                 )}
+                {myRank && <p className="mt-4 text-base text-slate-300">You: #{myRank.rank} of {myRank.players} · {myRank.score} pts</p>}
               </div>
             </div>
           </div>